@@ -12,6 +12,7 @@
 import numpy as np
 import pandas as pd
 import getpass
+from operator import itemgetter
 from .proto import ArgoDataFetcherProto
 from abc import abstractmethod
 import warnings
@@ -19,6 +20,7 @@ import urllib
 
 from argopy.stores import httpstore
 from argopy.options import OPTIONS
+from argopy.instrumentation import stage
 from argopy.utilities import list_standard_variables, format_oneline, Chunker
 from argopy.plotters import open_dashboard
 
@@ -60,6 +62,7 @@ class ArgovisDataFetcher(ArgoDataFetcherProto):
         chunks: str = "auto",
         chunks_maxsize: dict = {},
         api_timeout: int = 0,
+        server: str = "",
         **kwargs
     ):
         """ Instantiate an Argovis Argo data loader
@@ -87,12 +90,15 @@ class ArgovisDataFetcher(ArgoDataFetcherProto):
             Eg: {'wmo': 5} will create chunks with as many as 5 WMOs each.
         api_timeout: int (optional)
             Argovis API request time out in seconds. Set to OPTIONS['api_timeout'] by default.
+        server: str (optional)
+            Root url of the API. Set to the Argovis API by default. Eg: the url of a local
+            :class:`argopy.tutorial.mock_server`.
         """
         timeout = OPTIONS["api_timeout"] if api_timeout == 0 else api_timeout
         self.fs = httpstore(cache=cache, cachedir=cachedir, timeout=timeout)
         self.definition = "Argovis Argo data fetcher"
         self.dataset_id = OPTIONS["dataset"] if ds == "" else ds
-        self.server = api_server
+        self.server = api_server if server == "" else server
 
         if not isinstance(parallel, bool):
             parallel_method = parallel
@@ -125,7 +131,7 @@ class ArgovisDataFetcher(ArgoDataFetcherProto):
     def __repr__(self):
         summary = ["<datafetcher.argovis>"]
         summary.append("Name: %s" % self.definition)
-        summary.append("API: %s" % api_server)
+        summary.append("API: %s" % self.server)
         summary.append("Domain: %s" % format_oneline(self.cname()))
         return "\n".join(summary)
 
@@ -254,23 +260,81 @@ class ArgovisDataFetcher(ArgoDataFetcherProto):
         return urls
         # return [urllib.parse.quote(url, safe='/:?=[]&') for url in urls]
 
+    @staticmethod
+    def _measurements2columns(rows, exclude=()):
+        """ Transpose a list of measurement dictionaries into a dictionary of columns """
+        if len(rows) == 0:
+            return {}
+        keys = list(rows[0])
+        if len(set().union(*rows)) == len(keys):
+            # All measurements should have the same keys, use a fast transpose:
+            try:
+                values = zip(*map(itemgetter(*keys), rows)) if len(keys) > 1 else [[row[keys[0]] for row in rows]]
+                return {key: column for key, column in zip(keys, values) if key not in exclude}
+            except KeyError:
+                pass
+        keys = dict.fromkeys(key for row in rows for key in row)
+        return {key: [row.get(key, np.nan) for row in rows] for key in keys if key not in exclude}
+
     def json2dataframe(self, profiles):
-        """ convert json data to Pandas DataFrame """
-        # Make sure we deal with a list
-        if isinstance(profiles, list):
-            data = profiles
-        else:
-            data = [profiles]
+        """ convert json data to Pandas DataFrame
+
+            Profiles can be a list or any iterable, eg: a generator of profiles decoded from a streamed response. They
+            are consumed one at a time: measurements are appended to per-column buffers, while profile metadata are
+            stored once per profile and repeated along measurements (with the number of measurements of each profile)
+            when the DataFrame is created.
+        """
+        # Make sure we deal with an iterable of profiles
+        if isinstance(profiles, dict):
+            profiles = [profiles]
         # Transform
-        rows = []
-        for profile in data:
-            keys = [x for x in profile.keys() if x not in ["measurements", "bgcMeas"]]
-            meta_row = dict((key, profile[key]) for key in keys)
-            for row in profile["measurements"]:
-                row.update(meta_row)
-                rows.append(row)
-        df = pd.DataFrame(rows)
-        return df
+        measurements = {}  # Measurement columns, one value per measurement
+        metadata = {}  # Metadata columns, one value per profile
+        in_metadata = {}  # Metadata presence, one boolean per profile
+        counts = []  # Number of measurements per profile
+        n = 0  # Number of measurements
+        for profile in profiles:
+            meta = dict((key, profile[key]) for key in profile.keys() if key not in ["measurements", "bgcMeas"])
+            rows = profile["measurements"]
+            for key, values in self._measurements2columns(rows, exclude=meta).items():
+                if key not in measurements:
+                    measurements[key] = [np.nan] * n  # New column, missing from previous rows
+                measurements[key].extend(values)
+            for key in meta:
+                if key not in metadata:
+                    metadata[key] = [np.nan] * len(counts)  # New column, missing from previous profiles
+                    in_metadata[key] = [False] * len(counts)
+            for key in metadata:
+                metadata[key].append(meta.get(key, np.nan))
+                in_metadata[key].append(key in meta)
+            counts.append(len(rows))
+            n += len(rows)
+            for column in measurements.values():
+                column.extend([np.nan] * (n - len(column)))
+        return self._columns2dataframe(measurements, metadata, in_metadata, counts)
+
+    @staticmethod
+    def _to_array(values):
+        """ Convert a list of values into a numpy array, with the dtype Pandas would infer for non-numeric values """
+        try:
+            array = np.array(values)
+            if array.ndim == 1 and array.dtype.kind in "biuf":
+                return array
+        except ValueError:
+            pass
+        return pd.Series(values, dtype=None if len(values) > 0 else object).to_numpy()  # Let Pandas infer others
+
+    @classmethod
+    def _columns2dataframe(cls, measurements, metadata, in_metadata, counts):
+        """ Create a DataFrame from measurement columns and metadata columns repeated along measurements """
+        columns = {key: cls._to_array(values) for key, values in measurements.items()}
+        for key, values in metadata.items():
+            values = np.repeat(cls._to_array(values), counts)
+            if key in columns:
+                # Metadata take precedence over measurements with the same key:
+                values = np.where(np.repeat(in_metadata[key], counts), values, columns[key])
+            columns[key] = values
+        return pd.DataFrame(columns)
 
     def to_dataframe(self, errors: str = 'ignore'):
         """ Load Argo data and return a Pandas dataframe """
@@ -281,7 +345,7 @@ class ArgovisDataFetcher(ArgoDataFetcherProto):
         else:
             method = self.parallel_method
         df_list = self.fs.open_mfjson(
-            self.uri, method=method, preprocess=self.json2dataframe, progress=self.progress, errors=errors
+            self.uri, method=method, preprocess=self.json2dataframe, progress=self.progress, errors=errors, stream=True
         )
 
         # Merge results (list of dataframe):
@@ -290,17 +354,20 @@ class ArgovisDataFetcher(ArgoDataFetcherProto):
             df = df.rename(columns=self.key_map)
             df = df[[value for value in self.key_map.values() if value in df.columns]]
             df_list[i] = df
-        df = pd.concat(df_list, ignore_index=True)
-        df.sort_values(by=["TIME", "PRES"], inplace=True)
+        with stage("concat"):
+            df = pd.concat(df_list, ignore_index=True)
+        with stage("sort", rows=len(df)):
+            df.sort_values(by=["TIME", "PRES"], inplace=True)
         df = df.set_index(["N_POINTS"])
         return df
 
     def to_xarray(self, errors: str = 'ignore'):
         """ Download and return data as xarray Datasets """
         ds = self.to_dataframe(errors=errors).to_xarray()
-        ds = ds.sortby(
-            ["TIME", "PRES"]
-        )  # should already be sorted by date in descending order
+        with stage("sort", rows=len(ds["N_POINTS"])):
+            ds = ds.sortby(
+                ["TIME", "PRES"]
+            )  # should already be sorted by date in descending order
         ds["N_POINTS"] = np.arange(
             0, len(ds["N_POINTS"])
         )  # Re-index to avoid duplicate values
@@ -466,44 +533,46 @@ class Fetch_box(ArgovisDataFetcher):
             self.definition = "Argovis Argo data fetcher for a space/time region"
         return self
 
-    def get_url_shape(self):
-        """ Return the URL used to download data """
+    def get_url_shape(self, box=None):
+        """ Return the URL used to download data, for the request box or another one """
+        box = self.BOX if box is None else box
         shape = [
             [
-                [self.BOX[0], self.BOX[2]],  # ll
-                [self.BOX[0], self.BOX[3]],  # ul
-                [self.BOX[1], self.BOX[3]],  # ur
-                [self.BOX[1], self.BOX[2]],  # lr
-                [self.BOX[0], self.BOX[2]],  # ll
+                [box[0], box[2]],  # ll
+                [box[0], box[3]],  # ul
+                [box[1], box[3]],  # ur
+                [box[1], box[2]],  # lr
+                [box[0], box[2]],  # ll
             ]
         ]
         strShape = str(shape).replace(" ", "")
         url = self.server + "/selection/profiles"
         url += "?startDate={}".format(
-            pd.to_datetime(self.BOX[6]).strftime("%Y-%m-%dT%H:%M:%SZ")
+            pd.to_datetime(box[6]).strftime("%Y-%m-%dT%H:%M:%SZ")
         )
         url += "&endDate={}".format(
-            pd.to_datetime(self.BOX[7]).strftime("%Y-%m-%dT%H:%M:%SZ")
+            pd.to_datetime(box[7]).strftime("%Y-%m-%dT%H:%M:%SZ")
         )
         url += "&shape={}".format(strShape)
-        url += "&presRange=[{},{}]".format(self.BOX[4], self.BOX[5])
+        url += "&presRange=[{},{}]".format(box[4], box[5])
         return url
 
-    def get_url_rect(self):
-        """ Return the URL used to download data """
+    def get_url_rect(self, box=None):
+        """ Return the URL used to download data, for the request box or another one """
+        box = self.BOX if box is None else box
         def strCorner(b, i): return str([b[i[0]], b[i[1]]]).replace(" ", "")
         def strDate(b, i): return pd.to_datetime(b[i]).strftime("%Y-%m-%dT%H:%M:%SZ")
         url = self.server + "/selection/box/profiles"
-        url += "?startDate={}".format(strDate(self.BOX, 6))
-        url += "&endDate={}".format(strDate(self.BOX, 7))
-        url += "&presRange=[{},{}]".format(self.BOX[4], self.BOX[5])
-        url += "&llCorner={}".format(strCorner(self.BOX, [0, 2]))
-        url += "&urCorner={}".format(strCorner(self.BOX, [1, 3]))
+        url += "?startDate={}".format(strDate(box, 6))
+        url += "&endDate={}".format(strDate(box, 7))
+        url += "&presRange=[{},{}]".format(box[4], box[5])
+        url += "&llCorner={}".format(strCorner(box, [0, 2]))
+        url += "&urCorner={}".format(strCorner(box, [1, 3]))
         return url
 
-    def get_url(self):
-        return self.get_url_shape()
-        # return self.get_url_rect()
+    def get_url(self, box=None):
+        return self.get_url_shape(box)
+        # return self.get_url_rect(box)
 
     @property
     def uri(self):
@@ -528,7 +597,7 @@ class Fetch_box(ArgovisDataFetcher):
                 )
                 boxes = self.Chunker.fit_transform()
                 for box in boxes:
-                    urls.append(Fetch_box(box=box, ds=self.dataset_id).get_url())
+                    urls.append(self.get_url(box))
             else:
                 urls.append(self.get_url())
         else:
@@ -548,7 +617,7 @@ class Fetch_box(ArgovisDataFetcher):
             )
             boxes = self.Chunker.fit_transform()
             for box in boxes:
-                urls.append(Fetch_box(box=box, ds=self.dataset_id).get_url())
+                urls.append(self.get_url(box))
 
         return self.url_encode(urls)
 
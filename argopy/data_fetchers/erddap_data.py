@@ -59,8 +59,8 @@ class ErddapArgoDataFetcher(ArgoDataFetcherProto):
         raise NotImplementedError("ErddapArgoDataFetcher.init not implemented")
 
     @abstractmethod
-    def define_constraints(self):
-        """ Define erddapy constraints """
+    def define_constraints(self, **kwargs):
+        """ Define erddapy constraints for the request domain, or for a subset of it given as keyword arguments """
         raise NotImplementedError("ErddapArgoDataFetcher.define_constraints not implemented")
 
     @property
@@ -84,6 +84,7 @@ class ErddapArgoDataFetcher(ArgoDataFetcherProto):
         chunks: str = "auto",
         chunks_maxsize: dict = {},
         api_timeout: int = 0,
+        server: str = "",
         **kwargs,
     ):
         """ Instantiate an ERDDAP Argo data fetcher
@@ -111,12 +112,15 @@ class ErddapArgoDataFetcher(ArgoDataFetcherProto):
             Eg: {'wmo': 5} will create chunks with as many as 5 WMOs each.
         api_timeout: int (optional)
             Erddap request time out in seconds. Set to OPTIONS['api_timeout'] by default.
+        server: str (optional)
+            Root url of the API. Set to the Ifremer erddap by default. Eg: the url of a local
+            :class:`argopy.tutorial.mock_server`.
         """
         timeout = OPTIONS["api_timeout"] if api_timeout == 0 else api_timeout
         self.fs = httpstore(cache=cache, cachedir=cachedir, timeout=timeout, size_policy='head')
         self.definition = "Ifremer erddap Argo data fetcher"
         self.dataset_id = OPTIONS["dataset"] if ds == "" else ds
-        self.server = api_server
+        self.server = api_server if server == "" else server
 
         if not isinstance(parallel, bool):
             parallel_method = parallel
@@ -138,7 +142,7 @@ class ErddapArgoDataFetcher(ArgoDataFetcherProto):
     def __repr__(self):
         summary = ["<datafetcher.erddap>"]
         summary.append("Name: %s" % self.definition)
-        summary.append("API: %s" % api_server)
+        summary.append("API: %s" % self.server)
         summary.append("Domain: %s" % format_oneline(self.cname()))
         return "\n".join(summary)
 
@@ -357,9 +361,15 @@ class ErddapArgoDataFetcher(ArgoDataFetcherProto):
         """
         return [self.fs.cachepath(uri) for uri in self.uri]
 
-    def get_url(self):
+    def get_url(self, **kwargs):
         """ Return the URL to download data requested
 
+        Parameters
+        ----------
+        **kwargs:
+            Subset of the request domain (eg: ``WMO`` or ``box``) passed to :meth:`define_constraints`, to get the URL
+            of a chunk of the request.
+
         Returns
         -------
         str
@@ -383,8 +393,13 @@ class ErddapArgoDataFetcher(ArgoDataFetcherProto):
         url += f"{variables}"
 
         # Add constraints:
-        self.define_constraints()  # Define constraint to select this box of data (affect self.erddap.constraints)
-        constraints = self.erddap.constraints
+        try:
+            self.define_constraints(**kwargs)  # Define constraint to select this box of data (affect self.erddap.constraints)
+            constraints = self.erddap.constraints
+        finally:
+            if len(kwargs) > 0:
+                # Constraints were those of a chunk, restore constraints of the whole request:
+                self.define_constraints()
         _constraints = copy.copy(constraints)
         for k, v in _constraints.items():
             if k.startswith("time"):
@@ -525,10 +540,11 @@ class Fetch_wmo(ErddapArgoDataFetcher):
             self.definition = "Ifremer erddap Argo REFERENCE data fetcher for floats"
         return self
 
-    def define_constraints(self):
+    def define_constraints(self, WMO=None):
         """ Define erddap constraints """
+        WMO = self.WMO if WMO is None else WMO
         self.erddap.constraints = {
-            "platform_number=~": "|".join(["%i" % i for i in self.WMO])
+            "platform_number=~": "|".join(["%i" % i for i in WMO])
         }
         if isinstance(self.CYC, (np.ndarray)):
             self.erddap.constraints.update(
@@ -550,28 +566,14 @@ class Fetch_wmo(ErddapArgoDataFetcher):
                 return [self.get_url()]
             else:
                 # Retrieve one WMO by URL sequentially (same behaviour as localftp and argovis)
-                urls = []
-                for wmo in self.WMO:
-                    urls.append(
-                        Fetch_wmo(
-                            WMO=wmo, CYC=self.CYC, ds=self.dataset_id, parallel=False
-                        ).get_url()
-                    )
-                return urls
+                return [self.get_url(WMO=[wmo]) for wmo in self.WMO]
         else:
             self.Chunker = Chunker(
                 {"wmo": self.WMO}, chunks=self.chunks, chunksize=self.chunks_maxsize
             )
             wmo_grps = self.Chunker.fit_transform()
             # self.chunks = C.chunks
-            urls = []
-            for wmos in wmo_grps:
-                urls.append(
-                    Fetch_wmo(
-                        WMO=wmos, CYC=self.CYC, ds=self.dataset_id, parallel=False
-                    ).get_url()
-                )
-            return urls
+            return [self.get_url(WMO=wmos) for wmos in wmo_grps]
 
     def dashboard(self, **kw):
         if len(self.WMO) == 1:
@@ -606,17 +608,18 @@ class Fetch_box(ErddapArgoDataFetcher):
 
         return self
 
-    def define_constraints(self):
+    def define_constraints(self, box=None):
         """ Define request constraints """
-        self.erddap.constraints = {"longitude>=": self.BOX[0]}
-        self.erddap.constraints.update({"longitude<=": self.BOX[1]})
-        self.erddap.constraints.update({"latitude>=": self.BOX[2]})
-        self.erddap.constraints.update({"latitude<=": self.BOX[3]})
-        self.erddap.constraints.update({"pres>=": self.BOX[4]})
-        self.erddap.constraints.update({"pres<=": self.BOX[5]})
-        if len(self.BOX) == 8:
-            self.erddap.constraints.update({"time>=": self.BOX[6]})
-            self.erddap.constraints.update({"time<=": self.BOX[7]})
+        box = self.BOX if box is None else box
+        self.erddap.constraints = {"longitude>=": box[0]}
+        self.erddap.constraints.update({"longitude<=": box[1]})
+        self.erddap.constraints.update({"latitude>=": box[2]})
+        self.erddap.constraints.update({"latitude<=": box[3]})
+        self.erddap.constraints.update({"pres>=": box[4]})
+        self.erddap.constraints.update({"pres<=": box[5]})
+        if len(box) == 8:
+            self.erddap.constraints.update({"time>=": box[6]})
+            self.erddap.constraints.update({"time<=": box[7]})
         return None
 
     @property
@@ -634,7 +637,4 @@ class Fetch_box(ErddapArgoDataFetcher):
                 {"box": self.BOX}, chunks=self.chunks, chunksize=self.chunks_maxsize
             )
             boxes = self.Chunker.fit_transform()
-            urls = []
-            for box in boxes:
-                urls.append(Fetch_box(box=box, ds=self.dataset_id).get_url())
-            return urls
+            return [self.get_url(box=box) for box in boxes]
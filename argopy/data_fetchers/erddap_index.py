@@ -75,8 +75,20 @@ class ErddapArgoIndexFetcher(ABC):
     def __init__(self,
                  cache: bool = False,
                  cachedir: str = "",
+                 server: str = "",
                  **kwargs):
-        """ Instantiate an ERDDAP Argo index loader """
+        """ Instantiate an ERDDAP Argo index loader
+
+        Parameters
+        ----------
+        cache: bool (optional)
+            Cache data or not (default: False)
+        cachedir: str (optional)
+            Path to cache folder
+        server: str (optional)
+            Root url of the API. Set to the Ifremer erddap by default. Eg: the url of a local
+            :class:`argopy.tutorial.mock_server`.
+        """
         # if version.parse(fsspec.__version__) > version.parse("0.8.3") and cache:
         #     log.warning("Caching not available for WMO access point, falls back on NO cache "
         #                 "(http cache store not compatible with erddap wmo requests)")
@@ -88,14 +100,14 @@ class ErddapArgoIndexFetcher(ABC):
         self.fs = httpstore(cache=cache, cachedir=cachedir, timeout=OPTIONS['api_timeout'])
         self.definition = 'Ifremer erddap Argo index fetcher'
         self.dataset_id = 'index'
-        self.server = api_server
+        self.server = api_server if server == "" else server
         self.init(**kwargs)
         self._init_erddapy()
 
     def __repr__(self):
         summary = ["<indexfetcher.erddap>"]
         summary.append("Name: %s" % self.definition)
-        summary.append("API: %s" % api_server)
+        summary.append("API: %s" % self.server)
         summary.append("Domain: %s" % format_oneline(self.cname()))
         return '\n'.join(summary)
 
@@ -43,7 +43,7 @@ from argopy.utilities import (
     format_oneline
 )
 from argopy.options import OPTIONS
-from argopy.stores import filestore, indexstore, indexfilter_box
+from argopy.stores import filestore, httprangestore, indexstore, indexfilter_box
 from argopy.plotters import open_dashboard
 
 access_points = ["wmo", "box"]
@@ -99,7 +99,8 @@ class LocalFTPArgoDataFetcher(ArgoDataFetcherProto):
         Parameters
         ----------
         local_ftp: str (optional)
-            Path to the local directory where the 'dac' folder is located.
+            Path to the local directory where the 'dac' folder is located. This can also be the http(s) url of a
+            GDAC mirror, in which case only the parts of netcdf files actually needed are transferred.
         ds: str (optional)
             Dataset to load: 'phy' or 'ref' or 'bgc'
         errors: str (optional)
@@ -133,7 +134,6 @@ class LocalFTPArgoDataFetcher(ArgoDataFetcherProto):
         """
         self.cache = cache
         self.cachedir = cachedir
-        self.fs = filestore(cache=self.cache, cachedir=self.cachedir)
         self.errors = errors
 
         if not isinstance(parallel, bool):
@@ -157,6 +157,12 @@ class LocalFTPArgoDataFetcher(ArgoDataFetcherProto):
 
         self.local_ftp = OPTIONS["local_ftp"] if local_ftp == "" else local_ftp
         check_localftp(self.local_ftp, errors="raise")  # Validate local_ftp
+        self.remote = self.local_ftp.startswith(("http://", "https://"))
+        if self.remote:
+            # Remote GDAC mirror, netcdf files are read with http range requests:
+            self.fs = httprangestore(cache=self.cache, cachedir=self.cachedir)
+        else:
+            self.fs = filestore(cache=self.cache, cachedir=self.cachedir)
 
         self.init(**kwargs)
 
@@ -205,22 +211,23 @@ class LocalFTPArgoDataFetcher(ArgoDataFetcherProto):
             -------
             file_path_pattern : str
             """
+            sep = "/" if self.remote else os.path.sep  # Urls of a remote GDAC mirror always use '/'
             if cyc is None:
                 # Multi-profile file:
                 # dac/<DacName>/<FloatWmoID>/<FloatWmoID>_<S>prof.nc
                 if self.dataset_id == "phy":
-                    return os.path.sep.join(
+                    return sep.join(
                         [self.local_ftp, "dac", "*", str(wmo), "%i_prof.nc" % wmo]
                     )
                 elif self.dataset_id == "bgc":
-                    return os.path.sep.join(
+                    return sep.join(
                         [self.local_ftp, "dac", "*", str(wmo), "%i_Sprof.nc" % wmo]
                     )
             else:
                 # Single profile file:
                 # dac/<DacName>/<FloatWmoID>/profiles/<B/M/S><R/D><FloatWmoID>_<XXX><D>.nc
                 if cyc < 1000:
-                    return os.path.sep.join(
+                    return sep.join(
                         [
                             self.local_ftp,
                             "dac",
@@ -231,7 +238,7 @@ class LocalFTPArgoDataFetcher(ArgoDataFetcherProto):
                         ]
                     )
                 else:
-                    return os.path.sep.join(
+                    return sep.join(
                         [
                             self.local_ftp,
                             "dac",
@@ -243,7 +250,7 @@ class LocalFTPArgoDataFetcher(ArgoDataFetcherProto):
                     )
 
         pattern = _filepathpattern(wmo, cyc)
-        lst = sorted(glob(pattern))
+        lst = sorted(self.fs.glob(pattern) if self.remote else glob(pattern))
         # lst = sorted(self.fs.glob(pattern))  # Much slower than the regular glob !
         if len(lst) == 1:
             return lst[0]
@@ -403,6 +410,7 @@ class LocalFTPArgoDataFetcher(ArgoDataFetcherProto):
             preprocess=self._preprocess_multiprof,
             progress=self.progress,
             errors=errors,
+            sortby="TIME",  # Concatenated data are written in time order, no need to sort afterward
             decode_cf=1,
             use_cftime=0,
             mask_and_scale=1,
@@ -413,7 +421,6 @@ class LocalFTPArgoDataFetcher(ArgoDataFetcherProto):
             0, len(ds["N_POINTS"])
         )  # Re-index to avoid duplicate values
         ds = ds.set_coords("N_POINTS")
-        ds = ds.sortby("TIME")
 
         # Remove netcdf file attributes and replace them with simplified argopy ones:
         ds.attrs = {}
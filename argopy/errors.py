@@ -130,3 +130,18 @@ class ArgovisServerError(APIServerError):
     Raise this when argopy is disrupted by an error due to the Erddap, not argopy machinery
     """
     pass
+
+
+class MemoryBudgetExceeded(MemoryError):
+    """
+    Raise when the memory used by a data fetching stage exceeds the ``memory_budget`` option
+
+    This is raised when the stage exits, the stage is not interrupted while running.
+    """
+    def __init__(self, stage: str = "?", peak: int = 0, budget: int = 0):
+        self.stage = stage
+        self.peak = peak
+        self.budget = budget
+        self.message = "Stage '%s' exceeded the memory budget: %i bytes traced (budget: %i bytes)" % (
+            stage, peak, budget)
+        super().__init__(self.message)
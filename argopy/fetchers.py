@@ -16,6 +16,7 @@ import numpy as np
 import logging
 
 from argopy.options import OPTIONS, _VALIDATORS
+from argopy.instrumentation import stage, nrows
 from .errors import InvalidFetcherAccessPoint, InvalidFetcher
 from .utilities import list_available_data_src, list_available_index_src, is_box, is_indexbox, check_wmo
 from .plotters import plot_trajectory, bar_plot, open_sat_altim_report
@@ -372,8 +373,17 @@ class ArgoDataFetcher:
                 " Initialize an access point (%s) first."
                 % ",".join(self.Fetchers.keys())
             )
-        xds = self.fetcher.to_xarray(**kwargs)
-        xds = self.postproccessor(xds)
+        with stage("to_xarray", src=self._src, access_point=self._AccessPoint) as s:
+            if s.active:
+                with stage("uri") as u:
+                    u.update(rows=len(self.fetcher.uri))
+            with stage("fetch") as f:
+                xds = self.fetcher.to_xarray(**kwargs)
+                f.update(rows=nrows(xds))
+            with stage("postprocess") as p:
+                xds = self.postproccessor(xds)
+                p.update(rows=nrows(xds))
+            s.update(rows=nrows(xds))
         return xds
 
     def to_dataframe(self, **kwargs):
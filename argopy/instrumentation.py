@@ -0,0 +1,412 @@
+"""
+Instrumentation of data fetching pipelines
+
+Stages of a data fetching pipeline (building urls, downloading, decoding, concatenating, post-processing, ...) can be
+recorded with their wall time and, when relevant, the number of bytes transferred, cache hits/misses and number of
+rows produced. Stages are recorded for each chunk of a request, in any thread.
+
+Recording is off by default and has almost no overhead. It is activated within a :class:`recorder` context:
+
+>>> from argopy.instrumentation import recorder
+>>> with recorder() as rec:
+>>>     ds = argopy.DataFetcher().region([-75, -45, 20, 30, 0, 100, '2011-01', '2011-06']).to_xarray()
+>>> rec.summary()  # One row per stage
+>>> rec.records  # One dictionary per recorded stage
+
+or for the whole process, with the ``instrument`` option:
+
+>>> argopy.set_options(instrument=True)
+>>> ds = argopy.DataFetcher().float(6902746).to_xarray()
+>>> argopy.instrumentation.get_recorder().summary()
+
+Records are also sent to the "argopy.instrumentation" logger, with the DEBUG level, and can be exported as a Chrome
+trace with :meth:`recorder.to_chrome_trace` to visualise concurrent activity of a request:
+
+>>> with recorder() as rec:
+>>>     ds = argopy.DataFetcher(parallel=True).region([-75, -45, 20, 30, 0, 100, '2011-01', '2011-06']).to_xarray()
+>>> rec.to_chrome_trace("argopy_trace.json")
+
+Memory used by each stage can be traced with :mod:`tracemalloc`, to find which stage of a large request drives the
+memory peak:
+
+>>> with recorder(memory=True) as rec:
+>>>     ds = argopy.DataFetcher().region([-75, -45, 20, 30, 0, 100, '2011-01', '2011-06']).to_xarray()
+>>> rec.summary()[['time', 'max_memory', 'peak_memory']]
+
+A memory budget can also be set, to warn or abort when a stage exceeds it:
+
+>>> argopy.set_options(memory_budget=4 * 2**30, memory_budget_errors='raise')
+
+The budget is checked against the memory peak of a stage when it exits, not while it runs: it is not a hard limit,
+and a stage exceeding it is only reported, or aborted, once completed.
+
+"""
+import os
+import json
+import time
+import threading
+import functools
+import logging
+import warnings
+import tracemalloc
+import numpy as np
+import pandas as pd
+import xarray as xr
+
+from argopy.options import OPTIONS
+from argopy.errors import MemoryBudgetExceeded
+
+
+log = logging.getLogger("argopy.instrumentation")
+
+_RECORDERS = []  # Active recorders, from any thread
+_LOCAL = threading.local()  # Stack of stages being recorded, in each thread
+_MEMORY_LOCK = threading.Lock()
+_MEMORY_SPANS = []  # Stages whose memory is being traced, from any thread
+_TRACEMALLOC = {"started": False}  # Whether tracemalloc was started by argopy
+
+
+def is_recording():
+    """ Return True if pipeline stages are being recorded """
+    return len(_RECORDERS) > 0 or OPTIONS['instrument'] or OPTIONS['memory_budget'] > 0
+
+
+def is_tracing_memory():
+    """ Return True if the memory used by pipeline stages is being traced """
+    return OPTIONS['memory_budget'] > 0 or any([rec.memory for rec in _RECORDERS])
+
+
+def _flush_memory_peak():
+    """ Update the memory peak of all traced stages and reset the tracemalloc peak
+
+        Must be called with the memory lock acquired. Return the size of memory blocks currently traced.
+    """
+    current, peak = tracemalloc.get_traced_memory()
+    if hasattr(tracemalloc, "reset_peak"):
+        tracemalloc.reset_peak()
+    else:
+        peak = current  # Python < 3.9: memory is only sampled at stage boundaries
+    for s in _MEMORY_SPANS:
+        s.memory_peak = max(s.memory_peak, peak)
+    return current
+
+
+def _release_tracemalloc():
+    """ Stop tracemalloc if it was started by argopy and is no longer needed
+
+        Must be called with the memory lock acquired.
+    """
+    if _TRACEMALLOC["started"] and len(_MEMORY_SPANS) == 0 and not is_tracing_memory():
+        tracemalloc.stop()
+        _TRACEMALLOC["started"] = False
+
+
+def _active_recorders():
+    recorders = list(_RECORDERS)
+    if OPTIONS['instrument']:
+        recorders.append(_PROCESS_RECORDER)
+    return recorders
+
+
+def nrows(obj):
+    """ Number of rows of a pipeline stage output, or None
+
+        This is the number of points (or profiles, or rows) of an Argo dataset, the length of a dataframe or a list.
+    """
+    if isinstance(obj, (xr.Dataset, xr.DataArray)):
+        for dim in ["N_POINTS", "N_PROF", "row"]:
+            if dim in obj.dims:
+                return int(obj.sizes[dim])
+    elif isinstance(obj, (pd.DataFrame, list)):
+        return len(obj)
+    return None
+
+
+class span:
+    """ A pipeline stage being recorded, to be used as a context manager
+
+        Attributes of the stage (uri, bytes, cache, rows, ...) can be given at creation or later with :meth:`update`.
+        The stage record is sent to all active recorders when the context exits, with its outcome ("ok" or the name
+        of the exception raised).
+
+        If memory is traced, the record also has the peak of memory allocated during the stage, above the memory
+        allocated when the stage started ("memory"), and the peak of memory allocated by the process ("memory_peak"),
+        in bytes. The ``memory_budget`` option is checked against the latter when the stage exits, not while the
+        stage runs, so that the budget is not a hard limit. The budget is reported for the innermost stage exceeding
+        it only.
+    """
+    active = True
+
+    def __init__(self, name: str, **attrs):
+        self.name = name
+        self.attrs = attrs
+        self.traced = False
+        self.over_budget = False  # Set when the budget was reported by this stage or one of its children
+
+    def update(self, **attrs):
+        """ Set attributes of the stage record """
+        self.attrs.update(attrs)
+
+    def __enter__(self):
+        stack = _LOCAL.__dict__.setdefault("stack", [])
+        self._parent = stack[-1] if len(stack) > 0 else None
+        self.parent = self._parent.name if self._parent is not None else None
+        self.depth = len(stack)
+        stack.append(self)
+        if is_tracing_memory():
+            self._trace_memory()
+        self.start = time.time()
+        self._t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        duration = time.perf_counter() - self._t0
+        _LOCAL.stack.remove(self)
+        error = None
+        if self.traced:
+            error = self._untrace_memory(exc_type)
+            if error is not None and OPTIONS['memory_budget_errors'] == 'raise':
+                exc_type = type(error)
+        record = {
+            "stage": self.name,
+            "start": self.start,
+            "duration": duration,
+            "pid": os.getpid(),
+            "thread": threading.current_thread().name,
+            "parent": self.parent,
+            "depth": self.depth,
+            "outcome": "ok" if exc_type is None else exc_type.__name__,
+            **self.attrs,
+        }
+        for rec in _active_recorders():
+            rec.add(record)
+        log.debug(record)
+        if error is not None:
+            if OPTIONS['memory_budget_errors'] == 'raise':
+                raise error
+            warnings.warn(error.message)
+        return False
+
+    def _trace_memory(self):
+        with _MEMORY_LOCK:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                _TRACEMALLOC["started"] = True
+            self.memory_start = _flush_memory_peak()
+            self.memory_peak = self.memory_start
+            _MEMORY_SPANS.append(self)
+        self.traced = True
+
+    def _untrace_memory(self, exc_type):
+        """ Stop tracing memory of this stage and check the memory budget
+
+            Return a :class:`argopy.errors.MemoryBudgetExceeded` error if this stage is the first to exceed the
+            budget, None otherwise.
+        """
+        with _MEMORY_LOCK:
+            _flush_memory_peak()
+            _MEMORY_SPANS.remove(self)
+            _release_tracemalloc()
+        self.attrs.update(memory=self.memory_peak - self.memory_start, memory_peak=self.memory_peak)
+        budget = OPTIONS['memory_budget']
+        error = None
+        if budget > 0 and self.memory_peak > budget and not self.over_budget and exc_type is None:
+            error = MemoryBudgetExceeded(self.name, self.memory_peak, budget)
+            log.warning(error.message)
+        if (self.over_budget or error is not None) and self._parent is not None:
+            self._parent.over_budget = True
+        return error
+
+
+class _nospan:
+    """ Placeholder of a stage, when nothing is recorded """
+    active = False
+
+    def update(self, **attrs):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+
+_NOSPAN = _nospan()
+
+
+def stage(name: str, **attrs):
+    """ Record a pipeline stage, if recording is on
+
+        Examples
+        --------
+        >>> with stage("download", uri=url) as s:
+        >>>     data = fs.cat_file(url)
+        >>>     s.update(bytes=len(data))
+
+        Returns
+        -------
+        :class:`span`, or a placeholder doing nothing (with an ``active`` attribute set to False) if nothing is
+        recorded.
+    """
+    return span(name, **attrs) if is_recording() else _NOSPAN
+
+
+def instrumented(name: str = None):
+    """ Decorator recording each call of a function as a pipeline stage, with the number of rows returned
+
+        Parameters
+        ----------
+        name: str, optional
+            Name of the stage, the function name by default
+    """
+    def decorator(fct):
+        stage_name = fct.__name__ if name is None else name
+
+        @functools.wraps(fct)
+        def wrapper(*args, **kwargs):
+            if not is_recording():
+                return fct(*args, **kwargs)
+            with span(stage_name) as s:
+                result = fct(*args, **kwargs)
+                s.update(rows=nrows(result))
+            return result
+        return wrapper
+    return decorator
+
+
+class recorder:
+    """ Collect records of pipeline stages
+
+        Use as a context manager to record stages executed within the context, in any thread.
+
+        Parameters
+        ----------
+        memory: bool, default: False
+            Trace the memory allocated by each stage with :mod:`tracemalloc`. This slows down processing.
+    """
+
+    def __init__(self, memory: bool = False):
+        self.records = []
+        self.memory = memory
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        _RECORDERS.append(self)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        _RECORDERS.remove(self)
+        with _MEMORY_LOCK:
+            _release_tracemalloc()
+        return False
+
+    def __len__(self):
+        return len(self.records)
+
+    def __repr__(self):
+        summary = ["<argopy.instrumentation.recorder>", "Records: %i" % len(self)]
+        if len(self) > 0:
+            summary.append(self.summary().to_string())
+        return "\n".join(summary)
+
+    def add(self, record: dict):
+        """ Add a stage record """
+        with self._lock:
+            self.records.append(record)
+
+    def clear(self):
+        """ Remove all records """
+        with self._lock:
+            self.records = []
+
+    def to_dataframe(self):
+        """ Return records as a :class:`pandas.DataFrame`, one row per stage record """
+        return pd.DataFrame(list(self.records))
+
+    def to_chrome_trace(self, path: str = None):
+        """ Export records as Chrome trace events
+
+            Each record is a complete event ("X" phase) on the timeline of its thread, with the record attributes
+            (uri, bytes, cache, rows, outcome, ...) as event arguments. The trace can be opened with a trace viewer,
+            like https://ui.perfetto.dev or chrome://tracing, to see how chunks of a request overlap in a pool of
+            workers.
+
+            Note that stages executed in other processes (eg: with the ``process`` parallel method) are not recorded.
+
+            Parameters
+            ----------
+            path: str, optional
+                Path of a json file to write the trace to
+
+            Returns
+            -------
+            dict
+                The trace, in the Chrome trace event format
+        """
+        records = sorted(self.records, key=lambda r: r["start"])
+        threads = {}  # Thread names to integer ids
+        events = []
+        for r in records:
+            tid = threads.setdefault((r["pid"], r["thread"]), len(threads) + 1)
+            args = {k: v for k, v in r.items() if k not in ["stage", "start", "duration", "pid", "thread", "depth"]}
+            events.append({
+                "name": r["stage"],
+                "cat": "argopy",
+                "ph": "X",
+                "ts": r["start"] * 1e6,
+                "dur": r["duration"] * 1e6,
+                "pid": r["pid"],
+                "tid": tid,
+                "args": {k: v for k, v in args.items() if v is not None},
+            })
+        for (pid, name), tid in threads.items():
+            events.append({"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": name}})
+        trace = {"traceEvents": events, "displayTimeUnit": "ms"}
+        if path is not None:
+            with open(path, "w") as f:
+                json.dump(trace, f, default=str)
+        return trace
+
+    def summary(self):
+        """ Aggregate records by stage
+
+            Returns
+            -------
+            :class:`pandas.DataFrame`
+                One row per stage, in the order they were first recorded, with the number of calls, total, mean
+                and maximum wall time in seconds, total number of bytes and rows, number of cache hits/misses and
+                errors, and, if memory was traced, the maximum memory allocated by a call and the maximum memory
+                allocated by the process during a call, in bytes.
+        """
+        df = self.to_dataframe()
+        if len(df) == 0:
+            return pd.DataFrame()
+        for col in ["bytes", "rows", "cache", "memory", "memory_peak"]:
+            if col not in df:
+                df[col] = np.nan
+        df["cache_hit"] = df["cache"] == "hit"
+        df["cache_miss"] = df["cache"] == "miss"
+        df["errors"] = df["outcome"] != "ok"
+        summary = df.groupby("stage", sort=False).agg(
+            calls=("duration", "size"),
+            time=("duration", "sum"),
+            mean_time=("duration", "mean"),
+            max_time=("duration", "max"),
+            bytes=("bytes", "sum"),
+            rows=("rows", "sum"),
+            cache_hit=("cache_hit", "sum"),
+            cache_miss=("cache_miss", "sum"),
+            errors=("errors", "sum"),
+            max_memory=("memory", "max"),
+            peak_memory=("memory_peak", "max"),
+        )
+        return summary
+
+
+_PROCESS_RECORDER = recorder()  # Collect records when the 'instrument' option is on
+
+
+def get_recorder():
+    """ Return the process-wide recorder, collecting records when the ``instrument`` option is True """
+    return _PROCESS_RECORDER
@@ -22,6 +22,16 @@ DATA_CACHE = "cachedir"
 USER_LEVEL = "mode"
 API_TIMEOUT = "api_timeout"
 TRUST_ENV = "trust_env"
+CACHE_MAX_SIZE = "cache_max_size"
+CACHE_POLICY = "cache_policy"
+CACHE_TTL = "cache_ttl"
+CACHE_COMPRESSION = "cache_compression"
+CACHE_COMPRESSION_LEVEL = "cache_compression_level"
+HTTP_POOL_SIZE = "http_pool_size"
+HTTP_DNS_TTL = "http_dns_ttl"
+INSTRUMENT = "instrument"
+MEMORY_BUDGET = "memory_budget"
+MEMORY_BUDGET_ERRORS = "memory_budget_errors"
 
 # Define the list of available options and default values:
 OPTIONS = {
@@ -31,13 +41,26 @@ OPTIONS = {
     DATA_CACHE: os.path.expanduser(os.path.sep.join(["~", ".cache", "argopy"])),
     USER_LEVEL: "standard",
     API_TIMEOUT: 60,
-    TRUST_ENV: False
+    TRUST_ENV: False,
+    CACHE_MAX_SIZE: 0,  # No limit
+    CACHE_POLICY: "lru",
+    CACHE_TTL: 86400,  # 1 day, the update frequency of the Ifremer erddap
+    CACHE_COMPRESSION: None,
+    CACHE_COMPRESSION_LEVEL: None,  # Codec default
+    HTTP_POOL_SIZE: 100,
+    HTTP_DNS_TTL: 300,
+    INSTRUMENT: False,
+    MEMORY_BUDGET: 0,  # No limit
+    MEMORY_BUDGET_ERRORS: "warn",
 }
 
 # Define the list of possible values
 _DATA_SOURCE_LIST = frozenset(["erddap", "localftp", "argovis"])
 _DATASET_LIST = frozenset(["phy", "bgc", "ref"])
 _USER_LEVEL_LIST = frozenset(["standard", "expert"])
+_CACHE_POLICY_LIST = frozenset(["lru", "lfu"])
+_CACHE_COMPRESSION_LIST = frozenset([None, "gzip", "zstd"])
+_MEMORY_BUDGET_ERRORS_LIST = frozenset(["warn", "raise"])
 
 
 # Define how to validate options:
@@ -45,6 +68,14 @@ def _positive_integer(value):
     return isinstance(value, int) and value > 0
 
 
+def validate_ttl(value):
+    def is_ttl(x):
+        return isinstance(x, int) and x >= 0
+    if isinstance(value, dict):
+        return all([isinstance(k, str) and is_ttl(v) for k, v in value.items()])
+    return is_ttl(value)
+
+
 def validate_ftp(this_path):
     if this_path != "-":
         return check_localftp(this_path, errors='raise')
@@ -60,7 +91,17 @@ _VALIDATORS = {
     DATA_CACHE: os.path.exists,
     USER_LEVEL: _USER_LEVEL_LIST.__contains__,
     API_TIMEOUT: lambda x: isinstance(x, int) and x > 0,
-    TRUST_ENV: lambda x: isinstance(x, bool)
+    TRUST_ENV: lambda x: isinstance(x, bool),
+    CACHE_MAX_SIZE: lambda x: isinstance(x, int) and x >= 0,
+    CACHE_POLICY: _CACHE_POLICY_LIST.__contains__,
+    CACHE_TTL: validate_ttl,
+    CACHE_COMPRESSION: _CACHE_COMPRESSION_LIST.__contains__,
+    CACHE_COMPRESSION_LEVEL: lambda x: x is None or isinstance(x, int),
+    HTTP_POOL_SIZE: lambda x: isinstance(x, int) and x >= 0,
+    HTTP_DNS_TTL: lambda x: isinstance(x, int) and x >= 0,
+    INSTRUMENT: lambda x: isinstance(x, bool),
+    MEMORY_BUDGET: lambda x: isinstance(x, int) and x >= 0,
+    MEMORY_BUDGET_ERRORS: _MEMORY_BUDGET_ERRORS_LIST.__contains__,
 }
 
 
@@ -75,7 +116,7 @@ class set_options:
     - ``src``: Source of fetched data.
         Default: ``erddap``.
         Possible values: ``erddap``, ``localftp``, ``argovis``
-    - ``local_ftp``: Absolute path to a local GDAC ftp copy.
+    - ``local_ftp``: Absolute path to a local GDAC ftp copy, or url of a GDAC mirror (http or https).
         Default: None
     - ``cachedir``: Absolute path to a local cache directory.
         Default: ``~/.cache/argopy``
@@ -87,6 +128,42 @@ class set_options:
     - ``trust_env``: Allow for local environment variables to be used by fsspec to connect to the internet.
         Get proxies information from HTTP_PROXY / HTTPS_PROXY environment variables if this option is True (
         False by default). Also can get proxy credentials from ~/.netrc file if present.
+    - ``cache_max_size``: Maximum size of the cache directory, in bytes. Files are evicted from the cache when this
+        size is exceeded.
+        Default: 0 (no limit)
+    - ``cache_policy``: Which cached files are evicted first when the cache is full.
+        Default: ``lru``.
+        Possible values: ``lru`` (least recently used) or ``lfu`` (least frequently used).
+    - ``cache_ttl``: Time-to-live of cached files, in seconds. Stale files are revalidated against their source
+        before being used. This can also be a dictionary mapping uri patterns to time-to-live, eg:
+        ``{"*ar_index_global_prof*": 86400, "*/D*.nc": 30 * 86400, "*": 86400}``.
+        Use 0 for files that never expire.
+        Default: 86400 (1 day)
+    - ``cache_compression``: Store cached files as compressed blobs named after the hash of their content, so that
+        identical payloads are stored once. Decompression is transparent on read.
+        Default: None (no compression, cached files are stored as downloaded).
+        Possible values: None, ``gzip`` or ``zstd`` (requires the zstandard package).
+    - ``cache_compression_level``: Compression level of cached files.
+        Default: None (codec default)
+    - ``http_pool_size``: Maximum number of simultaneous connections of the http connection pool shared by all
+        stores and fetchers. Use 0 for no limit.
+        Default: 100
+    - ``http_dns_ttl``: Time-to-live of the DNS cache of the http connection pool, in seconds. Use 0 to disable
+        DNS caching.
+        Default: 300
+    - ``instrument``: Record the wall time, bytes transferred, cache hits/misses and number of rows of each data
+        fetching stage, with the process-wide recorder returned by :func:`argopy.instrumentation.get_recorder`.
+        Default: False
+    - ``memory_budget``: Maximum memory, in bytes, that data fetching stages may use. The memory allocated by
+        Python and numpy is traced with :mod:`tracemalloc` while stages are running, and the stage where the budget
+        is first exceeded is reported. The budget is checked when a stage exits, so this is not a hard limit: a
+        stage exceeding it runs to completion (or is killed by the system when out of memory) before being
+        reported.
+        Default: 0 (no limit, memory is not traced)
+    - ``memory_budget_errors``: What to do when the ``memory_budget`` is exceeded.
+        Default: ``warn``.
+        Possible values: ``warn`` (emit a warning) or ``raise`` (abort with a
+        :class:`argopy.errors.MemoryBudgetExceeded` error).
 
     You can use `set_options` either as a context manager:
 
@@ -6,7 +6,7 @@ import hashlib
 
 from argopy.errors import DataNotFound
 from argopy.options import OPTIONS
-from .filesystems import filestore, memorystore
+from .filesystems import filestore, httpstore, memorystore
 
 
 def safe_rewind(this_index_obj):
@@ -463,7 +463,10 @@ class indexstore():
         self.cache = cache
         self.cachedir = OPTIONS['cachedir'] if cachedir == '' else cachedir
         self.fs = {}
-        self.fs['index'] = filestore(cache, cachedir)  # Manage the full index
+        if index_file.startswith(("http://", "https://")):
+            self.fs['index'] = httpstore(cache, cachedir)  # Manage the full index, from a remote GDAC
+        else:
+            self.fs['index'] = filestore(cache, cachedir)  # Manage the full index
         self.fs['search'] = memorystore(cache, cachedir)  # Manage the search results
 
     def cachepath(self, uri: str, errors: str = 'raise'):
@@ -0,0 +1,477 @@
+"""
+Indexed registry of cached files
+
+fsspec keeps track of cached files in a single pickle file that has to be read and written as a whole for every
+update. This module provides a SQLite registry of the cached files with byte accounting, O(1) lookups,
+LRU/LFU eviction of files beyond a maximum cache size and time-to-live policies of cached files.
+
+Cached files can also be stored as compressed blobs named after the hash of their content, so that identical
+payloads from different uris are stored only once.
+
+"""
+import os
+import time
+import gzip
+import fnmatch
+import hashlib
+import pickle
+import shutil
+import sqlite3
+import threading
+import tempfile
+import logging
+from contextlib import closing
+
+
+try:
+    import zstandard
+except ModuleNotFoundError:
+    zstandard = None
+
+
+log = logging.getLogger("argopy.stores")
+
+CACHE_POLICIES = frozenset(["lru", "lfu"])
+CACHE_COMPRESSIONS = {"gzip": ".gz", "zstd": ".zst"}
+BLOBS = "blobs"  # Sub-folder of the cache directory with content-addressed files
+
+
+def compress(data: bytes, compression: str = None, level: int = None):
+    """ Compress bytes with 'gzip' or 'zstd', use the codec default compression level if ``level`` is None """
+    if compression is None:
+        return data
+    elif compression == 'gzip':
+        return gzip.compress(data, compresslevel=9 if level is None else level, mtime=0)
+    elif compression == 'zstd':
+        if zstandard is None:
+            raise ModuleNotFoundError("The 'zstandard' package is required for 'zstd' cache compression")
+        return zstandard.ZstdCompressor(level=3 if level is None else level).compress(data)
+    raise ValueError("Unknown compression '%s', must be one in: %s" % (compression, list(CACHE_COMPRESSIONS)))
+
+
+def decompress(data: bytes, compression: str = None):
+    """ Decompress bytes compressed with :func:`compress` """
+    if compression is None:
+        return data
+    elif compression == 'gzip':
+        return gzip.decompress(data)
+    elif compression == 'zstd':
+        if zstandard is None:
+            raise ModuleNotFoundError("The 'zstandard' package is required to read 'zstd' compressed cache files")
+        return zstandard.ZstdDecompressor().decompressobj().decompress(data)
+    raise ValueError("Unknown compression '%s', must be one in: %s" % (compression, list(CACHE_COMPRESSIONS)))
+
+
+def cache_ttl(uri: str, policy):
+    """ Return the time-to-live of the cached file of an uri, in seconds
+
+        Parameters
+        ----------
+        uri: str
+        policy: int or dict
+            A time-to-live in seconds for all uris, or a dictionary mapping uri patterns (see :mod:`fnmatch`) to
+            time-to-live. The first matching pattern is used, and uris not matching any pattern never expire.
+            A time-to-live of 0 means that cached files never expire.
+
+        Returns
+        -------
+        int
+
+        Examples
+        --------
+        >>> policy = {"*ar_index_global_prof*": 86400, "*/D*.nc": 30 * 86400, "*": 86400}
+        >>> cache_ttl("https://data-argo.ifremer.fr/ar_index_global_prof.txt", policy)
+        86400
+    """
+    if isinstance(policy, dict):
+        for pattern, ttl in policy.items():
+            if fnmatch.fnmatch(uri, pattern):
+                return ttl
+        return 0
+    return policy
+
+
+class cachedb:
+    """ SQLite registry of files in a cache directory
+
+        Each entry records the uri of a cached file, the name of the file in the cache folder, its size in bytes, the
+        time of the last access, the number of accesses, the time the file content was last downloaded or validated
+        against the source and the source validators (ETag and Last-Modified http headers) if any.
+
+        Files moved into content-addressed blobs with :meth:`store` also have the hash of their content and the
+        compression used. A blob shared by several uris is deleted when no uri refers to it anymore.
+
+        Examples
+        --------
+        >>> db = cachedb(OPTIONS['cachedir'])
+        >>> db.record("https://argo/file.nc", "6b3dd3c8c2b7f1b")
+        >>> db.lookup("https://argo/file.nc")
+        >>> db.size
+        >>> db.evict(max_size=1e9, policy='lru')
+        >>> db.store("https://argo/file.nc", "6b3dd3c8c2b7f1b", compression='gzip')
+        >>> db.read("https://argo/file.nc")
+        >>> db.remove(["https://argo/file.nc"])
+    """
+    dbname = "argopy_cache.sqlite"
+    """str: Name of the registry file in the cache directory"""
+
+    def __init__(self, cachedir: str):
+        """
+
+            Parameters
+            ----------
+            cachedir: str
+                Path to the cache directory
+        """
+        self.cachedir = cachedir
+        self.path = os.path.join(cachedir, self.dbname)
+        self._init_db()
+
+    def __repr__(self):
+        return "<cachedb '%s' (%i files, %i bytes)>" % (self.path, len(self), self.size)
+
+    def _connect(self):
+        # A short-lived connection is used for each operation, so that the registry can be used from threads and
+        # forked processes, and survives the cache folder being deleted
+        return closing(sqlite3.connect(self.path, timeout=30))
+
+    def _init_db(self):
+        os.makedirs(self.cachedir, exist_ok=True)
+        new = not os.path.exists(self.path)
+        with self._connect() as con, con:
+            con.execute("CREATE TABLE IF NOT EXISTS files ("
+                        "uri TEXT PRIMARY KEY, fn TEXT, size INTEGER, created REAL, accessed REAL, hits INTEGER, "
+                        "validated REAL, etag TEXT, modified TEXT, digest TEXT, compression TEXT)")
+            # Upgrade registries created by previous versions:
+            columns = [row[1] for row in con.execute("PRAGMA table_info(files)")]
+            for column, kind in [("validated", "REAL"), ("etag", "TEXT"), ("modified", "TEXT"),
+                                 ("digest", "TEXT"), ("compression", "TEXT")]:
+                if column not in columns:
+                    con.execute("ALTER TABLE files ADD COLUMN %s %s" % (column, kind))
+            if "validated" not in columns:
+                con.execute("UPDATE files SET validated=created")
+            con.execute("CREATE INDEX IF NOT EXISTS files_accessed ON files (accessed)")
+            con.execute("CREATE INDEX IF NOT EXISTS files_hits ON files (hits, accessed)")
+            con.execute("CREATE INDEX IF NOT EXISTS files_fn ON files (fn)")
+        if new:
+            self._import_fsspec()
+
+    def _ensure(self):
+        """ Re-create the registry if the cache folder was deleted """
+        if not os.path.exists(self.path):
+            self._init_db()
+
+    def _import_fsspec(self):
+        """ Import entries from the fsspec pickle registry of the cache folder, if any """
+        fn = os.path.join(self.cachedir, "cache")
+        if os.path.exists(fn):
+            try:
+                with open(fn, "rb") as f:
+                    cached_files = pickle.load(f)
+            except Exception:
+                log.debug("Could not read fsspec cache registry: %s" % fn)
+                return
+            self.record_many([(uri, detail['fn'], detail.get('time', None)) for uri, detail in cached_files.items()])
+
+    def _file_size(self, fn):
+        try:
+            return os.path.getsize(os.path.join(self.cachedir, fn))
+        except OSError:
+            return None
+
+    def record(self, uri: str, fn: str, fetched: float = None):
+        """ Record an access to a cached file, register it if new
+
+            Parameters
+            ----------
+            uri: str
+            fn: str
+                Name of the cached file, relative to the cache directory
+            fetched: float, optional
+                Time the file was downloaded, if known (default to now for new entries)
+
+            Returns
+            -------
+            bool
+                True if a new cached file was registered for the uri
+        """
+        return self.record_many([(uri, fn, fetched)])[0]
+
+    def record_many(self, entries: list):
+        """ Record accesses to a list of (uri, fn, fetched) cached files
+
+            If a file does not exist (eg: it was moved into a blob), only the access to the uri is recorded.
+
+            Returns
+            -------
+            list(bool)
+                For each entry, True if a new cached file was registered for the uri
+        """
+        now = time.time()
+        added = []
+        self._ensure()
+        with self._connect() as con, con:
+            for uri, fn, fetched in entries:
+                size = self._file_size(fn)
+                if size is None:
+                    con.execute("UPDATE files SET accessed=?, hits=hits+1 WHERE uri=?", (now, uri))
+                    added.append(False)
+                    continue
+                old = con.execute("SELECT fn FROM files WHERE uri=?", (uri,)).fetchone()
+                con.execute("INSERT INTO files (uri, fn, size, created, accessed, hits, validated) "
+                            "VALUES (?, ?, ?, ?, ?, 1, ?) "
+                            "ON CONFLICT(uri) DO UPDATE SET "
+                            "fn=excluded.fn, size=excluded.size, accessed=excluded.accessed, hits=hits+1, "
+                            "validated=MAX(validated, excluded.validated), digest=NULL, compression=NULL",
+                            (uri, fn, size, now, now, now if fetched is None else fetched))
+                if old is not None and old[0] != fn:
+                    self._release(con, [old[0]])
+                added.append(old is None or old[0] != fn)
+        return added
+
+    def store(self, uri: str, src: str, compression: str = None, level: int = None):
+        """ Move a cached file into a content-addressed blob, possibly compressed
+
+            Blobs are named after the sha256 hash of their content, so that identical payloads are stored once.
+
+            Parameters
+            ----------
+            uri: str
+            src: str
+                Path to the file to store, relative to the cache directory or absolute
+            compression: str, optional
+                'gzip' or 'zstd'
+            level: int, optional
+                Compression level, use the codec default if not set
+
+            Returns
+            -------
+            str
+                Absolute path to the blob
+        """
+        src = os.path.join(self.cachedir, src)
+        with open(src, "rb") as f:
+            data = f.read()
+        digest = hashlib.sha256(data).hexdigest()
+        fn = os.path.join(BLOBS, digest + CACHE_COMPRESSIONS.get(compression, ""))
+        path = os.path.join(self.cachedir, fn)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp = "%s.tmp%i-%i" % (path, os.getpid(), threading.get_ident())
+            with open(tmp, "wb") as f:
+                f.write(compress(data, compression, level))
+            os.replace(tmp, path)
+        if src != path:
+            _remove_file(src)
+        now = time.time()
+        self._ensure()
+        with self._connect() as con, con:
+            old = con.execute("SELECT fn FROM files WHERE uri=?", (uri,)).fetchone()
+            con.execute("INSERT INTO files (uri, fn, size, created, accessed, hits, validated, digest, compression) "
+                        "VALUES (?, ?, ?, ?, ?, 1, ?, ?, ?) "
+                        "ON CONFLICT(uri) DO UPDATE SET "
+                        "fn=excluded.fn, size=excluded.size, validated=excluded.validated, "
+                        "digest=excluded.digest, compression=excluded.compression",
+                        (uri, fn, os.path.getsize(path), now, now, now, digest, compression))
+            if old is not None and old[0] != fn:
+                self._release(con, [old[0]])
+        return path
+
+    def read(self, uri: str):
+        """ Return the content of the blob of an uri, decompressed, or None if the uri is not stored in a blob """
+        self._ensure()
+        with self._connect() as con:
+            row = con.execute("SELECT fn, compression FROM files WHERE uri=? AND digest IS NOT NULL",
+                              (uri,)).fetchone()
+        if row is not None:
+            try:
+                with open(os.path.join(self.cachedir, row[0]), "rb") as f:
+                    return decompress(f.read(), row[1])
+            except FileNotFoundError:
+                pass
+        return None
+
+    def _release(self, con, fns):
+        """ Delete cached files that are not referenced by any uri anymore """
+        released = []
+        for fn in set(fns):
+            if con.execute("SELECT 1 FROM files WHERE fn=? LIMIT 1", (fn,)).fetchone() is None:
+                _remove_file(os.path.join(self.cachedir, fn))
+                released.append(fn)
+        return released
+
+    def entry(self, uri: str):
+        """ Return the registry entry of an uri as a dictionary, or None if not in the cache """
+        self._ensure()
+        with self._connect() as con:
+            row = con.execute("SELECT fn, size, validated, etag, modified, compression FROM files WHERE uri=?",
+                              (uri,)).fetchone()
+        if row is not None and os.path.exists(os.path.join(self.cachedir, row[0])):
+            return {'path': os.path.join(self.cachedir, row[0]), 'size': row[1], 'validated': row[2],
+                    'etag': row[3], 'modified': row[4], 'compression': row[5]}
+        return None
+
+    def validate(self, uri: str, etag: str = None, modified: str = None):
+        """ Record that the cached file of an uri was just downloaded or validated against its source
+
+            Parameters
+            ----------
+            uri: str
+            etag: str, optional
+                Value of the ETag http header of the source
+            modified: str, optional
+                Value of the Last-Modified http header of the source
+        """
+        self._ensure()
+        with self._connect() as con, con:
+            row = con.execute("SELECT fn FROM files WHERE uri=?", (uri,)).fetchone()
+            if row is not None:
+                con.execute("UPDATE files SET validated=?, etag=?, modified=?, size=? WHERE uri=?",
+                            (time.time(), etag, modified, self._file_size(row[0]), uri))
+
+    def lookup(self, uri: str):
+        """ Return the absolute path to the cached file of an uri, or None if not in the registry """
+        self._ensure()
+        with self._connect() as con:
+            row = con.execute("SELECT fn FROM files WHERE uri=?", (uri,)).fetchone()
+        if row is not None:
+            path = os.path.join(self.cachedir, row[0])
+            if os.path.exists(path):
+                return path
+            self._delete([uri])  # File deleted from outside
+        return None
+
+    def __contains__(self, uri):
+        return self.lookup(uri) is not None
+
+    def __len__(self):
+        self._ensure()
+        with self._connect() as con:
+            return con.execute("SELECT COUNT(*) FROM files").fetchone()[0]
+
+    @property
+    def size(self):
+        """ Total size in bytes of the files in the registry (blobs shared by several uris are counted once) """
+        self._ensure()
+        with self._connect() as con:
+            return int(con.execute("SELECT COALESCE(SUM(size), 0) FROM "
+                                   "(SELECT MAX(size) AS size FROM files GROUP BY fn)").fetchone()[0])
+
+    def uris(self, pattern: str = None):
+        """ Return the list of registered uris, possibly matching a SQL LIKE ``pattern`` (eg: '%6902746%') """
+        self._ensure()
+        with self._connect() as con:
+            if pattern is None:
+                rows = con.execute("SELECT uri FROM files").fetchall()
+            else:
+                rows = con.execute("SELECT uri FROM files WHERE uri LIKE ?", (pattern,)).fetchall()
+        return [row[0] for row in rows]
+
+    def _delete(self, uris):
+        with self._connect() as con, con:
+            con.executemany("DELETE FROM files WHERE uri=?", [(uri,) for uri in uris])
+
+    def remove(self, uris: list):
+        """ Delete cached files and registry entries of a list of uris
+
+            Returns
+            -------
+            list(str)
+                List of the uris removed from the registry
+        """
+        self._ensure()
+        with self._connect() as con, con:
+            rows = [con.execute("SELECT uri, fn FROM files WHERE uri=?", (uri,)).fetchone() for uri in set(uris)]
+            rows = [row for row in rows if row is not None]
+            con.executemany("DELETE FROM files WHERE uri=?", [(row[0],) for row in rows])
+            self._release(con, [row[1] for row in rows])
+        return [row[0] for row in rows]
+
+    def evict(self, max_size: int, policy: str = 'lru', keep: list = [], target: float = 0.9):
+        """ Remove files from the cache until its size is below ``max_size``
+
+            Parameters
+            ----------
+            max_size: int
+                Maximum size of the cache, in bytes
+            policy: str
+                Which files are removed first:
+                    - ``lru``: least recently used files
+                    - ``lfu``: least frequently used files (least recently used first for equal number of accesses)
+            keep: list(str)
+                List of uris not to evict
+            target: float
+                Once triggered, eviction goes down to this fraction of ``max_size``, so that it does not happen
+                on every new file
+
+            Returns
+            -------
+            list(str)
+                List of evicted uris
+        """
+        if policy not in CACHE_POLICIES:
+            raise ValueError("Unknown cache eviction policy '%s', must be one in: %s" % (policy, CACHE_POLICIES))
+        total = self.size
+        if total <= max_size:
+            return []
+        order = "accessed" if policy == 'lru' else "hits, accessed"
+        goal = total - int(target * max_size)
+        evicted, freed = [], 0
+        with self._connect() as con, con:
+            for uri, fn, size in con.execute("SELECT uri, fn, size FROM files ORDER BY %s" % order).fetchall():
+                if freed >= goal:
+                    break
+                if uri in keep:
+                    continue
+                con.execute("DELETE FROM files WHERE uri=?", (uri,))
+                if len(self._release(con, [fn])) > 0:
+                    freed += size
+                evicted.append(uri)
+        log.debug("Evicted %i files (%i bytes) from cache %s" % (len(evicted), freed, self.cachedir))
+        return evicted
+
+
+def _remove_file(path):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def prune_fsspec_registry(cachedir: str, uris: list, cached_files: dict = None):
+    """ Remove a list of uris from the fsspec pickle registry of a cache folder, with a single file rewrite
+
+        Parameters
+        ----------
+        cachedir: str
+            Path to the cache directory
+        uris: list(str)
+            List of uris to remove
+        cached_files: dict, optional
+            In-memory fsspec registry to update as well (``fs.cached_files[-1]``)
+
+        Returns
+        -------
+        list(str)
+            Name of the cached files of the uris, relative to ``cachedir``
+    """
+    uris = set(uris)
+    fns = []
+    if cached_files is not None:
+        for uri in uris:
+            detail = cached_files.pop(uri, None)
+            if detail is not None:
+                fns.append(detail['fn'])
+    fn = os.path.join(cachedir, "cache")
+    if len(uris) > 0 and os.path.exists(fn):
+        with open(fn, "rb") as f:
+            cache = pickle.load(f)
+        if not uris.isdisjoint(cache):
+            for uri in uris:
+                detail = cache.pop(uri, None)
+                if detail is not None:
+                    fns.append(detail['fn'])
+            with tempfile.NamedTemporaryFile(mode="wb", delete=False) as f:
+                pickle.dump(cache, f)
+            shutil.move(f.name, fn)
+    return list(set(fns))
@@ -1,12 +1,21 @@
+import io
 import os
+import time
 import types
 import xarray as xr
 import pandas as pd
+import numpy as np
 import fsspec
-import shutil
-import pickle
+from fsspec.asyn import sync
+from fsspec.caching import BaseCache, caches
 import json
-import tempfile
+import codecs
+import asyncio
+import threading
+import weakref
+from collections import OrderedDict
+from urllib.parse import urlsplit, urlunsplit
+import aiohttp
 import warnings
 import logging
 from packaging import version
@@ -25,6 +34,8 @@ except ModuleNotFoundError:
 
 
 from argopy.options import OPTIONS
+from argopy.instrumentation import stage, instrumented, nrows
+from argopy.stores.cache import cachedb, cache_ttl, prune_fsspec_registry
 from argopy.errors import FileSystemHasNoCache, CacheFileNotFound, DataNotFound, \
     InvalidMethod
 from abc import ABC, abstractmethod
@@ -33,6 +44,56 @@ from abc import ABC, abstractmethod
 log = logging.getLogger("argopy.stores")
 
 
+_HTTP_CONNECTORS = {}  # Process-wide aiohttp connection pools, by event loop: (options, connector, sessions)
+_HTTP_RETIRED = []  # Connection pools replaced after a change of options, closed with their last session
+
+
+async def get_client(**kwargs):
+    """ Create an aiohttp client session using the process-wide connection pool
+
+    This is the ``get_client`` argument of fsspec http file systems, so that all argopy stores share keep-alive
+    connections and DNS cache, whatever the number of store or fetcher instances. Sessions do not own the pool, so
+    that closing a file system does not close connections used by others.
+
+    The size of the pool and the time-to-live of DNS cache entries are set with the ``http_pool_size`` and
+    ``http_dns_ttl`` options. When they change, a new pool is opened, and the previous one is closed as soon as the
+    sessions using it are closed.
+
+    Parameters
+    ----------
+    **kwargs:
+        Arguments passed to :class:`aiohttp.ClientSession`
+    """
+    loop = asyncio.get_running_loop()
+    key = (os.getpid(), id(loop))
+    options = (OPTIONS['http_pool_size'], OPTIONS['http_dns_ttl'])
+    pool = _HTTP_CONNECTORS.get(key, None)
+    if pool is not None and pool[0] != options:
+        _HTTP_RETIRED.append((key, pool[1], pool[2]))
+        pool = None
+    if pool is None or pool[1].closed:
+        log.debug("Opening a new http connection pool with options: %s" % str(options))
+        connector = aiohttp.TCPConnector(limit=OPTIONS['http_pool_size'],
+                                         use_dns_cache=OPTIONS['http_dns_ttl'] > 0,
+                                         ttl_dns_cache=OPTIONS['http_dns_ttl'] if OPTIONS['http_dns_ttl'] > 0 else None)
+        pool = (options, connector, weakref.WeakSet())
+        _HTTP_CONNECTORS[key] = pool
+    await _close_retired_pools(key)
+    session = aiohttp.ClientSession(connector=pool[1], connector_owner=False, **kwargs)
+    pool[2].add(session)
+    return session
+
+
+async def _close_retired_pools(key):
+    """ Close retired connection pools of an event loop that are not used by any open session anymore """
+    for retired in [r for r in _HTTP_RETIRED if r[0] == key]:
+        if all([session.closed for session in retired[2]]):
+            _HTTP_RETIRED.remove(retired)
+            if not retired[1].closed:
+                log.debug("Closing a retired http connection pool")
+                await retired[1].close()
+
+
 def new_fs(protocol: str = '', cache: bool = False, cachedir: str = OPTIONS['cachedir'], **kwargs):
     """ Create a new fsspec file system
 
@@ -50,7 +111,8 @@ def new_fs(protocol: str = '', cache: bool = False, cachedir: str = OPTIONS['cac
     default_filesystem_kwargs = {'simple_links': True, "block_size": 0}
     if protocol == 'http':
         default_filesystem_kwargs = {**default_filesystem_kwargs,
-                                     **{"client_kwargs": {"trust_env": OPTIONS['trust_env']}}}
+                                     **{"client_kwargs": {"trust_env": OPTIONS['trust_env']},
+                                        "get_client": get_client}}
     filesystem_kwargs = {**default_filesystem_kwargs, **kwargs}
 
     if not cache:
@@ -63,15 +125,383 @@ def new_fs(protocol: str = '', cache: bool = False, cachedir: str = OPTIONS['cac
                                target_protocol=protocol,
                                target_options={**filesystem_kwargs},
                                cache_storage=cachedir,
-                               expiry_time=86400, cache_check=10)
-        # We use a refresh rate for cache of 1 day,
-        # since this is the update frequency of the Ifremer erddap
+                               expiry_time=False, cache_check=10)
+        # Cached files never expire for fsspec, since time-to-live and revalidation of cached files are
+        # handled by argopy stores (see the 'cache_ttl' option)
         cache_registry = []  # Will hold uri cached by this store instance
         log.debug("Opening a fsspec [filecache] system for '%s' protocol with options: %s" %
                   (protocol, str(filesystem_kwargs)))
     return fs, cache_registry
 
 
+def iter_json(f, chunksize: int = 2**16, **kwargs):
+    """ Iterate over the items of a json array, decoded from a binary file-like object as bytes are read
+
+        Items are decoded and yielded one at a time, as soon as their bytes are available, so that the full json
+        document is never loaded in memory. If the document is not an array, it is decoded as a whole and yielded
+        as the only item.
+
+        Parameters
+        ----------
+        f: binary file-like object
+        chunksize: int
+            Number of bytes to read at once (more are read for items larger than this)
+        **kwargs: (optional)
+            Other arguments passed to :class:`json.JSONDecoder`
+
+        Returns
+        -------
+        generator
+    """
+    decoder = json.JSONDecoder(**kwargs)
+    buffer = _json_buffer(f, chunksize)
+
+    if buffer.next_char() != "[":
+        while not buffer.eof:
+            buffer.read()
+        yield decoder.decode(buffer.text[buffer.pos:])
+        return
+
+    buffer.pos += 1
+    if buffer.next_char() == "]":
+        return
+    while True:
+        yield buffer.decode(decoder)
+        c = buffer.next_char()
+        if c == "]":
+            return
+        elif c != ",":
+            raise json.JSONDecodeError("Expecting ',' delimiter", buffer.text, buffer.pos)
+        buffer.pos += 1
+        buffer.next_char()
+
+
+class _json_buffer:
+    """ Text of a json document decoded from a binary file-like object, read by chunks (see :func:`iter_json`) """
+
+    def __init__(self, f, chunksize: int):
+        self.f = f
+        self.chunksize = chunksize
+        self.utf8 = codecs.getincrementaldecoder("utf-8")()
+        self.text, self.pos, self.eof = "", 0, False
+
+    def read(self):
+        """ Read more bytes, and drop the text before the current position """
+        chunk = self.f.read(max(self.chunksize, len(self.text) - self.pos))  # Read more for large items to remain linear
+        self.eof = len(chunk) == 0
+        self.text = self.text[self.pos:] + self.utf8.decode(chunk, final=self.eof)
+        self.pos = 0
+
+    def next_char(self):
+        """ Skip whitespaces and return the next character, or '' at the end of the document """
+        while True:
+            self.pos = json.decoder.WHITESPACE.match(self.text, self.pos).end()
+            if self.pos < len(self.text) or self.eof:
+                return self.text[self.pos:self.pos + 1]
+            self.read()
+
+    def decode(self, decoder):
+        """ Decode the json value at the current position, reading more bytes until it is complete """
+        while True:
+            try:
+                item, end = decoder.raw_decode(self.text, self.pos)
+                if self.eof or (end < len(self.text) and self.text[end] not in "0123456789.eE+-"):  # Not a truncated number
+                    self.pos = end
+                    return item
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            self.read()
+
+
+class ordered_concat:
+    """ Concatenate a sequence of datasets into growing arrays, preserving the sequence order
+
+        This is the concatenation stage of the ``open_mfdataset`` store methods. Chunks are registered with their
+        position in the original request with :meth:`add`, in any order (eg: as they complete in a pool of workers).
+
+        Each chunk is copied into the output arrays as soon as it is registered, and released. Output arrays are
+        allocated from the first chunk and grown geometrically as chunks arrive (in place, for variables with
+        ``concat_dim`` as first dimension), unless chunk sizes are known beforehand (``sizes`` argument), in which case
+        they are allocated once. Chunks are written in the order they are registered. When all chunks have been
+        registered, :meth:`finalize` trims the arrays to their final size, moves chunks data to their position order if
+        they did not arrive in order, and applies the ``sortby`` permutation once (stable sort, so that the chunk
+        order is preserved for equal keys). This is done one variable at a time, so that peak memory is the final
+        dataset size, plus one variable (and the sort index with ``sortby``).
+
+        Chunks that are not structurally compatible (different sets of variables or different sizes along other
+        dimensions) are concatenated with :class:`xarray.concat` instead, as before.
+
+        Examples
+        --------
+        >>> C = ordered_concat(3, concat_dim='N_POINTS', sortby='TIME')
+        >>> C.add(2, ds2)
+        >>> C.add(0, ds0)
+        >>> C.add(1, None)  # Failed chunk
+        >>> ds = C.finalize()
+    """
+    growth = 1.5  # Growth factor of output arrays
+
+    def __init__(self, n: int, concat_dim: str = 'row', sizes: list = None, sortby=None):
+        """
+
+            Parameters
+            ----------
+            n: int
+                Number of chunks to concatenate
+            concat_dim: str
+                Name of the dimension to concatenate along
+            sizes: list(int), optional
+                Expected size of each chunk along ``concat_dim``. This allows to allocate output arrays once, and to
+                write each chunk at its final position.
+            sortby: str or list(str), optional
+                Name of the variable(s) along ``concat_dim`` to sort the output by
+        """
+        if sizes is not None and len(sizes) != n:
+            raise ValueError("'sizes' must have one value per chunk (%i)" % n)
+        self.n = n
+        self.concat_dim = concat_dim
+        self.sortby = [sortby] if isinstance(sortby, str) else sortby
+        self._sizes = None if sizes is None else [int(s) for s in sizes]
+        self._offsets = None if sizes is None else np.concatenate([[0], np.cumsum(self._sizes)]).astype(int)
+        self._done = [False] * n  # Chunks registered (successful or not)
+        self._ranges = [None] * n  # Position of each chunk data in the output arrays
+        self._skeletons = [None] * n  # Chunks without data along concat_dim (attributes and other variables)
+        self._chunks = [None] * n  # Chunks kept as is, when falling back on xarray.concat
+        self._fallback = False
+        self._signature = None
+        self._out = None  # Output arrays
+        self._axis = None  # Position of concat_dim in output arrays dimensions
+        self._length = 0  # Number of rows written in output arrays
+
+    @property
+    def complete(self):
+        """ True when all chunks have been registered """
+        return all(self._done)
+
+    def _layout(self, ds):
+        """ Return the structure signature of a dataset: variables, dimensions and sizes but the concat one """
+        return {
+            k: (v.dims, tuple(s for d, s in zip(v.dims, v.shape) if d != self.concat_dim))
+            for k, v in ds.variables.items()
+        }
+
+    def add(self, i: int, ds: xr.Dataset = None):
+        """ Register the dataset of chunk ``i``, use ``None`` for failed or empty chunks """
+        if self._done[i]:
+            raise ValueError("Chunk %i already registered" % i)
+        self._done[i] = True
+        if ds is None:
+            return self
+        size = ds.sizes.get(self.concat_dim, 0)
+        if self._sizes is not None and self._sizes[i] != size:
+            raise ValueError("Chunk %i has size %i along '%s', expected %i" %
+                             (i, size, self.concat_dim, self._sizes[i]))
+        # Like xarray.concat, attributes and variables without concat_dim come from the first dataset:
+        self._skeletons[i] = ds.isel({self.concat_dim: slice(0, 0)}).copy(deep=True)
+        if self._signature is None:
+            self._signature = self._layout(ds)
+        if self._fallback or self._layout(ds) != self._signature:
+            if not self._fallback:
+                log.debug("Chunks are not structurally compatible, concatenating with xarray")
+                self._fallback = True
+            self._chunks[i] = ds
+        else:
+            self._write(i, ds)
+        return self
+
+    def _write(self, i, ds):
+        """ Copy the data of chunk ``i`` into output arrays """
+        size = ds.sizes.get(self.concat_dim, 0)
+        if self._out is None:
+            capacity = self._offsets[-1] if self._sizes is not None else size
+            self._out, self._axis = {}, {}
+            for k, v in ds.variables.items():
+                if self.concat_dim in v.dims:
+                    self._axis[k] = v.dims.index(self.concat_dim)
+                    shape = tuple(capacity if d == self.concat_dim else s for d, s in zip(v.dims, v.shape))
+                    self._out[k] = np.empty(shape, dtype=v.dtype)
+
+        if self._sizes is not None:
+            start = self._offsets[i]
+        else:
+            start = self._length
+            self._grow(start + size, exact=self.complete)
+        self._length += size
+        self._ranges[i] = (start, start + size)
+
+        for k, arr in self._out.items():
+            v = ds.variables[k]
+            if not np.can_cast(v.dtype, arr.dtype, casting='safe'):
+                # Eg: '<U1' then '<U3'
+                arr = self._out[k] = arr.astype(np.result_type(v.dtype, arr.dtype))
+            index = (slice(None),) * self._axis[k] + (slice(start, start + size),)
+            arr[index] = v.values
+
+    def _resize(self, k, capacity):
+        """ Resize output array ``k`` along concat_dim, keeping the rows written """
+        arr, axis = self._out[k], self._axis[k]
+        shape = arr.shape[:axis] + (capacity,) + arr.shape[axis + 1:]
+        if axis == 0 and arr.flags['C_CONTIGUOUS'] and arr.flags['OWNDATA']:
+            # Rows are contiguous, so that the array can be reallocated in place, without a copy:
+            arr.resize(shape, refcheck=False)
+        else:
+            new = np.empty(shape, dtype=arr.dtype)
+            index = (slice(None),) * axis + (slice(0, min(self._length, capacity)),)
+            new[index] = arr[index]
+            self._out[k] = new
+
+    def _grow(self, length, exact=False):
+        """ Make sure output arrays can hold ``length`` rows, with some room for the next chunks unless ``exact`` """
+        for k, arr in self._out.items():
+            capacity = arr.shape[self._axis[k]]
+            if length > capacity:
+                self._resize(k, length if exact else max(length, int(np.ceil(capacity * self.growth))))
+
+    def _reorder(self, k):
+        """ Return output array ``k`` with chunks in their position order, trimmed to the rows written """
+        arr, axis = self._out[k], self._axis[k]
+        new = np.empty(arr.shape[:axis] + (self._length,) + arr.shape[axis + 1:], dtype=arr.dtype)
+        start = 0
+        for r in [r for r in self._ranges if r is not None]:
+            stop = start + r[1] - r[0]
+            new[(slice(None),) * axis + (slice(start, stop),)] = arr[(slice(None),) * axis + (slice(*r),)]
+            start = stop
+        return new
+
+    def _dataset(self, template, data):
+        """ Create a dataset from a chunk skeleton and the arrays of variables along concat_dim """
+        variables = {}
+        for k, v in template.variables.items():
+            if k in data:
+                variables[k] = xr.Variable(v.dims, data[k], attrs=v.attrs, encoding=v.encoding)
+            else:
+                variables[k] = v  # compat='override'
+        coords = {k: variables[k] for k in template.coords}
+        data_vars = {k: variables[k] for k in template.data_vars}
+        ds = xr.Dataset(data_vars=data_vars, coords=coords, attrs=template.attrs)
+        ds.encoding = template.encoding
+        return ds
+
+    def _chunk(self, i):
+        """ Return the dataset of chunk ``i``, read back from output arrays if it was written in them """
+        if self._ranges[i] is None:
+            return self._chunks[i]
+        data = {k: arr[(slice(None),) * self._axis[k] + (slice(*self._ranges[i]),)] for k, arr in self._out.items()}
+        return self._dataset(self._skeletons[i], data)
+
+    def finalize(self):
+        """ Return the concatenated :class:`xarray.Dataset`, or None if all chunks are empty """
+        if not self.complete:
+            raise ValueError("Cannot finalize concatenation, %i chunks not registered" % self._done.count(False))
+
+        available = [i for i in range(self.n) if self._skeletons[i] is not None]
+        if len(available) == 0:
+            return None
+
+        if self._fallback:
+            # Fall back on xarray to align/concatenate structurally different datasets:
+            ds = xr.concat([self._chunk(i) for i in available], dim=self.concat_dim, data_vars='minimal',
+                           coords='minimal', compat='override')
+            if self.sortby is not None:
+                ds = ds.sortby(self.sortby)
+            self._out, self._chunks = None, [None] * self.n
+            return ds
+
+        # Reorder and trim output arrays, one variable at a time:
+        ranges = [r for r in self._ranges if r is not None]
+        in_order = all([r0[1] == r1[0] for r0, r1 in zip(ranges[:-1], ranges[1:])]) and \
+            (len(ranges) == 0 or ranges[0][0] == 0)
+        for k in list(self._out):
+            if not in_order:
+                self._out[k] = self._reorder(k)
+            elif self._out[k].shape[self._axis[k]] != self._length:
+                self._resize(k, self._length)
+
+        sorted_arrays = self.sortby is not None and self._sort()
+        ds = self._dataset(self._skeletons[available[0]], self._out)
+        if self.sortby is not None and not sorted_arrays:
+            ds = ds.sortby(self.sortby)
+        self._out, self._skeletons = None, [None] * self.n
+        return ds
+
+    def _sort(self):
+        """ Sort output arrays with a single permutation, if all sortby variables are 1-D output arrays
+
+            Returns
+            -------
+            bool
+                False if output arrays could not be sorted
+        """
+        if not all([k in self._out and self._out[k].ndim == 1 for k in self.sortby]):
+            return False
+        keys = [self._out[k] for k in self.sortby]
+        order = np.lexsort(keys[::-1]) if len(keys) > 1 else np.argsort(keys[0], kind='stable')
+        del keys
+        if not np.all(order[1:] > order[:-1]):
+            for k in list(self._out):
+                self._out[k] = np.take(self._out[k], order, axis=self._axis[k])
+        return True
+
+
+class singleflight:
+    """ Coalesce concurrent calls for the same key into a single execution
+
+        The first caller for a key (the leader) executes the function, while concurrent callers for the same key wait
+        for the leader result (or exception) instead of executing the function again. Keys are released as soon as the
+        leader returns, so this is not a cache.
+
+        Stores use a process-wide instance to download an uri only once when it is requested by several threads at the
+        same time.
+
+        Examples
+        --------
+        >>> flights = singleflight()
+        >>> data = flights.do("https://argo/file.nc", fs.cat_file, "https://argo/file.nc")
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}  # In-flight calls: key -> concurrent.futures.Future
+
+    def __len__(self):
+        return len(self._calls)
+
+    def do(self, key, fct, *args, **kwargs):
+        """ Return ``fct(*args, **kwargs)``, or the result of the in-flight call for the same key """
+        with self._lock:
+            future = self._calls.get(key, None)
+            leader = future is None
+            if leader:
+                future = concurrent.futures.Future()
+                self._calls[key] = future
+        if not leader:
+            log.debug("Waiting for in-flight call: %s" % str(key))
+            return future.result()
+        try:
+            result = fct(*args, **kwargs)
+            future.set_result(result)
+            return result
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+
+
+_INFLIGHT = singleflight()  # Process-wide in-flight downloads
+
+
+def _normalize_uri(uri: str):
+    """ Normalize an uri to identify identical requests: lower case scheme and host, no default port or fragment """
+    parts = urlsplit(uri)
+    netloc = parts.netloc.lower()
+    if (parts.scheme.lower(), netloc.rsplit(":", 1)[-1]) in [("http", "80"), ("https", "443")]:
+        netloc = netloc.rsplit(":", 1)[0]
+    return urlunsplit((parts.scheme.lower(), netloc, parts.path, parts.query, ""))
+
+
 class argo_store_proto(ABC):
     """ Argo Abstract File System
 
@@ -85,6 +515,10 @@ class argo_store_proto(ABC):
     def __init__(self,
                  cache: bool = False,
                  cachedir: str = "",
+                 cache_max_size: int = None,
+                 cache_policy: str = "",
+                 cache_ttl=None,
+                 cache_compression: str = "",
                  **kwargs):
         """ Create a file storage system for Argo data
 
@@ -92,21 +526,77 @@ class argo_store_proto(ABC):
             ----------
             cache: bool (False)
             cachedir: str (from OPTIONS)
+            cache_max_size: int (from OPTIONS)
+                Maximum size of the cache directory, in bytes. Use 0 for no limit.
+            cache_policy: str (from OPTIONS)
+                Eviction policy of cached files, 'lru' or 'lfu'.
+            cache_ttl: int or dict (from OPTIONS)
+                Time-to-live of cached files, in seconds, possibly by uri patterns. Stale files are revalidated
+                against their source before being used. See :func:`argopy.stores.cache.cache_ttl`.
+            cache_compression: str (from OPTIONS)
+                Store cached files as compressed content-addressed blobs, 'gzip' or 'zstd'. Use None to keep
+                cached files as they are downloaded.
             **kwargs: (optional)
                 Other arguments passed to :class:`fsspec.filesystem`
 
         """
         self.cache = cache
         self.cachedir = OPTIONS['cachedir'] if cachedir == '' else cachedir
+        self.cache_max_size = OPTIONS['cache_max_size'] if cache_max_size is None else cache_max_size
+        self.cache_policy = OPTIONS['cache_policy'] if cache_policy == '' else cache_policy
+        self.cache_ttl = OPTIONS['cache_ttl'] if cache_ttl is None else cache_ttl
+        self.cache_compression = OPTIONS['cache_compression'] if cache_compression == '' else cache_compression
+        self.cache_compression_level = OPTIONS['cache_compression_level']
         self._filesystem_kwargs = {**kwargs}
         self.fs, self.cache_registry = new_fs(self.protocol,
                                               self.cache,
                                               self.cachedir,
                                               **self._filesystem_kwargs)
+        self.cachedb = cachedb(self.cachedir) if self.cache else None
 
     def open(self, path, *args, **kwargs):
+        if self._in_blob(path):
+            # Cached content is read in memory from a compressed blob, revalidated by _fetch:
+            data = self._cat(path)
+            mode = args[0] if len(args) > 0 else kwargs.get('mode', 'rb')
+            of = io.BytesIO(data) if 'b' in mode else io.StringIO(data.decode())
+        else:
+            self.revalidate(path)
+            of = self.fs.open(path, *args, **kwargs)
         self.register(path)
-        return self.fs.open(path, *args, **kwargs)
+        return of
+
+    def _in_blob(self, uri):
+        """ Return True if the content of an uri is, or is going to be, cached in a content-addressed blob """
+        if not self.cache:
+            return False
+        if self.cache_compression is not None:
+            return True
+        entry = self.cachedb.entry(self.store_path(uri))
+        return entry is not None and entry['compression'] is not None
+
+    def _read_blob(self, uri):
+        """ Return the content of an uri from a content-addressed cache blob, or None """
+        if self.cache:
+            return self.cachedb.read(self.store_path(uri))
+
+    def _cat(self, uri):
+        """ Return the content of an uri, as bytes
+
+            Concurrent calls for the same uri from any store of the process are coalesced into a single download.
+        """
+        key = (self.protocol, self.cachedir if self.cache else None, _normalize_uri(uri))
+        return _INFLIGHT.do(key, self._fetch, uri)
+
+    def _fetch(self, uri):
+        with stage("download", uri=uri) as s:
+            if s.active and self.cache:
+                s.update(cache="hit" if self.store_path(uri) in self.cachedb else "miss")
+            self.revalidate(uri)
+            data = self._read_blob(uri)
+            data = self.fs.cat_file(uri) if data is None else data
+            s.update(bytes=len(data))
+        return data
 
     def glob(self, path, **kwargs):
         return self.fs.glob(path, **kwargs)
@@ -128,9 +618,98 @@ class argo_store_proto(ABC):
         return path
 
     def register(self, uri):
-        """ Keep track of files open with this instance """
+        """ Keep track of files open with this instance, and record access in the cache registry """
         if self.cache:
-            self.cache_registry.append(self.store_path(uri))
+            path = self.store_path(uri)
+            self.cache_registry.append(path)
+            detail = self.fs.cached_files[-1].get(path, None)
+            if detail is not None:
+                added = self.cachedb.record(path, detail['fn'], fetched=detail.get('time', None))
+                if added:
+                    self._record_validators(path)
+                if self.cache_compression is not None:
+                    # Move a new file from the fsspec cache into a compressed blob:
+                    try:
+                        self.cachedb.store(path, os.path.join(self.fs.storage[-1], detail['fn']),
+                                           compression=self.cache_compression, level=self.cache_compression_level)
+                        added = True
+                    except FileNotFoundError:
+                        pass  # Already in a blob
+                if added and self.cache_max_size > 0:
+                    # The cache can only exceed its maximum size when a new file or blob is added:
+                    evicted = self.cachedb.evict(self.cache_max_size, policy=self.cache_policy, keep=[path])
+                    if len(evicted) > 0:
+                        prune_fsspec_registry(self.fs.storage[-1], evicted, self.fs.cached_files[-1])
+
+    def _record_validators(self, path):
+        """ Store the validators of the source of a new cached file, used by the next revalidation """
+        try:
+            validators = self._validators(path)
+        except Exception as e:
+            log.debug("Could not get validators for %s. Exception raised: %s" % (path, str(e)))
+            return
+        if any([v is not None for v in validators.values()]):
+            self.cachedb.validate(path, **validators)
+
+    def _validators(self, path):
+        """ Return the validators of a source path, as keyword arguments of :meth:`cachedb.validate` """
+        return {}
+
+    def revalidate(self, uri):
+        """ Make sure that the cached file of an uri is not older than its time-to-live
+
+            Stale cached files are validated against their source, and downloaded again only if the source was
+            modified. If the source cannot be reached, the stale cached file is used.
+
+            Returns
+            -------
+            bool
+                True if the cached file was refreshed with a new content
+        """
+        if not self.cache:
+            return False
+        path = self.store_path(uri)
+        ttl = cache_ttl(path, self.cache_ttl)
+        if ttl == 0:
+            return False
+        entry = self.cachedb.entry(path)
+        if entry is None or time.time() - entry['validated'] < ttl:
+            return False
+        try:
+            modified = self._refresh(path, entry)
+            log.debug("Revalidated cached file for %s (%s)" % (uri, "modified" if modified else "not modified"))
+            return modified
+        except Exception as e:
+            log.debug("Could not revalidate cached file for %s, using stale data. Exception raised: %s"
+                      % (uri, str(e)))
+            return False
+
+    def _refresh(self, path, entry):
+        """ Validate the cached file of a source path against the source modification time, download it if modified
+
+            Returns
+            -------
+            bool
+                True if the source was modified and the cached file refreshed
+        """
+        info = self.fs.fs.info(path)
+        mtime = info.get('mtime', None)
+        if isinstance(mtime, (int, float)) and mtime <= entry['validated']:
+            self.cachedb.validate(path)
+            return False
+        tmp = "%s.tmp%i-%i" % (entry['path'], os.getpid(), threading.get_ident())
+        self.fs.fs.get(path, tmp)
+        self._cache_update(path, tmp, entry)
+        self.cachedb.validate(path)
+        return True
+
+    def _cache_update(self, path, src, entry):
+        """ Replace the cached file of a source path by a new download """
+        if entry['compression'] is not None:
+            # Blobs are never modified, since they can be shared by several uris
+            self.cachedb.store(path, src, compression=entry['compression'], level=self.cache_compression_level)
+        else:
+            os.replace(src, entry['path'])
 
     def cachepath(self, uri: str, errors: str = 'raise'):
         """ Return path to cached file for a given URI """
@@ -139,40 +718,53 @@ class argo_store_proto(ABC):
                 raise FileSystemHasNoCache("%s has no cache system" % type(self.fs))
         else:
             store_path = self.store_path(uri)
+            path = self.cachedb.lookup(store_path)
+            if path is not None:
+                return path
+            # Fall back on the fsspec registry, for files cached before the argopy cache registry was created
             self.fs.load_cache()  # Read set of stored blocks from file and populate self.fs.cached_files
             if store_path in self.fs.cached_files[-1]:
-                return os.path.sep.join([self.cachedir, self.fs.cached_files[-1][store_path]['fn']])
+                fn = self.fs.cached_files[-1][store_path]['fn']
+                self.cachedb.record(store_path, fn)
+                return os.path.sep.join([self.cachedir, fn])
             elif errors == 'raise':
                 raise CacheFileNotFound("No cached file found in %s for: \n%s" % (self.fs.storage[-1], uri))
 
-    def _clear_cache_item(self, uri):
-        """ Open fsspec cache registry (pickle file) and remove entry for uri
+    def _clear_cache_items(self, uris):
+        """ Remove cache files and entries for a list of uris
 
+            Cached files are found with the argopy cache registry, and the fsspec cache registry (pickle file) is
+            re-written only once.
         """
-        # See the "save_cache()" method in:
-        # https://filesystem-spec.readthedocs.io/en/latest/_modules/fsspec/implementations/cached.html#WholeFileCacheFileSystem
-        fn = os.path.join(self.fs.storage[-1], "cache")
-        cache = self.fs.cached_files[-1]
-        if os.path.exists(fn):
-            with open(fn, "rb") as f:
-                cached_files = pickle.load(f)
-        else:
-            cached_files = cache
-        cache = {}
-        for k, v in cached_files.items():
-            if k != uri:
-                cache[k] = v.copy()
-            else:
-                os.remove(os.path.join(self.fs.storage[-1], v['fn']))
-        with tempfile.NamedTemporaryFile(mode="wb", delete=False) as f:
-            pickle.dump(cache, f)
-        shutil.move(f.name, fn)
+        uris = list(set(uris))
+        self.cachedb.remove(uris)
+        # Also remove files that the argopy registry did not know about:
+        fns = prune_fsspec_registry(self.fs.storage[-1], uris, self.fs.cached_files[-1])
+        for fn in fns:
+            fn = os.path.join(self.fs.storage[-1], fn)
+            if os.path.exists(fn):
+                os.remove(fn)
+
+    def _clear_cache_item(self, uri):
+        """ Remove cache file and entry for uri """
+        self._clear_cache_items([uri])
 
-    def clear_cache(self):
-        """ Remove cache files and entry from uri open with this store instance """
+    def clear_cache(self, uri=None):
+        """ Remove cache files and entries
+
+            Parameters
+            ----------
+            uri: str or list(str), optional
+                Only clear these uris. By default, clear all uris open with this store instance.
+        """
         if self.cache:
-            for uri in self.cache_registry:
-                self._clear_cache_item(uri)
+            if uri is None:
+                uris = self.cache_registry
+            else:
+                uris = [self.store_path(u) for u in ([uri] if isinstance(uri, str) else uri)]
+            self._clear_cache_items(uris)
+            if uri is None:
+                self.cache_registry.clear()
 
     @abstractmethod
     def open_dataset(self, *args, **kwargs):
@@ -203,23 +795,29 @@ class filestore(argo_store_proto):
             -------
             :class:`xarray.DataSet`
         """
-        with self.open(url) as of:
+        with self.open(url) as of, stage("decode", uri=url) as s:
             log.debug("Opening dataset: %s" % url)
             ds = xr.open_dataset(of, *args, **kwargs)
             ds.load()
+            s.update(rows=nrows(ds))
         if "source" not in ds.encoding:
             if isinstance(url, str):
                 ds.encoding["source"] = url
         return ds.copy()
 
     def _mfprocessor(self, url, preprocess=None, *args, **kwargs):
-        # Load data
-        ds = self.open_dataset(url, *args, **kwargs)
-        # Pre-process
-        if isinstance(preprocess, types.FunctionType) or isinstance(preprocess, types.MethodType):
-            ds = preprocess(ds)
+        with stage("chunk", uri=url) as s:
+            # Load data
+            ds = self.open_dataset(url, *args, **kwargs)
+            # Pre-process
+            if isinstance(preprocess, types.FunctionType) or isinstance(preprocess, types.MethodType):
+                with stage("preprocess", uri=url) as p:
+                    ds = preprocess(ds)
+                    p.update(rows=nrows(ds))
+            s.update(rows=nrows(ds))
         return ds
 
+    @instrumented()
     def open_mfdataset(self,  # noqa: C901
                        urls,
                        concat_dim='row',
@@ -229,6 +827,7 @@ class filestore(argo_store_proto):
                        concat: bool = True,
                        preprocess=None,
                        errors: str = 'ignore',
+                       sortby=None,
                        *args, **kwargs):
         """ Open multiple urls as a single xarray dataset.
 
@@ -258,16 +857,29 @@ class filestore(argo_store_proto):
                 If provided, call this function on each dataset prior to concatenation
             errors: str
                 Should it 'raise' or 'ignore' errors. Default: 'ignore'
+            sortby: str or list(str), optional
+                Name of the variable(s) to sort the concatenated dataset by. Data are sorted once by the
+                concatenation stage, with a single permutation, see :class:`ordered_concat`.
 
             Returns
             -------
             :class:`xarray.Dataset`
+                Datasets are concatenated in the order of ``urls``, whatever the order they were opened in.
 
         """
         if not isinstance(urls, list):
             urls = [urls]
 
-        results = []
+        # Results are stored/concatenated according to their position in the list of urls:
+        results = ordered_concat(len(urls), concat_dim=concat_dim, sortby=sortby) if concat else [None] * len(urls)
+
+        def collect(i, data):
+            if concat:
+                with stage("collect", uri=urls[i], rows=nrows(data)):
+                    results.add(i, data)
+            else:
+                results[i] = data
+
         if method in ['thread', 'process']:
             if method == 'thread':
                 ConcurrentExecutor = concurrent.futures.ThreadPoolExecutor(max_workers=max_workers)
@@ -278,27 +890,26 @@ class filestore(argo_store_proto):
 
             with ConcurrentExecutor as executor:
                 future_to_url = {executor.submit(self._mfprocessor, url,
-                                                 preprocess=preprocess, *args, **kwargs): url
-                                 for url in urls}
+                                                 preprocess=preprocess, *args, **kwargs): i
+                                 for i, url in enumerate(urls)}
                 futures = concurrent.futures.as_completed(future_to_url)
                 if progress:
                     futures = tqdm(futures, total=len(urls))
 
                 for future in futures:
                     data = None
-                    # url = future_to_url[future]
                     try:
                         data = future.result()
                     except Exception as e:
                         if errors == 'ignore':
                             log.debug(
                                 "Ignored error with this file: %s\nException raised: %s"
-                                % (future_to_url[future], str(e.args)))
+                                % (urls[future_to_url[future]], str(e.args)))
                             pass
                         else:
                             raise
                     finally:
-                        results.append(data)
+                        collect(future_to_url[future], data)
 
         # elif type(method) == distributed.client.Client:
         #     # Use a dask client:
@@ -306,10 +917,11 @@ class filestore(argo_store_proto):
         #     results = method.gather(futures)
 
         elif method in ['seq', 'sequential']:
+            iterator = enumerate(urls)
             if progress:
-                urls = tqdm(urls, total=len(urls))
+                iterator = tqdm(iterator, total=len(urls))
 
-            for url in urls:
+            for i, url in iterator:
                 data = None
                 try:
                     data = self._mfprocessor(url, preprocess=preprocess, *args, **kwargs)
@@ -321,22 +933,23 @@ class filestore(argo_store_proto):
                     else:
                         raise
                 finally:
-                    results.append(data)
+                    collect(i, data)
 
         else:
             raise InvalidMethod(method)
 
         # Post-process results
-        results = [r for r in results if r is not None]  # Only keep non-empty results
-        if len(results) > 0:
-            if concat:
-                # ds = xr.concat(results, dim=concat_dim, data_vars='all', coords='all', compat='override')
-                ds = xr.concat(results, dim=concat_dim, data_vars='minimal', coords='minimal', compat='override')
+        if concat:
+            with stage("concat") as s:
+                ds = results.finalize()
+                s.update(rows=nrows(ds))
+            if ds is not None:
                 return ds
-            else:
-                return results
         else:
-            raise DataNotFound(urls)
+            results = [r for r in results if r is not None]  # Only keep non-empty results
+            if len(results) > 0:
+                return results
+        raise DataNotFound(urls)
 
     def read_csv(self, url, **kwargs):
         """ Return a pandas.dataframe from an url that is a csv resource
@@ -351,8 +964,9 @@ class filestore(argo_store_proto):
             :class:`pandas.DataFrame`
         """
         log.debug("Reading csv: %s" % url)
-        with self.open(url) as of:
+        with self.open(url) as of, stage("read_csv", uri=url) as s:
             df = pd.read_csv(of, **kwargs)
+            s.update(rows=len(df))
         return df
 
 
@@ -369,6 +983,64 @@ class httpstore(argo_store_proto):
     """
     protocol = "http"
 
+    def _refresh(self, path, entry):
+        """ Validate the cached file of an url with a conditional request, download it if modified
+
+            The request uses the ETag and Last-Modified validators returned by the server with the last download,
+            if any. The server answers with a 304 status and no content if the resource was not modified.
+
+            Returns
+            -------
+            bool
+                True if the source was modified and the cached file refreshed
+        """
+        headers = {}
+        if entry['etag'] is not None:
+            headers['If-None-Match'] = entry['etag']
+        if entry['modified'] is not None:
+            headers['If-Modified-Since'] = entry['modified']
+        target = self.fs.fs  # The http file system
+
+        async def _get():
+            kw = target.kwargs.copy()
+            kw['headers'] = {**kw.get('headers', {}), **headers}
+            session = await target.set_session()
+            async with session.get(path, **kw) as r:
+                if r.status == 304:
+                    return None, r.headers
+                r.raise_for_status()
+                return await r.read(), r.headers
+
+        data, response_headers = sync(target.loop, _get)
+        etag = response_headers.get('ETag', entry['etag'])
+        modified = response_headers.get('Last-Modified', entry['modified'])
+        if data is not None:
+            tmp = "%s.tmp%i-%i" % (entry['path'], os.getpid(), threading.get_ident())
+            with open(tmp, "wb") as f:
+                f.write(data)
+            self._cache_update(path, tmp, entry)
+        self.cachedb.validate(path, etag=etag, modified=modified)
+        return data is not None
+
+    def _validators(self, path):
+        """ Return the ETag and Last-Modified headers of an url, from a HEAD request
+
+            fsspec does not expose the headers of the response to a download, so that they are requested once the
+            file is cached. The first revalidation of the file can then be a conditional request.
+        """
+        target = self.fs.fs  # The http file system
+
+        async def _head():
+            kw = target.kwargs.copy()
+            kw.setdefault('allow_redirects', True)
+            session = await target.set_session()
+            async with session.head(path, **kw) as r:
+                r.raise_for_status()
+                return r.headers
+
+        response_headers = sync(target.loop, _head)
+        return {'etag': response_headers.get('ETag', None), 'modified': response_headers.get('Last-Modified', None)}
+
     def open_dataset(self, url, *args, **kwargs):
         """ Open and decode a xarray dataset from an url
 
@@ -385,8 +1057,10 @@ class httpstore(argo_store_proto):
         # try:
         # with self.fs.open(url) as of:
         #     ds = xr.open_dataset(of, *args, **kwargs)
-        data = self.fs.cat_file(url)
-        ds = xr.open_dataset(data, *args, **kwargs)
+        data = self._cat(url)
+        with stage("decode", uri=url) as s:
+            ds = xr.open_dataset(data, *args, **kwargs)
+            s.update(rows=nrows(ds))
         if "source" not in ds.encoding:
             if isinstance(url, str):
                 ds.encoding["source"] = url
@@ -404,13 +1078,18 @@ class httpstore(argo_store_proto):
         #     pass
 
     def _mfprocessor_dataset(self, url, preprocess=None, *args, **kwargs):
-        # Load data
-        ds = self.open_dataset(url, *args, **kwargs)
-        # Pre-process
-        if isinstance(preprocess, types.FunctionType) or isinstance(preprocess, types.MethodType):
-            ds = preprocess(ds)
+        with stage("chunk", uri=url) as s:
+            # Load data
+            ds = self.open_dataset(url, *args, **kwargs)
+            # Pre-process
+            if isinstance(preprocess, types.FunctionType) or isinstance(preprocess, types.MethodType):
+                with stage("preprocess", uri=url) as p:
+                    ds = preprocess(ds)
+                    p.update(rows=nrows(ds))
+            s.update(rows=nrows(ds))
         return ds
 
+    @instrumented()
     def open_mfdataset(self,  # noqa: C901
                        urls,
                        concat_dim='row',
@@ -420,6 +1099,7 @@ class httpstore(argo_store_proto):
                        concat: bool = True,
                        preprocess=None,
                        errors: str = 'ignore',
+                       sortby=None,
                        *args, **kwargs):
         """ Open multiple urls as a single xarray dataset.
 
@@ -447,10 +1127,14 @@ class httpstore(argo_store_proto):
                 Display a progress bar (True by default)
             preprocess: callable (optional)
                 If provided, call this function on each dataset prior to concatenation
+            sortby: str or list(str), optional
+                Name of the variable(s) to sort the concatenated dataset by. Data are sorted once by the
+                concatenation stage, with a single permutation, see :class:`ordered_concat`.
 
             Returns
             -------
             :class:`xarray.Dataset`
+                Datasets are concatenated in the order of ``urls``, whatever the order they were opened in.
 
         """
         strUrl = lambda x: x.replace("https://", "").replace("http://", "")  # noqa: E731
@@ -458,8 +1142,17 @@ class httpstore(argo_store_proto):
         if not isinstance(urls, list):
             urls = [urls]
 
-        results = []
+        # Results are stored/concatenated according to their position in the list of urls:
+        results = ordered_concat(len(urls), concat_dim=concat_dim, sortby=sortby) if concat else [None] * len(urls)
         failed = []
+
+        def collect(i, data):
+            if concat:
+                with stage("collect", uri=urls[i], rows=nrows(data)):
+                    results.add(i, data)
+            else:
+                results[i] = data
+
         if method in ['thread', 'process']:
             if method == 'thread':
                 ConcurrentExecutor = concurrent.futures.ThreadPoolExecutor(max_workers=max_workers)
@@ -470,7 +1163,8 @@ class httpstore(argo_store_proto):
 
             with ConcurrentExecutor as executor:
                 future_to_url = {executor.submit(self._mfprocessor_dataset, url,
-                                                 preprocess=preprocess, *args, **kwargs): url for url in urls}
+                                                 preprocess=preprocess, *args, **kwargs): i
+                                 for i, url in enumerate(urls)}
                 futures = concurrent.futures.as_completed(future_to_url)
                 if progress:
                     futures = tqdm(futures, total=len(urls))
@@ -480,9 +1174,9 @@ class httpstore(argo_store_proto):
                     try:
                         data = future.result()
                     except Exception:
-                        failed.append(future_to_url[future])
+                        failed.append(urls[future_to_url[future]])
                         if errors == 'ignore':
-                            log.debug("Ignored error with this url: %s" % strUrl(future_to_url[future]))
+                            log.debug("Ignored error with this url: %s" % strUrl(urls[future_to_url[future]]))
                             # See fsspec.http logger for more
                             pass
                         elif errors == 'silent':
@@ -490,7 +1184,7 @@ class httpstore(argo_store_proto):
                         else:
                             raise
                     finally:
-                        results.append(data)
+                        collect(future_to_url[future], data)
 
         # elif type(method) == distributed.client.Client:
         #     # Use a dask client:
@@ -498,10 +1192,11 @@ class httpstore(argo_store_proto):
         #     results = method.gather(futures)
 
         elif method in ['seq', 'sequential']:
+            iterator = enumerate(urls)
             if progress:
-                urls = tqdm(urls, total=len(urls))
+                iterator = tqdm(iterator, total=len(urls))
 
-            for url in urls:
+            for i, url in iterator:
                 data = None
                 try:
                     data = self._mfprocessor_dataset(url, preprocess=preprocess, *args, **kwargs)
@@ -515,26 +1210,23 @@ class httpstore(argo_store_proto):
                     else:
                         raise
                 finally:
-                    results.append(data)
+                    collect(i, data)
 
         else:
             raise InvalidMethod(method)
 
         # Post-process results
-        results = [r for r in results if r is not None]  # Only keep non-empty results
-        if len(results) > 0:
-            if concat:
-                # ds = xr.concat(results, dim=concat_dim, data_vars='all', coords='all', compat='override')
-                ds = xr.concat(results,
-                               dim=concat_dim,
-                               data_vars='minimal',
-                               coords='minimal',
-                               compat='override')
+        if concat:
+            with stage("concat") as s:
+                ds = results.finalize()
+                s.update(rows=nrows(ds))
+            if ds is not None:
                 return ds
-            else:
-                return results
         else:
-            raise DataNotFound(urls)
+            results = [r for r in results if r is not None]  # Only keep non-empty results
+            if len(results) > 0:
+                return results
+        raise DataNotFound(urls)
 
     def read_csv(self, url, **kwargs):
         """ Read a comma-separated values (csv) url into Pandas DataFrame.
@@ -550,22 +1242,28 @@ class httpstore(argo_store_proto):
 
         """
         log.debug("Opening/reading csv: %s" % url)
-        with self.open(url) as of:
+        with self.open(url) as of, stage("read_csv", uri=url) as s:
             df = pd.read_csv(of, **kwargs)
+            s.update(rows=len(df))
         return df
 
-    def open_json(self, url, **kwargs):
+    def open_json(self, url, stream: bool = False, **kwargs):
         """ Return a json from an url, or verbose errors
 
             Parameters
             ----------
             url: str
+            stream: bool, default: False
+                Return a generator of the json array items, decoded as the response is received (see
+                :func:`iter_json`), instead of the decoded json.
 
             Returns
             -------
             json
 
         """
+        if stream:
+            return self._stream_json(url, **kwargs)
         log.debug("Opening json: %s" % url)
         # try:
         #     with self.open(url) as of:
@@ -575,19 +1273,37 @@ class httpstore(argo_store_proto):
         #     raise
         # except json.JSONDecodeError:
         #     raise
-        data = self.fs.cat_file(url)
-        js = json.loads(data, **kwargs)
+        data = self._cat(url)
+        with stage("decode", uri=url) as s:
+            js = json.loads(data, **kwargs)
+            s.update(rows=nrows(js))
         self.register(url)
         return js
 
+    def _stream_json(self, url, **kwargs):
+        log.debug("Streaming json: %s" % url)
+        with self.open(url, "rb") as of, stage("download", uri=url, stream=True) as s:
+            rows = 0
+            for item in iter_json(of, **kwargs):
+                rows += 1
+                yield item
+            s.update(bytes=of.tell(), rows=rows)
+
     def _mfprocessor_json(self, url, preprocess=None, *args, **kwargs):
-        # Load data
-        data = self.open_json(url, **kwargs)
-        # Pre-process
-        if isinstance(preprocess, types.FunctionType) or isinstance(preprocess, types.MethodType):
-            data = preprocess(data)
+        with stage("chunk", uri=url) as s:
+            # Load data
+            data = self.open_json(url, **kwargs)
+            # Pre-process
+            if isinstance(preprocess, types.FunctionType) or isinstance(preprocess, types.MethodType):
+                with stage("preprocess", uri=url) as p:
+                    data = preprocess(data)
+                    p.update(rows=nrows(data))
+            elif isinstance(data, types.GeneratorType):
+                data = list(data)
+            s.update(rows=nrows(data))
         return data
 
+    @instrumented()
     def open_mfjson(self,  # noqa: C901
                     urls,
                     max_workers=112,
@@ -616,7 +1332,8 @@ class httpstore(argo_store_proto):
             progress: bool
                 Display a progress bar (True by default, not for dask client method)
             preprocess: (callable, optional)
-                If provided, call this function on each json set
+                If provided, call this function on each json set. With ``stream=True``, this function is given a
+                generator of the json array items.
 
             Returns
             -------
@@ -698,6 +1415,130 @@ class httpstore(argo_store_proto):
             raise DataNotFound(urls)
 
 
+class blockcache(BaseCache):
+    """ In-memory cache of file blocks, with readahead, for random access to remote files
+
+        Blocks of ``blocksize`` bytes are kept in memory, up to ``maxblocks`` blocks (least recently used blocks are
+        dropped first). On a cache miss, contiguous missing blocks are fetched with a single range request, extended
+        to the next ``readahead`` blocks not in cache, since netcdf libraries usually read a file sequentially in
+        small pieces.
+
+        This is registered as the "argopy_blocks" fsspec cache type, and used by :class:`httprangestore`.
+    """
+    name = "argopy_blocks"
+
+    def __init__(self, blocksize, fetcher, size, maxblocks=32, readahead=1):
+        super().__init__(blocksize, fetcher, size)
+        self.maxblocks = maxblocks
+        self.readahead = readahead
+        self.nblocks = -(-size // blocksize)
+        self.blocks = OrderedDict()
+        self.nrequests = 0  # Number of range requests sent
+        self.nbytes = 0  # Number of bytes fetched
+
+    def _load(self, blocks):
+        """ Fetch a list of blocks, with one request per run of contiguous blocks """
+        runs = [[blocks[0]]]
+        for i in blocks[1:]:
+            if i == runs[-1][-1] + 1:
+                runs[-1].append(i)
+            else:
+                runs.append([i])
+        for run in runs:
+            start, end = run[0] * self.blocksize, min((run[-1] + 1) * self.blocksize, self.size)
+            data = self.fetcher(start, end)
+            self.nrequests += 1
+            self.nbytes += len(data)
+            for i in run:
+                offset = (i - run[0]) * self.blocksize
+                self.blocks[i] = data[offset:offset + self.blocksize]
+
+    def _fetch(self, start, end):
+        if start is None:
+            start = 0
+        if end is None:
+            end = self.size
+        end = min(end, self.size)
+        if start >= end:
+            return b""
+        first, last = start // self.blocksize, (end - 1) // self.blocksize
+        missing = [i for i in range(first, last + 1) if i not in self.blocks]
+        if len(missing) > 0:
+            i = missing[-1] + 1
+            while i < min(last + 1 + self.readahead, self.nblocks) and i not in self.blocks:
+                missing.append(i)
+                i += 1
+            self._load(missing)
+        for i in range(first, last + 1):
+            self.blocks.move_to_end(i)
+        out = b"".join([self.blocks[i] for i in range(first, last + 1)])
+        while len(self.blocks) > max(self.maxblocks, last - first + 1):
+            self.blocks.popitem(last=False)
+        return out[start - first * self.blocksize:end - first * self.blocksize]
+
+
+caches[blockcache.name] = blockcache
+
+
+class httprangestore(httpstore):
+    """ Argo http file system with random access to remote files
+
+        Remote files are not downloaded as a whole, but read with http range requests, by blocks cached in memory,
+        see :class:`blockcache`. Decoding a netcdf file with :meth:`open_dataset` only transfers the header and the
+        data actually loaded, since variables of NetCDF4/HDF5 files are read lazily (this requires the h5netcdf
+        package). NetCDF3 (classic) files are decoded at once, but still through the block cache.
+
+        The http server must support range requests, otherwise files are transferred up to the requested range.
+
+        With ``cache=True``, files are downloaded and cached as a whole, like with :class:`httpstore`.
+
+        This store is used by the ``localftp`` data fetcher to read a remote GDAC.
+    """
+    def __init__(self, block_size: int = 2**20, maxblocks: int = 32, readahead: int = 1, **kwargs):
+        """ Create a http file storage system with random access to remote files
+
+            Parameters
+            ----------
+            block_size: int (1MB)
+                Size of blocks, in bytes, that are fetched and cached in memory
+            maxblocks: int (32)
+                Maximum number of blocks kept in memory, for each opened file
+            readahead: int (1)
+                Number of blocks fetched beyond the requested range on a cache miss
+            **kwargs: (optional)
+                Other arguments passed to :class:`httpstore`
+        """
+        self.block_size = block_size
+        self.maxblocks = maxblocks
+        self.readahead = readahead
+        super().__init__(**kwargs)
+
+    def open(self, path, *args, **kwargs):
+        """ Open a remote file with random access (read-only) """
+        if self.cache:
+            return super().open(path, *args, **kwargs)
+        return self.fs.open(path, mode="rb", block_size=self.block_size, cache_type=blockcache.name,
+                            cache_options={'maxblocks': self.maxblocks, 'readahead': self.readahead})
+
+    def open_dataset(self, url, *args, **kwargs):
+        """ Open and decode a xarray dataset from an url, with range requests
+
+            Parameters
+            ----------
+            url: str
+
+            Returns
+            -------
+            :class:`xarray.Dataset`
+        """
+        if self.cache:
+            return super().open_dataset(url, *args, **kwargs)
+        log.debug("Opening dataset with range requests: %s" % url)
+        ds = xr.open_dataset(self.open(url), *args, **kwargs)
+        ds.encoding["source"] = url
+        return ds
+
+
 class memorystore(filestore):
     """ Argo in-memory file system
 
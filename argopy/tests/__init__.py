@@ -150,6 +150,12 @@ has_matplotlib, requires_matplotlib = _importorskip("matplotlib")
 has_seaborn, requires_seaborn = _importorskip("seaborn")
 has_cartopy, requires_cartopy = _importorskip("cartopy")
 
+#########
+# STORE #
+#########
+has_zstandard, requires_zstandard = _importorskip("zstandard")
+has_h5netcdf, requires_h5netcdf = _importorskip("h5netcdf")
+
 ############
 # Fix for issues discussed here:
 # - https://github.com/euroargodev/argopy/issues/63#issuecomment-742379699
@@ -1,4 +1,7 @@
+import io
+import json
 import numpy as np
+import pandas as pd
 import xarray as xr
 
 import pytest
@@ -14,6 +17,28 @@ from argopy.utilities import is_list_of_strings
 from . import requires_connected_argovis, safe_to_server_errors
 
 
+def test_json2dataframe():
+    """ Profiles can be converted from a streamed response """
+    from argopy.data_fetchers.argovis_data import Fetch_wmo
+    from argopy.stores.filesystems import iter_json
+    fetcher = Fetch_wmo(WMO=[6902746])
+    profiles = [{"_id": "6902746_%i" % cyc, "cycle_number": cyc, "lat": 35.0, "lon": -70.0,
+                 "measurements": [{"pres": float(p), "temp": 10.0 - p} for p in range(cyc)]} for cyc in range(5)]
+    profiles[2]["measurements"][0]["psal"] = 35.0
+    df = fetcher.json2dataframe(iter_json(io.BytesIO(json.dumps(profiles).encode())))
+    assert isinstance(df, pd.DataFrame) and len(df) == 10
+    np.testing.assert_array_equal(df["cycle_number"], np.repeat(np.arange(5), np.arange(5)))
+    np.testing.assert_array_equal(df["pres"], np.concatenate([np.arange(cyc) for cyc in range(5)]))
+    assert df["psal"].notna().sum() == 1 and df["psal"][1] == 35.0
+    assert len(fetcher.json2dataframe(profiles[3])) == 3
+
+    # Profile metadata take precedence over measurements:
+    profiles[3]["pres"] = -1.0
+    df = fetcher.json2dataframe(profiles)
+    np.testing.assert_array_equal(df["pres"], [0, 0, 1, -1, -1, -1, 0, 1, 2, 3])
+    assert df["psal"].dtype == float and df["_id"].tolist()[-4:] == ["6902746_4"] * 4
+
+
 @requires_connected_argovis
 class Test_Backend:
     """ Test main API facade for all available dataset and access points of the ARGOVIS data fetching backend """
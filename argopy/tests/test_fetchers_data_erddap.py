@@ -20,6 +20,29 @@ from . import (
 )
 
 
+def test_uri_chunks():
+    """ URLs of chunked requests do not require sub-fetchers """
+    from argopy.data_fetchers.erddap_data import Fetch_wmo, Fetch_box
+    WMO = [6902746, 6902747, 6902757, 6902766, 6902771, 6902772]
+    uri = Fetch_wmo(WMO=WMO, CYC=[1, 2]).uri
+    assert is_list_of_strings(uri) and len(uri) == len(WMO)
+    assert all(['platform_number=~"%i"&cycle_number=~"1|2"' % wmo in url for wmo, url in zip(WMO, uri)])
+    assert len(Fetch_wmo(WMO=WMO, parallel=True, chunks={'wmo': 2}).uri) == 2
+    uri = Fetch_box(box=[-70, -65, 35.0, 40.0, 0, 10.0, "2012-01", "2012-06"], parallel=True).uri
+    assert len(uri) > 1 and len(set(uri)) == len(uri)
+
+    # Chunk URLs leave the fetcher with constraints of the whole request:
+    fetcher = Fetch_wmo(WMO=WMO, parallel=True, chunks={'wmo': 2})
+    url, cname = fetcher.get_url(), fetcher.cname()
+    constraints = dict(fetcher.erddap.constraints)
+    assert url not in fetcher.uri
+    assert fetcher.erddap.constraints == constraints
+    assert fetcher.get_url() == url and fetcher.cname() == cname
+    fetcher = Fetch_box(box=[-70, -65, 35.0, 40.0, 0, 10.0, "2012-01", "2012-06"], parallel=True)
+    fetcher.uri
+    assert fetcher.erddap.constraints["longitude>="] == -70 and fetcher.erddap.constraints["longitude<="] == -65
+
+
 @requires_connected_erddap
 class Test_Backend:
     """ Test ERDDAP data fetching backend """
@@ -1,4 +1,7 @@
 import os
+import http.server
+import functools
+import threading
 import numpy as np
 import xarray as xr
 
@@ -14,6 +17,26 @@ from . import requires_localftp, safe_to_server_errors
 AVAILABLE_SOURCES = list_available_data_src()
 
 
+def test_remote_ftp():
+    """ File paths of a remote GDAC mirror are found with the same patterns """
+    from argopy.data_fetchers.localftp_data import Fetch_wmo
+    with tempfile.TemporaryDirectory() as folder:
+        os.makedirs(os.path.join(folder, "dac", "coriolis", "6902746", "profiles"))
+        for file in ["6902746_prof.nc", "profiles/R6902746_001.nc", "profiles/D6902746_002.nc"]:
+            with open(os.path.join(folder, "dac", "coriolis", "6902746", file), "w") as f:
+                f.write("CDF")
+        handler = functools.partial(http.server.SimpleHTTPRequestHandler, directory=folder)
+        with http.server.ThreadingHTTPServer(("localhost", 0), handler) as server:
+            threading.Thread(target=server.serve_forever, daemon=True).start()
+            url = "http://localhost:%i" % server.server_address[1]
+            assert Fetch_wmo(local_ftp=url, WMO=[6902746]).uri == ["%s/dac/coriolis/6902746/6902746_prof.nc" % url]
+            assert Fetch_wmo(local_ftp=url, WMO=[6902746], CYC=[1, 2]).uri == [
+                "%s/dac/coriolis/6902746/profiles/%s6902746_00%i.nc" % (url, mode, cyc) for mode, cyc in [("R", 1), ("D", 2)]]
+            with pytest.raises(FtpPathError):
+                Fetch_wmo(local_ftp=url + "/dac", WMO=[6902746])
+            server.shutdown()
+
+
 @requires_localftp
 class Test_Backend:
     """ Test LOCAL FTP data fetching backend """
@@ -0,0 +1,154 @@
+import os
+import json
+import http.server
+import functools
+import threading
+import concurrent.futures
+import tempfile
+import tracemalloc
+import pytest
+
+import numpy as np
+import xarray as xr
+
+import argopy
+from argopy.stores import httpstore
+from argopy.errors import MemoryBudgetExceeded
+from argopy.instrumentation import stage, instrumented, recorder, get_recorder, is_recording
+
+
+def test_not_recording():
+    assert not is_recording()
+    with stage("download", uri="file") as s:
+        s.update(bytes=1)
+    assert not s.active
+    assert len(get_recorder()) == 0
+
+
+def test_recorder():
+    with recorder() as rec:
+        assert is_recording()
+        with stage("fetch", uri="file") as s:
+            with stage("download"):
+                pass
+            s.update(bytes=10, cache="miss")
+        with pytest.raises(ValueError):
+            with stage("decode"):
+                raise ValueError()
+    with stage("fetch"):
+        pass
+    assert [r["stage"] for r in rec.records] == ["download", "fetch", "decode"]
+    assert rec.records[0]["parent"] == "fetch" and rec.records[1]["depth"] == 0
+    assert rec.records[1]["bytes"] == 10 and rec.records[2]["outcome"] == "ValueError"
+    summary = rec.summary()
+    assert list(summary.index) == ["download", "fetch", "decode"]
+    assert summary.loc["fetch", "cache_miss"] == 1 and summary.loc["decode", "errors"] == 1
+    assert "fetch" in repr(rec)
+    rec.clear()
+    assert len(rec) == 0 and len(rec.summary()) == 0
+
+
+def test_threads():
+    @instrumented("work")
+    def work(n):
+        return list(range(n))
+
+    with recorder() as rec:
+        with concurrent.futures.ThreadPoolExecutor(4) as executor:
+            list(executor.map(work, range(8)))
+    assert len(rec) == 8
+    assert sorted([r["rows"] for r in rec.records]) == list(range(8))
+    assert rec.summary().loc["work", "calls"] == 8
+
+
+def test_option():
+    get_recorder().clear()
+    with argopy.set_options(instrument=True):
+        ds = xr.Dataset({"PRES": ("N_POINTS", np.arange(3.))}).argo.cast_types()
+    assert ds["PRES"].dtype == float
+    records = get_recorder().records
+    assert len(records) == 1 and records[0]["stage"] == "cast_types" and records[0]["rows"] == 3
+    get_recorder().clear()
+
+
+def test_memory():
+    size = 8 * 2**20
+    with recorder(memory=True) as rec:
+        with stage("fetch"):
+            with stage("allocate"):
+                data = np.ones(size // 8)
+                del data
+            with stage("nothing"):
+                pass
+    assert not tracemalloc.is_tracing()
+    records = {r["stage"]: r for r in rec.records}
+    assert records["allocate"]["memory"] >= size and records["fetch"]["memory"] >= size
+    assert records["nothing"]["memory"] < size
+    assert rec.summary().loc["allocate", "max_memory"] >= size
+
+    with recorder() as rec:
+        with stage("allocate"):
+            pass
+    assert "memory" not in rec.records[0]
+
+
+def test_memory_budget():
+    size = 8 * 2**20
+    with recorder() as rec:
+        with argopy.set_options(memory_budget=size // 2):
+            with pytest.warns(UserWarning, match="allocate"):
+                with stage("fetch"):
+                    with stage("allocate"):
+                        np.ones(size // 8)
+            with argopy.set_options(memory_budget_errors="raise"):
+                with pytest.raises(MemoryBudgetExceeded) as e:
+                    with stage("fetch"):
+                        with stage("allocate"):
+                            np.ones(size // 8)
+                assert e.value.stage == "allocate" and e.value.peak > e.value.budget
+    assert not tracemalloc.is_tracing()
+    assert [r["outcome"] for r in rec.records] == ["ok", "ok", "MemoryBudgetExceeded", "MemoryBudgetExceeded"]
+
+
+def test_stores():
+    with tempfile.TemporaryDirectory() as folder, tempfile.TemporaryDirectory() as cachedir:
+        for i in range(3):
+            ds = xr.Dataset({"TEMP": ("row", np.arange(10.))})
+            ds.to_netcdf(os.path.join(folder, "%i.nc" % i), format="NETCDF3_64BIT")
+        handler = functools.partial(http.server.SimpleHTTPRequestHandler, directory=folder)
+        with http.server.ThreadingHTTPServer(("localhost", 0), handler) as server:
+            threading.Thread(target=server.serve_forever, daemon=True).start()
+            urls = ["http://localhost:%i/%i.nc" % (server.server_address[1], i) for i in range(3)]
+            fs = httpstore(cache=True, cachedir=cachedir)
+            with recorder() as rec:
+                fs.open_mfdataset(urls, method="thread")
+                fs.open_mfdataset(urls, method="sequential")
+            server.shutdown()
+        size = os.path.getsize(os.path.join(folder, "0.nc"))
+    summary = rec.summary()
+    assert summary.loc["chunk", "calls"] == 6 and summary.loc["concat", "rows"] == 60
+    assert summary.loc["download", "cache_miss"] == 3 and summary.loc["download", "cache_hit"] == 3
+    assert summary.loc["download", "bytes"] == 6 * size
+    assert all([r["parent"] == "chunk" for r in rec.records if r["stage"] in ["download", "decode"]])
+
+
+def test_chrome_trace():
+    @instrumented("work")
+    def work(n):
+        with stage("download", uri="file%i" % n, bytes=n, cache=None):
+            return list(range(n))
+
+    with recorder() as rec:
+        with concurrent.futures.ThreadPoolExecutor(2) as executor:
+            list(executor.map(work, range(4)))
+    with tempfile.TemporaryDirectory() as folder:
+        rec.to_chrome_trace(os.path.join(folder, "trace.json"))
+        with open(os.path.join(folder, "trace.json")) as f:
+            trace = json.load(f)
+    events = [e for e in trace["traceEvents"] if e["ph"] == "X"]
+    threads = [e for e in trace["traceEvents"] if e["ph"] == "M"]
+    assert len(events) == 8 and len(threads) == 2
+    assert all([e["dur"] >= 0 and isinstance(e["tid"], int) for e in events])
+    download = [e for e in events if e["name"] == "download"][0]
+    assert download["args"]["parent"] == "work" and "cache" not in download["args"]
+    assert set(download["args"]) == {"parent", "outcome", "uri", "bytes"}
@@ -67,3 +67,60 @@ def test_trust_env():
         argopy.set_options(trust_env='toto')
     with pytest.raises(ValueError):
         argopy.set_options(trust_env=0)
+
+
+def test_opt_cache_max_size():
+    with pytest.raises(OptionValueError):
+        argopy.set_options(cache_max_size=-1)
+    with pytest.raises(OptionValueError):
+        argopy.set_options(cache_max_size='1Gb')
+    with argopy.set_options(cache_max_size=10000):
+        assert OPTIONS["cache_max_size"] == 10000
+
+
+def test_opt_cache_policy():
+    with pytest.raises(OptionValueError):
+        argopy.set_options(cache_policy='fifo')
+    with argopy.set_options(cache_policy='lfu'):
+        assert OPTIONS["cache_policy"] == 'lfu'
+
+
+def test_opt_cache_ttl():
+    with pytest.raises(OptionValueError):
+        argopy.set_options(cache_ttl=-1)
+    with pytest.raises(OptionValueError):
+        argopy.set_options(cache_ttl={"*.nc": "1 day"})
+    with argopy.set_options(cache_ttl={"*ar_index_global_prof*": 86400, "*": 0}):
+        assert OPTIONS["cache_ttl"]["*"] == 0
+
+
+def test_opt_cache_compression():
+    with pytest.raises(OptionValueError):
+        argopy.set_options(cache_compression='bz2')
+    with pytest.raises(OptionValueError):
+        argopy.set_options(cache_compression_level='max')
+    with argopy.set_options(cache_compression='gzip', cache_compression_level=3):
+        assert OPTIONS["cache_compression"] == 'gzip'
+
+
+def test_opt_http_pool():
+    with pytest.raises(OptionValueError):
+        argopy.set_options(http_pool_size=-1)
+    with pytest.raises(OptionValueError):
+        argopy.set_options(http_dns_ttl=1.5)
+
+
+def test_opt_instrument():
+    with pytest.raises(OptionValueError):
+        argopy.set_options(instrument=1)
+    with argopy.set_options(instrument=True):
+        assert OPTIONS["instrument"]
+
+
+def test_opt_memory_budget():
+    with pytest.raises(OptionValueError):
+        argopy.set_options(memory_budget=-1)
+    with pytest.raises(OptionValueError):
+        argopy.set_options(memory_budget_errors="ignore")
+    with argopy.set_options(memory_budget=2**30, memory_budget_errors="raise"):
+        assert OPTIONS["memory_budget"] == 2**30 and OPTIONS["memory_budget_errors"] == "raise"
@@ -1,7 +1,16 @@
+import io
 import os
+import re
+import json
+import time
+import http.server
+import functools
+import concurrent.futures
+import threading
 import pytest
 import tempfile
 
+import numpy as np
 import xarray as xr
 import pandas as pd
 import fsspec
@@ -12,14 +21,17 @@ import argopy
 from argopy.stores import (
     filestore,
     httpstore,
+    httprangestore,
     indexfilter_wmo,
     indexfilter_box,
     indexstore,
 )
-from argopy.stores.filesystems import new_fs
+from argopy.stores.filesystems import new_fs, ordered_concat, singleflight, blockcache, iter_json
+from argopy.stores.cache import cachedb, cache_ttl
 from argopy.options import OPTIONS
 from argopy.errors import FileSystemHasNoCache, CacheFileNotFound
-from . import requires_connection, requires_connected_argovis, skip_this_for_debug, safe_to_server_errors
+from . import requires_zstandard, requires_h5netcdf, requires_connection, requires_connected_argovis, skip_this_for_debug, \
+    safe_to_server_errors
 from argopy.utilities import is_list_of_datasets, is_list_of_dicts, modified_environ
 
 
@@ -121,6 +133,520 @@ class Test_FileStore:
             os.remove(uri)  # Delete dummy file
 
 
+class Test_cachedb:
+
+    def create_files(self, folder, n=5, size=1000):
+        files = []
+        for i in range(n):
+            fn = os.path.join(folder, "file_%i.bin" % i)
+            with open(fn, "wb") as f:
+                f.write(b"0" * size)
+            files.append(fn)
+        return files
+
+    def test_registry(self):
+        with tempfile.TemporaryDirectory() as cachedir:
+            db = cachedb(cachedir)
+            self.create_files(cachedir, n=2)
+            db.record("uri_0", "file_0.bin")
+            db.record("uri_1", "file_1.bin")
+            db.record("uri_9", "file_9.bin")  # No such file, not recorded
+            assert len(db) == 2
+            assert db.size == 2000
+            assert db.lookup("uri_0") == os.path.join(cachedir, "file_0.bin")
+            assert db.lookup("uri_9") is None
+            assert db.uris("%_1") == ["uri_1"]
+            assert db.remove(["uri_0", "uri_9"]) == ["uri_0"]
+            assert not os.path.exists(os.path.join(cachedir, "file_0.bin"))
+            assert "uri_0" not in db
+
+    @pytest.mark.parametrize("policy, evicted", [("lru", "uri_1"), ("lfu", "uri_2")])
+    def test_evict(self, policy, evicted):
+        with tempfile.TemporaryDirectory() as cachedir:
+            db = cachedb(cachedir)
+            self.create_files(cachedir, n=3)
+            for i in [0, 1, 1, 2, 0]:
+                db.record("uri_%i" % i, "file_%i.bin" % i)
+                time.sleep(0.01)
+            assert db.evict(3000, policy=policy) == []
+            assert db.evict(2500, policy=policy) == [evicted]
+            assert db.size == 2000
+            with pytest.raises(ValueError):
+                db.evict(1000, policy='fifo')
+
+    def test_filestore(self):
+        with tempfile.TemporaryDirectory() as folder, tempfile.TemporaryDirectory() as cachedir:
+            files = self.create_files(folder, n=5)
+            fs = filestore(cache=True, cachedir=cachedir, cache_max_size=3000)
+            for fn in files:
+                with fs.open(fn) as f:
+                    f.read()
+            # Cache size is limited and the least recently used files are evicted:
+            assert fs.cachedb.size <= 3000
+            assert isinstance(fs.cachepath(files[-1]), str)
+            with pytest.raises(CacheFileNotFound):
+                fs.cachepath(files[0])
+
+            # Reading a cached file does not trigger an eviction:
+            evict = fs.cachedb.evict
+            fs.cachedb.evict = lambda *args, **kwargs: pytest.fail("Unexpected eviction")
+            with fs.open(files[-1]) as f:
+                f.read()
+            fs.cachedb.evict = evict
+
+            # Selective clear:
+            fs.clear_cache(files[-1])
+            with pytest.raises(CacheFileNotFound):
+                fs.cachepath(files[-1])
+            assert isinstance(fs.cachepath(files[-2]), str)
+            fs.clear_cache()
+            assert len(fs.cachedb) == 0
+            assert sorted(os.listdir(cachedir)) == ['argopy_cache.sqlite', 'cache']
+
+    def test_import_fsspec_registry(self):
+        with tempfile.TemporaryDirectory() as folder, tempfile.TemporaryDirectory() as cachedir:
+            files = self.create_files(folder, n=2)
+            fs = filestore(cache=True, cachedir=cachedir)
+            for fn in files:
+                fs.open(fn).close()
+            os.remove(fs.cachedb.path)
+            db = cachedb(cachedir)
+            assert len(db) == 2
+
+
+class Test_cache_ttl:
+
+    def age(self, fs, uri, dt=3600):
+        """ Make a cached file look older than it is """
+        with fs.cachedb._connect() as con, con:
+            con.execute("UPDATE files SET validated=? WHERE uri=?", (time.time() - dt, uri))
+
+    def test_policy(self):
+        policy = {"*ar_index_global_prof*": 86400, "*/D*.nc": 30 * 86400}
+        assert cache_ttl("https://data-argo.ifremer.fr/ar_index_global_prof.txt", policy) == 86400
+        assert cache_ttl("https://data-argo.ifremer.fr/dac/aoml/13857/profiles/D13857_001.nc", policy) == 30 * 86400
+        assert cache_ttl("https://data-argo.ifremer.fr/dac/aoml/13857/profiles/R13857_001.nc", policy) == 0
+        assert cache_ttl("https://data-argo.ifremer.fr/dac/aoml/13857/profiles/R13857_001.nc", 60) == 60
+
+    def test_filestore(self):
+        with tempfile.TemporaryDirectory() as folder, tempfile.TemporaryDirectory() as cachedir:
+            src = os.path.join(folder, "data.txt")
+            with open(src, "w") as f:
+                f.write("a")
+            fs = filestore(cache=True, cachedir=cachedir, cache_ttl={"*.txt": 60})
+            with fs.open(src, "r") as f:
+                assert f.read() == "a"
+
+            # Fresh cached file is used, even if the source is modified:
+            with open(src, "w") as f:
+                f.write("b")
+            os.utime(src, (time.time() + 10, time.time() + 10))
+            with fs.open(src, "r") as f:
+                assert f.read() == "a"
+
+            # Stale cached file is refreshed if the source is modified:
+            self.age(fs, src)
+            with fs.open(src, "r") as f:
+                assert f.read() == "b"
+            os.utime(src, (time.time() - 7200, time.time() - 7200))
+            self.age(fs, src)
+            assert not fs.revalidate(src)
+
+    def test_httpstore(self):
+        with tempfile.TemporaryDirectory() as folder, tempfile.TemporaryDirectory() as cachedir:
+            src = os.path.join(folder, "data.json")
+            with open(src, "w") as f:
+                f.write('{"a": 1}')
+            handler = functools.partial(http.server.SimpleHTTPRequestHandler, directory=folder)
+            with http.server.ThreadingHTTPServer(("localhost", 0), handler) as server:
+                threading.Thread(target=server.serve_forever, daemon=True).start()
+                url = "http://localhost:%i/data.json" % server.server_address[1]
+                fs = httpstore(cache=True, cachedir=cachedir, cache_ttl=60)
+                assert fs.open_json(url) == {"a": 1}
+
+                # The Last-Modified header is stored with the cached file:
+                assert fs.cachedb.entry(url)['modified'] is not None
+
+                # Not modified, the server answers to the conditional request with a 304:
+                self.age(fs, url)
+                assert not fs.revalidate(url)
+
+                with open(src, "w") as f:
+                    f.write('{"a": 2}')
+                os.utime(src, (time.time() + 10, time.time() + 10))
+                assert fs.open_json(url) == {"a": 1}  # Fresh cached file
+                self.age(fs, url)
+                assert fs.open_json(url) == {"a": 2}
+                server.shutdown()
+
+            # Stale data are used if the source cannot be reached:
+            self.age(fs, url)
+            assert fs.open_json(url) == {"a": 2}
+
+
+class Test_cache_compression:
+
+    def create_files(self, folder):
+        files = []
+        for name in ["a.txt", "b.txt", "c.txt"]:
+            files.append(os.path.join(folder, name))
+            with open(files[-1], "w") as f:
+                f.write("c" * 5000 if name == "c.txt" else "a" * 5000)  # a and b have the same content
+        return files
+
+    @pytest.mark.parametrize("compression", ["gzip", pytest.param("zstd", marks=requires_zstandard)])
+    def test_filestore(self, compression):
+        with tempfile.TemporaryDirectory() as folder, tempfile.TemporaryDirectory() as cachedir:
+            files = self.create_files(folder)
+            fs = filestore(cache=True, cachedir=cachedir, cache_compression=compression)
+            for fn in files:
+                with fs.open(fn, "r") as f:
+                    f.read()
+            for _ in range(2):  # Read from cache
+                with fs.open(files[0], "r") as f:
+                    assert f.read() == "a" * 5000
+                assert fs.read_csv(files[2], header=None).iloc[0, 0] == "c" * 5000
+
+            # Identical payloads are stored once, compressed:
+            blobs = os.listdir(os.path.join(cachedir, "blobs"))
+            assert len(blobs) == 2
+            assert fs.cachedb.size < 2 * 5000
+            assert fs.cachepath(files[0]) == fs.cachepath(files[1])
+
+            # A shared blob is deleted with its last uri:
+            fs.clear_cache(files[0])
+            with open(fs.cachepath(files[1]), "rb") as f:
+                assert len(f.read()) > 0
+            fs.clear_cache([files[1], files[2]])
+            assert len(os.listdir(os.path.join(cachedir, "blobs"))) == 0
+
+    def test_revalidate(self):
+        with tempfile.TemporaryDirectory() as folder, tempfile.TemporaryDirectory() as cachedir:
+            files = self.create_files(folder)
+            fs = filestore(cache=True, cachedir=cachedir, cache_compression="gzip", cache_ttl=60)
+            for fn in files[0:2]:
+                fs.open(fn).close()
+            with open(files[0], "w") as f:
+                f.write("new")
+            os.utime(files[0], (time.time() + 10, time.time() + 10))
+            with fs.cachedb._connect() as con, con:
+                con.execute("UPDATE files SET validated=0")
+            with fs.open(files[0], "r") as f:
+                assert f.read() == "new"
+            with fs.open(files[1], "r") as f:
+                assert f.read() == "a" * 5000  # Shared blob was not modified
+            assert len(os.listdir(os.path.join(cachedir, "blobs"))) == 2
+
+
+class Test_http_pool:
+
+    def test_shared_pool(self):
+        with tempfile.TemporaryDirectory() as folder, tempfile.TemporaryDirectory() as cachedir:
+            with open(os.path.join(folder, "data.json"), "w") as f:
+                f.write('{"a": 1}')
+            handler = functools.partial(http.server.SimpleHTTPRequestHandler, directory=folder)
+            with http.server.ThreadingHTTPServer(("localhost", 0), handler) as server:
+                threading.Thread(target=server.serve_forever, daemon=True).start()
+                url = "http://localhost:%i/data.json" % server.server_address[1]
+
+                stores = [httpstore(skip_instance_cache=True), httpstore(timeout=10),
+                          httpstore(cache=True, cachedir=cachedir)]
+                assert all([fs.open_json(url) == {"a": 1} for fs in stores])
+                sessions = [stores[0].fs._session, stores[1].fs._session, stores[2].fs.fs._session]
+                assert sessions[0] is not sessions[1]
+                assert all([s.connector is sessions[0].connector for s in sessions])
+
+                # Closing a store session does not close the pool used by others:
+                stores[0].fs.close_session(stores[0].fs.loop, sessions[0])
+                assert not sessions[1].connector.closed
+                assert stores[1].open_json(url) == {"a": 1}
+                server.shutdown()
+
+    def test_pool_options(self):
+        with argopy.set_options(http_pool_size=4, http_dns_ttl=0):
+            fs = httpstore(skip_instance_cache=True)
+            assert fs.fs._session.connector.limit == 4
+            assert not fs.fs._session.connector.use_dns_cache
+        fs = httpstore(skip_instance_cache=True)
+        assert fs.fs._session.connector.limit == OPTIONS['http_pool_size']
+
+        # The previous pool is closed with the last session using it:
+        with argopy.set_options(http_pool_size=3):
+            old = httpstore(skip_instance_cache=True)
+            connector = old.fs._session.connector
+        fs = httpstore(skip_instance_cache=True)
+        assert fs.fs._session.connector is not connector
+        assert not connector.closed
+        old.fs.close_session(old.fs.loop, old.fs._session)
+        httpstore(skip_instance_cache=True)
+        assert connector.closed
+
+
+class Test_singleflight:
+
+    def test_coalesce(self):
+        flights, calls, release = singleflight(), [], threading.Event()
+
+        def fetch(x):
+            calls.append(x)
+            release.wait(5)
+            return x * 2
+
+        with concurrent.futures.ThreadPoolExecutor(4) as executor:
+            futures = [executor.submit(flights.do, "key", fetch, 21) for i in range(4)]
+            while len(calls) == 0:
+                time.sleep(0.01)
+            time.sleep(0.1)
+            release.set()
+            assert [f.result() for f in futures] == [42] * 4
+        assert len(calls) == 1
+        assert len(flights) == 0
+        assert flights.do("key", fetch, 1) == 2  # Keys are released
+
+    def test_exception(self):
+        flights, release = singleflight(), threading.Event()
+
+        def fetch():
+            release.wait(5)
+            raise FileNotFoundError()
+
+        with concurrent.futures.ThreadPoolExecutor(3) as executor:
+            futures = [executor.submit(flights.do, "key", fetch) for i in range(3)]
+            time.sleep(0.1)
+            release.set()
+            for f in futures:
+                with pytest.raises(FileNotFoundError):
+                    f.result()
+        assert len(flights) == 0
+
+    def test_httpstore(self):
+        requests = []
+
+        class handler(http.server.SimpleHTTPRequestHandler):
+            def do_GET(self):
+                requests.append(self.path)
+                time.sleep(0.2)
+                return super().do_GET()
+
+        with tempfile.TemporaryDirectory() as folder:
+            with open(os.path.join(folder, "data.json"), "w") as f:
+                f.write('{"a": 1}')
+            with http.server.ThreadingHTTPServer(("localhost", 0), functools.partial(handler, directory=folder)) as server:
+                threading.Thread(target=server.serve_forever, daemon=True).start()
+                url = "http://localhost:%i/data.json" % server.server_address[1]
+                with concurrent.futures.ThreadPoolExecutor(6) as executor:
+                    urls = [url, url.replace("localhost", "LOCALHOST")] * 3
+                    results = list(executor.map(lambda u: httpstore().open_json(u), urls))
+                server.shutdown()
+        assert results == [{"a": 1}] * 6
+        assert requests == ["/data.json"]
+
+
+class Test_iter_json:
+    docs = [[], [1, 2.5, -3e10, "é \\\" ,]", None, True, {"a": [1, {"b": "]"}]}], {"a": 1}, "text", 12345,
+            [{"measurements": [{"pres": i, "temp": 1.5}] * 10, "id": "ü"} for i in range(100)]]
+
+    @pytest.mark.parametrize("chunksize", [1, 7, 2**16])
+    def test_decode(self, chunksize):
+        for doc in self.docs:
+            for indent in [None, 2]:
+                data = json.dumps(doc, indent=indent, ensure_ascii=False).encode()
+                items = list(iter_json(io.BytesIO(data), chunksize=chunksize))
+                assert items == (doc if isinstance(doc, list) else [doc])
+
+    def test_errors(self):
+        for data in [b"[1, 2", b"[1 2]", b"[1,", b"", b"{"]:
+            with pytest.raises(json.JSONDecodeError):
+                list(iter_json(io.BytesIO(data), chunksize=2))
+
+    def test_stream(self):
+        with tempfile.TemporaryDirectory() as folder:
+            with open(os.path.join(folder, "data.json"), "w") as f:
+                json.dump(self.docs[-1], f)
+            handler = functools.partial(http.server.SimpleHTTPRequestHandler, directory=folder)
+            with http.server.ThreadingHTTPServer(("localhost", 0), handler) as server:
+                threading.Thread(target=server.serve_forever, daemon=True).start()
+                url = "http://localhost:%i/data.json" % server.server_address[1]
+                fs = httpstore()
+                assert list(fs.open_json(url, stream=True)) == fs.open_json(url)
+                assert fs.open_mfjson([url], stream=True, preprocess=lambda items: len(list(items))) == [100]
+                assert fs.open_mfjson([url], stream=True) == [self.docs[-1]]
+                server.shutdown()
+
+
+class Test_blockcache:
+    data = bytes(range(256)) * 40
+
+    def fetcher(self, start, end):
+        self.requests.append((start, end))
+        return self.data[start:end]
+
+    def test_fetch(self):
+        self.requests = []
+        cache = blockcache(1000, self.fetcher, len(self.data), maxblocks=4, readahead=1)
+        assert cache._fetch(10, 20) == self.data[10:20]
+        assert self.requests == [(0, 2000)]  # With readahead
+        assert cache._fetch(1500, 2500) == self.data[1500:2500]
+        assert self.requests[-1] == (2000, 4000)
+        assert cache._fetch(9000, None) == self.data[9000:]
+        assert cache._fetch(len(self.data), None) == b""
+        assert len(cache.blocks) == 4 and 0 not in cache.blocks  # Least recently used blocks are dropped
+        assert cache._fetch(0, len(self.data)) == self.data  # Larger than maxblocks
+        assert cache.nbytes == sum([end - start for start, end in self.requests])
+
+
+class RangeRequestHandler(http.server.SimpleHTTPRequestHandler):
+    """ Minimal http server handler with range requests, counting bytes sent """
+    sent = []
+
+    def send_head(self):
+        path = self.translate_path(self.path)
+        if "Range" not in self.headers or os.path.isdir(path):
+            return super().send_head()
+        start, end = [int(x) for x in re.match(r"bytes=(\d+)-(\d+)", self.headers["Range"]).groups()]
+        with open(path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            f.seek(start)
+            data = f.read(end - start + 1)
+        self.send_response(206)
+        self.send_header("Content-Range", "bytes %i-%i/%i" % (start, start + len(data) - 1, size))
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.sent.append(len(data))
+        return io.BytesIO(data)
+
+
+class Test_httprangestore:
+    ds = xr.Dataset({"TEMP": (("N_PROF", "N_LEVELS"), np.random.rand(100, 1000)),
+                     "PSAL": (("N_PROF", "N_LEVELS"), np.random.rand(100, 1000))})
+
+    def serve(self, folder):
+        RangeRequestHandler.sent = []
+        server = http.server.ThreadingHTTPServer(("localhost", 0), functools.partial(RangeRequestHandler, directory=folder))
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        return server, "http://localhost:%i" % server.server_address[1]
+
+    @requires_h5netcdf
+    def test_open_dataset(self):
+        with tempfile.TemporaryDirectory() as folder:
+            self.ds.to_netcdf(os.path.join(folder, "prof.nc"), engine="h5netcdf",
+                              encoding={v: {"chunksizes": (10, 1000)} for v in self.ds})
+            server, url = self.serve(folder)
+            ds = httprangestore(block_size=2**14).open_dataset(url + "/prof.nc")
+            assert ds.encoding["source"] == url + "/prof.nc"
+            np.testing.assert_array_equal(ds["TEMP"].isel(N_PROF=slice(0, 5)).values, self.ds["TEMP"].values[0:5])
+            assert sum(RangeRequestHandler.sent) < os.path.getsize(os.path.join(folder, "prof.nc")) / 4
+            server.shutdown()
+
+    def test_open_dataset_netcdf3(self):
+        with tempfile.TemporaryDirectory() as folder, tempfile.TemporaryDirectory() as cachedir:
+            self.ds.to_netcdf(os.path.join(folder, "prof.nc"), format="NETCDF3_CLASSIC")
+            server, url = self.serve(folder)
+            for fs in [httprangestore(block_size=2**14), httprangestore(cache=True, cachedir=cachedir)]:
+                ds = fs.open_dataset(url + "/prof.nc")
+                xr.testing.assert_equal(ds, self.ds)
+            assert len(fs.cache_registry) == 1
+            server.shutdown()
+
+
+class Test_ordered_concat:
+    sizes = [3, 1, 4, 2]
+
+    def chunk(self, i, n):
+        rng = np.random.default_rng(i)
+        return xr.Dataset(
+            {"TEMP": ("N_POINTS", rng.random(n)),
+             "DATA_MODE": ("N_POINTS", np.array(["R" * (i + 1)] * n))},
+            coords={"TIME": ("N_POINTS",
+                             np.datetime64("2012-01-01") + rng.integers(0, 100, n).astype("timedelta64[D]")),
+                    "N_POINTS": np.arange(n)},
+            attrs={"chunk": i})
+
+    @property
+    def chunks(self):
+        return [self.chunk(i, n) for i, n in enumerate(self.sizes)]
+
+    def reference(self, chunks):
+        return xr.concat(chunks, dim="N_POINTS", data_vars="minimal", coords="minimal", compat="override")
+
+    def test_order(self):
+        C = ordered_concat(len(self.sizes), concat_dim="N_POINTS")
+        for i in [2, 0, 3, 1]:
+            C.add(i, self.chunks[i])
+        ds = C.finalize()
+        assert ds.identical(self.reference(self.chunks))
+        assert ds["DATA_MODE"].dtype == np.dtype("<U4")
+
+    def test_sizes(self):
+        C = ordered_concat(len(self.sizes), concat_dim="N_POINTS", sizes=self.sizes)
+        for i in [3, 1, 2, 0]:
+            C.add(i, self.chunks[i])
+        assert C.finalize().identical(self.reference(self.chunks))
+
+        C = ordered_concat(2, concat_dim="N_POINTS", sizes=[1, 1])
+        with pytest.raises(ValueError):
+            C.add(0, self.chunks[0])
+
+    def test_sortby(self):
+        C = ordered_concat(len(self.sizes), concat_dim="N_POINTS", sortby="TIME")
+        for i in [1, 3, 0, 2]:
+            C.add(i, self.chunks[i])
+        ds = C.finalize()
+        assert ds.identical(self.reference(self.chunks).sortby("TIME"))
+
+    def test_incompatible_chunks(self):
+        chunks = self.chunks
+        chunks[3] = chunks[3].assign(DUMMY=1.5)
+        C = ordered_concat(len(self.sizes), concat_dim="N_POINTS", sortby="TIME")
+        for i in [1, 3, 0, 2]:
+            C.add(i, chunks[i])
+        assert C.finalize().identical(self.reference(chunks).sortby("TIME"))
+
+    def test_memory(self):
+        import tracemalloc
+
+        n, size = 8, 100000
+        tracemalloc.start()
+        try:
+            C = ordered_concat(n, concat_dim="N_POINTS")
+            for i in range(n):
+                C.add(i, xr.Dataset({"TEMP": ("N_POINTS", np.ones(size))},
+                                    coords={"TIME": ("N_POINTS", np.arange(i * size, (i + 1) * size))}))
+            ds = C.finalize()
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+        assert ds["TIME"].size == n * size
+        assert peak < 1.5 * ds.nbytes  # Chunks are not all held until finalize
+
+    def test_failed_chunks(self):
+        C = ordered_concat(3, concat_dim="N_POINTS")
+        C.add(2, self.chunks[2])
+        C.add(0, None)
+        with pytest.raises(ValueError):
+            C.finalize()  # Not complete
+        C.add(1, None)
+        assert C.finalize().identical(self.chunks[2])
+
+        C = ordered_concat(1, concat_dim="N_POINTS")
+        C.add(0, None)
+        assert C.finalize() is None
+
+    def test_open_mfdataset(self):
+        with tempfile.TemporaryDirectory() as folder:
+            files = []
+            for i, ds in enumerate(self.chunks):
+                files.append(os.path.join(folder, "chunk%i.nc" % i))
+                ds.to_netcdf(files[-1])
+            fs = filestore()
+            for method in ["seq", "thread"]:
+                ds = fs.open_mfdataset(files, concat_dim="N_POINTS", method=method, sortby="TIME")
+                assert np.all(np.diff(ds["TIME"].values) >= np.timedelta64(0))
+                assert len(ds["N_POINTS"]) == np.sum(self.sizes)
+                dsl = fs.open_mfdataset(files, concat_dim="N_POINTS", method=method, concat=False)
+                assert [d.attrs["chunk"] for d in dsl] == [0, 1, 2, 3]
+
+
 @requires_connection
 class Test_HttpStore:
     def test_creation(self):
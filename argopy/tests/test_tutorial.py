@@ -1,4 +1,7 @@
+import os
+import time
 import pytest
+import numpy as np
 import argopy
 from . import requires_connection
 
@@ -25,3 +28,106 @@ def test_weekly_index_dataset():
 def test_global_index_dataset():
     rpath, txtfile = argopy.tutorial.open_dataset('global_index_prof')
     assert isinstance(txtfile, str)
+
+
+class Test_synthetic_ftp:
+    def test_generate(self, tmp_path):
+        ftp = argopy.tutorial.synthetic_ftp(str(tmp_path), n_dacs=2, n_floats=4, n_cycles=5, n_levels=20, bgc=1)
+        ftp.generate()
+        assert argopy.utilities.check_localftp(ftp.rootpath)
+        files = [os.path.relpath(f, ftp.rootpath) for f in ftp.ls()]
+        assert len(files) == 1 + 4 * (2 + 3 * 5)
+        assert os.path.join("dac", "aoml", "1900000", "1900000_Sprof.nc") in files
+        assert os.path.join("dac", "bodc", "1900003", "profiles", "BR1900003_005.nc") in files
+        with open(os.path.join(ftp.rootpath, "ar_index_global_prof.txt")) as f:
+            lines = f.readlines()
+        assert len(lines) == 9 + 4 * 5
+        assert lines[9].startswith("aoml/1900000/profiles/D1900000_001.nc,")
+
+    def test_index_only(self, tmp_path):
+        ftp = argopy.tutorial.synthetic_ftp(str(tmp_path), n_floats=3, n_cycles=2, index_only=True).generate()
+        assert ftp.ls() == [os.path.join(ftp.rootpath, "ar_index_global_prof.txt")]
+        with pytest.raises(ValueError):
+            argopy.tutorial.synthetic_ftp(str(tmp_path), n_dacs=12)
+
+    def test_fetchers(self, tmp_path):
+        ftp = argopy.tutorial.synthetic_ftp(str(tmp_path), n_floats=3, n_cycles=4, n_levels=20, bgc=0).generate()
+        with argopy.set_options(src="localftp", local_ftp=ftp.rootpath):
+            ds = argopy.DataFetcher(mode="expert").float(ftp.wmo[0:2]).to_xarray()
+            assert np.all(np.unique(ds["PLATFORM_NUMBER"]) == ftp.wmo[0:2])
+            ds = argopy.DataFetcher(mode="expert").profile(ftp.wmo[2], [1, 4]).to_xarray()
+            assert np.all(np.unique(ds["CYCLE_NUMBER"]) == [1, 4])
+            ds = argopy.DataFetcher(mode="expert").region([-180, 180, -90, 90, 0, 2000]).to_xarray()
+            assert ds.argo.N_PROF == 3 * 4
+            df = argopy.IndexFetcher().float(ftp.wmo[1]).to_dataframe()
+            assert len(df) == 4
+
+
+class Test_mock_server:
+    @pytest.fixture(scope="class")
+    def ftp(self, tmp_path_factory):
+        ftp = argopy.tutorial.synthetic_ftp(str(tmp_path_factory.mktemp("gdac")), n_floats=3, n_cycles=4, n_levels=20,
+                                            bgc=0).generate()
+        with argopy.set_options(src="localftp", local_ftp=ftp.rootpath, mode="expert"):
+            ftp.ds = argopy.DataFetcher().float(ftp.wmo).to_xarray()
+        ftp.index = os.path.join(ftp.rootpath, "ar_index_global_prof.txt")
+        return ftp
+
+    def test_erddap(self, ftp):
+        with argopy.tutorial.mock_server(ftp.ds, index=ftp.index) as server, argopy.set_options(mode="expert"):
+            fetcher = argopy.DataFetcher(src="erddap", server=server.erddap).float(ftp.wmo[0:2])
+            assert fetcher.fetcher.N_POINTS == np.sum(np.isin(ftp.ds["PLATFORM_NUMBER"], ftp.wmo[0:2]))
+            ds = fetcher.to_xarray()
+            assert len(ds["N_POINTS"]) == fetcher.fetcher.N_POINTS
+            assert ds.attrs["Fetched_from"] == server.erddap
+            ds = argopy.DataFetcher(src="erddap", server=server.erddap, parallel=True).profile(
+                ftp.wmo[2], [1, 4]).to_xarray()
+            assert np.all(np.unique(ds["CYCLE_NUMBER"]) == [1, 4])
+            ds = argopy.DataFetcher(src="erddap", server=server.erddap).region(
+                [-180, 180, -90, 90, 0, 100, "2000-01", "2020-01"]).to_xarray()
+            assert ds["PRES"].max() <= 100
+            df = argopy.IndexFetcher(src="erddap", server=server.erddap).float(ftp.wmo[1]).to_dataframe()
+            assert len(df) == 4
+            with pytest.raises(FileNotFoundError):
+                argopy.DataFetcher(src="erddap", server=server.erddap).float(6900000).to_xarray()
+
+    def test_argovis(self, ftp):
+        with argopy.tutorial.mock_server(ftp.ds) as server:
+            ds = argopy.DataFetcher(src="argovis", server=server.argovis).float(ftp.wmo[0]).to_xarray()
+            assert len(ds["N_POINTS"]) == np.sum(ftp.ds["PLATFORM_NUMBER"] == ftp.wmo[0])
+            ds = argopy.DataFetcher(src="argovis", server=server.argovis).profile(ftp.wmo[2], [1, 4]).to_xarray()
+            assert np.all(np.unique(ds["CYCLE_NUMBER"]) == [1, 4])
+            start = ftp.ds["TIME"].min().values
+            box = [-180, 180, -90, 90, 0, 100, str(start), str(start + np.timedelta64(60, "D"))]
+            ds = argopy.DataFetcher(src="argovis", server=server.argovis).region(box).to_xarray()
+            assert ds["PRES"].max() <= 100
+
+    def test_network_conditions(self, ftp):
+        fs = argopy.stores.httpstore()
+        with argopy.tutorial.mock_server(ftp.ds, latency=0.1, bandwidth=100000) as server:
+            url = server.argovis + "/catalog/platforms/%i" % ftp.wmo[0]
+            data = fs.open_json(url)
+            assert len(data) == 4
+            assert server.requests[-1]["status"] == 200
+            size = server.requests[-1]["bytes"]
+            start = time.perf_counter()
+            fs.open_json(url)
+            assert time.perf_counter() - start >= 0.1 + size / 100000
+        with argopy.tutorial.mock_server(ftp.ds, error_rate=1, error_code=502) as server:
+            with pytest.raises(Exception):
+                fs.open_json(server.argovis + "/catalog/platforms/%i" % ftp.wmo[0])
+            assert server.requests[-1]["status"] == 502
+        with pytest.raises(ValueError):
+            argopy.tutorial.mock_server(ftp.ds, error_rate=2)
+
+    def test_cache_revalidation(self, ftp, tmp_path):
+        fs = argopy.stores.httpstore(cache=True, cachedir=str(tmp_path), cache_ttl=60)
+        with argopy.tutorial.mock_server(ftp.ds) as server:
+            url = server.argovis + "/catalog/platforms/%i" % ftp.wmo[0]
+            data = fs.open_json(url)
+            assert fs.cachedb.entry(url)["etag"] is not None
+            # The first revalidation of the stale cached file is a conditional request:
+            with fs.cachedb._connect() as con, con:
+                con.execute("UPDATE files SET validated=0")
+            assert fs.open_json(url) == data
+            assert [r["status"] for r in server.requests if r["method"] == "GET"] == [200, 304]
@@ -26,7 +26,8 @@ from argopy.utilities import (
     modified_environ,
     wrap_longitude,
     toYearFraction, YearFraction_to_datetime,
-    TopoFetcher
+    TopoFetcher,
+    _year_fraction_batch,
 )
 from argopy.errors import InvalidFetcherAccessPoint, FtpPathError
 from argopy import DataFetcher as ArgoDataFetcher
@@ -138,6 +139,19 @@ class Test_linear_interpolation_remap:
         )
         assert "remapped" in dsi.dims
 
+    def test_interpolation_values(self):
+        pres, temp = self.dsfake["PRES"].copy(), self.dsfake["TEMP"].copy()
+        temp[0, 10:20] = np.nan
+        temp[1, 4:] = np.nan  # Less than 5 points
+        z = np.array([0, 100, 500.5, 950, 1000])
+        dsi = linear_interpolation_remap(
+            pres, temp, xr.DataArray(z, dims="Z_LEVELS"), z_dim="N_LEVELS", z_regridded_dim="Z_LEVELS",
+        )
+        for i in [0, 2]:
+            valid = ~np.isnan(temp[i].values)
+            np.testing.assert_allclose(dsi[i].values, np.interp(z, pres[i].values[valid], temp[i].values[valid]))
+        assert np.all(np.isnan(dsi[1].values))
+
     def test_interpolation_1d(self):
         # Run it with success:
         dsi = linear_interpolation_remap(
@@ -530,6 +544,12 @@ def test_toYearFraction():
     assert toYearFraction(pd.to_datetime('202001010000')+pd.offsets.DateOffset(years=1)) == 2021
 
 
+def test_year_fraction_batch():
+    dates = pd.to_datetime(['2020-01-01', '2020-02-29T12:34:56', '2021-12-31T23:59:59', '1999-07-01']).values
+    assert np.all(_year_fraction_batch(dates) == np.array([toYearFraction(d) for d in pd.to_datetime(dates)]))
+    assert np.isnan(_year_fraction_batch(np.array(['NaT'], dtype='datetime64[ns]'))[0])
+
+
 def test_YearFraction_to_datetime():
     assert YearFraction_to_datetime(2020) == pd.to_datetime('202001010000')
     assert YearFraction_to_datetime(2020+1) == pd.to_datetime('202101010000')
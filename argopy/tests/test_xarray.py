@@ -3,11 +3,12 @@ import pytest
 import warnings
 import numpy as np
 import tempfile
+import logging
 import xarray as xr
 
 import argopy
 from argopy import DataFetcher as ArgoDataFetcher
-from argopy.errors import InvalidDatasetStructure, OptionValueError
+from argopy.errors import InvalidDatasetStructure, OptionValueError, InvalidOption, InvalidMethod, DataNotFound
 from . import requires_connected_erddap_phy, requires_localftp
 
 
@@ -38,11 +39,211 @@ def ds_pts():
         return data
 
 
+@pytest.fixture(scope="module")
+def ds_ftp(tmp_path_factory):
+    """ Create a dictionary of datasets from a synthetic GDAC ftp folder, to be used by tests without network """
+    ftp = argopy.tutorial.synthetic_ftp(str(tmp_path_factory.mktemp("gdac")), n_floats=3, n_cycles=6, n_levels=30,
+                                        bgc=0).generate()
+    data = {}
+    for user_mode in ['standard', 'expert']:
+        with argopy.set_options(src="localftp", local_ftp=ftp.rootpath, mode=user_mode):
+            data[user_mode] = ArgoDataFetcher().float(ftp.wmo).load().data
+    return data
+
+
 @requires_connected_erddap_phy
 def test_point2profile(ds_pts):
     assert "N_PROF" in ds_pts['standard'].argo.point2profile().dims
 
 
+def test_cast_types(ds_ftp):
+    ds = ds_ftp['expert'].copy(deep=True)
+    qc = ds['TEMP_QC'].values.astype('U3')
+    qc[0:3] = ['nan', '   ', '']
+    ds['TEMP_QC'] = ('N_POINTS', qc)
+    ds['PSAL_QC'] = ('N_POINTS', ds['PSAL_QC'].values.astype('U1').astype(object))
+    ds['PLATFORM_NUMBER'] = ('N_POINTS', ds['PLATFORM_NUMBER'].values.astype(str).astype(object))
+    ds = ds.argo.cast_types()
+    assert ds['TEMP_QC'].dtype == int and ds['PSAL_QC'].dtype == int and ds['PLATFORM_NUMBER'].dtype == int
+    assert np.all(ds['TEMP_QC'].values[0:3] == 0)
+    assert np.all(ds['TEMP_QC'].values[3:] == ds_ftp['expert']['TEMP_QC'].values[3:])
+    assert np.all(ds['PSAL_QC'].values == ds_ftp['expert']['PSAL_QC'].values)
+    assert ds['PSAL_QC'].attrs['casted'] == 1
+    # All variables are flagged as casted, including dimension coordinates:
+    assert all([ds[v].attrs.get('casted', 0) == 1 for v in ds.variables])
+    dsp = ds.argo.point2profile().argo.cast_types()
+    assert all([dsp[v].attrs.get('casted', 0) == 1 for v in ['N_PROF', 'N_LEVELS', 'PRES', 'PLATFORM_NUMBER']])
+
+
+def test_filter_data_mode(ds_ftp):
+    ds = ds_ftp['expert'].copy(deep=True)
+    ds['TEMP_ADJUSTED'][0] = np.nan  # Delayed mode adjusted values should be filled in with raw values
+    assert ds['DATA_MODE'][0] == 'D'
+    this = ds.argo.filter_data_mode()
+    assert not any(['ADJUSTED' in v for v in this.data_vars])
+    dm = ds['DATA_MODE'].values
+    for v in ['PRES', 'TEMP', 'PSAL']:
+        expected = np.where(dm == 'R', ds[v], ds[v + '_ADJUSTED'])
+        expected = np.where(np.isnan(expected) & (dm == 'D'), ds[v], expected)
+        np.testing.assert_array_equal(this[v].values, expected)
+        np.testing.assert_array_equal(this[v + '_QC'].values, np.where(dm == 'R', ds[v + '_QC'], ds[v + '_ADJUSTED_QC']))
+        assert np.all(np.isnan(this[v + '_ERROR'].values[dm == 'R']))
+    assert this['TEMP'].values[0] == ds['TEMP'].values[0]
+    assert 'TEMP_ERROR' not in ds.argo.filter_data_mode(keep_error=False)
+
+
+def test_filter_qc(ds_ftp):
+    ds = ds_ftp['standard'].copy(deep=True)
+    ds['TEMP_QC'][0:10] = 4
+    attrs = dict(ds.attrs)
+    fields = ['PRES_QC', 'TEMP_QC', 'PSAL_QC']
+    keep = np.all([np.isin(ds[v].values, [1, 2]) for v in fields], axis=0)
+    this = ds.argo.filter_qc(QC_fields=fields)
+    assert len(this['N_POINTS']) == np.sum(keep)
+    np.testing.assert_array_equal(this['N_POINTS'].values, ds['N_POINTS'].values[keep])
+    assert all([this[v].dtype == ds[v].dtype for v in ds.variables])
+    assert ds.attrs == attrs  # Input dataset is left untouched
+    mask = ds.argo.filter_qc(QC_list=4, QC_fields=['TEMP_QC'], mode='any', mask=True)
+    assert mask.dims == ('N_POINTS',)
+    assert np.all(mask.values[0:10])
+
+
+def test_where(ds_ftp):
+    ds = ds_ftp['standard']
+    cond = ds['PRES'] > 100
+    this = ds.argo._where(cond, drop=True)
+    np.testing.assert_array_equal(this['N_POINTS'].values, ds['N_POINTS'].values[cond.values])
+    assert all([this[v].dtype == ds[v].dtype for v in ds.variables])
+    # Condition aligned on the dataset, like in chained selections:
+    that = this.argo._where(ds['PRES'] < 1000, drop=True)
+    np.testing.assert_array_equal(that['N_POINTS'].values, ds['N_POINTS'].values[cond.values & (ds['PRES'] < 1000).values])
+    # Masking with type-appropriate fill values:
+    this = ds.argo._where(cond)
+    assert all([this[v].dtype == ds[v].dtype for v in ds.variables])
+    assert np.all(np.isnan(this['TEMP'].values[~cond.values]))
+    assert np.all(this['PLATFORM_NUMBER'].values[~cond.values] == 99999)
+    assert np.all(this['DIRECTION'].values[~cond.values] == ' ')
+    xr.testing.assert_identical(this.where(cond, drop=True), ds.where(cond, drop=True).argo.cast_types())
+
+
+def test_interp_std_levels_offline(ds_ftp):
+    ds = ds_ftp['expert'].argo.point2profile()
+    std_lev = [0, 10, 50, 100]
+    this = ds.argo.interp_std_levels(std_lev)
+    assert this['PRES'].dims == ('N_PROF', 'PRES_INTERPOLATED')
+    assert this['TEMP'].dtype == ds['TEMP'].dtype
+    np.testing.assert_allclose(this['PRES'].values[:, 1:], np.broadcast_to(std_lev[1:], (this.argo.N_PROF, 3)))
+    for i in range(this.argo.N_PROF):
+        valid = ~np.isnan(ds['TEMP'][i].values) & ~np.isnan(ds['PRES'][i].values)
+        np.testing.assert_allclose(this['TEMP'][i].values,
+                                   np.interp(std_lev, ds['PRES'][i].values[valid], ds['TEMP'][i].values[valid]),
+                                   rtol=1e-6)
+
+
+def test_groupby_pressure_bins_offline(ds_ftp):
+    ds = ds_ftp['standard'].argo.point2profile()
+    bins = np.arange(0.0, np.max(ds["PRES"]) + 100.0, 100.0)
+    for select, fct in {'shallow': lambda x, y: y[0], 'deep': lambda x, y: y[-1], 'min': lambda x, y: np.min(y),
+                        'max': lambda x, y: np.max(y), 'mean': lambda x, y: np.mean(y),
+                        'median': lambda x, y: np.median(y),
+                        'middle': lambda x, y: y[np.flatnonzero(x >= np.median(x))[0]]}.items():
+        this = ds.argo.groupby_pressure_bins(bins, select=select, merge=False, squeeze=False)
+        assert this['TEMP'].dtype == ds['TEMP'].dtype
+        x, y = ds['PRES'][0].values, ds['TEMP'][0].values
+        valid = ~np.isnan(x) & ~np.isnan(y)
+        x, y = x[valid], y[valid]
+        expected = [fct(x[ib], y[ib]) if np.any(ib) else np.nan
+                    for ib in [(x >= b0) & (x < b1) for b0, b1 in zip(bins, np.append(bins[1:], np.inf))]]
+        np.testing.assert_allclose(this['TEMP'][0].values, expected, rtol=1e-6)
+    with pytest.raises(InvalidOption):
+        ds.argo.groupby_pressure_bins(bins, select='invalid')
+    this = ds.argo.groupby_pressure_bins(np.arange(0.0, np.max(ds["PRES"]) + 10.0, 10.0))
+    assert this.argo.N_LEVELS < len(bins) * 10
+    assert np.sum(~np.isnan(this['PRES'].values)) <= np.sum(~np.isnan(ds['PRES'].values))
+
+
+def test_teos10_offline(ds_ftp):
+    vlist = ["SA", "CT", "SIG0", "N2", "PV", "PTEMP", "SOUND_SPEED", "CNDC"]
+    ds = ds_ftp['standard']
+    dsp = ds.argo.point2profile()
+    that = dsp.argo.teos10(vlist=vlist, inplace=False, max_workers=1)
+    for v in vlist:
+        assert that[v].dims == ('N_PROF', 'N_LEVELS')
+        # Same results in bounded-size chunks, in parallel:
+        xr.testing.assert_identical(dsp.argo.teos10(vlist=[v], inplace=False, chunksize=100, max_workers=2)[v], that[v])
+        # and with a collection of points:
+        this = ds.copy().argo.teos10(vlist=[v], chunksize=100).argo.point2profile()
+        np.testing.assert_allclose(this[v].values, that[v].values)
+    # N2 is computed along each profile, so that it is not defined at the first and last levels:
+    assert np.all(np.isnan(that['N2'].values[:, 0]))
+    assert not np.all(np.isnan(that['N2'].values[:, 1]))
+    this = ds.copy()
+    this.argo.teos10(vlist=["PV"])
+    assert "PV" in this and "SA" not in this
+
+
+def test_teos10_minimal_points(ds_ftp):
+    ds = ds_ftp['standard']
+    # Collection of points from a single profile, without profile identifiers:
+    one = ds.where((ds['PLATFORM_NUMBER'] == ds['PLATFORM_NUMBER'][0]) & (ds['CYCLE_NUMBER'] == ds['CYCLE_NUMBER'][0])
+                   & (ds['DIRECTION'] == ds['DIRECTION'][0]), drop=True)
+    mini = one[["PSAL", "TEMP", "PRES", "LONGITUDE", "LATITUDE"]]
+    that = one.argo.teos10(vlist=["SA", "CT", "N2"], inplace=False)
+    this = mini.argo.teos10(vlist=["SA", "CT"], inplace=False, chunksize=7, max_workers=2)
+    for v in ["SA", "CT"]:
+        xr.testing.assert_identical(this[v], that[v])
+    # N2 is computed along all points:
+    this = mini.argo.teos10(vlist=["N2"], inplace=False, chunksize=7, max_workers=2)
+    xr.testing.assert_identical(this["N2"], that["N2"])
+
+
+def test_create_float_source_parallel(ds_ftp, caplog):
+    ds = ds_ftp['expert']
+    ref = ds.argo.create_float_source(force='raw')
+    assert len(ref) == len(np.unique(ds['PLATFORM_NUMBER']))
+    for method in ['thread', 'process']:
+        out = ds.argo.create_float_source(force='raw', method=method, max_workers=2)
+        assert list(out) == list(ref)
+        assert all([out[k].identical(ref[k]) for k in ref])
+    with pytest.raises(InvalidMethod):
+        ds.argo.create_float_source(method='dummy')
+    with pytest.raises(OptionValueError):
+        ds.argo.create_float_source(errors='dummy')
+
+    # A float with only out of range values fails, without aborting the batch:
+    bad = ds.copy(deep=True)
+    wmo = list(ref)[0]
+    bad['PSAL'] = bad['PSAL'].where(bad['PLATFORM_NUMBER'] != wmo, 99.)
+    with pytest.raises(DataNotFound):
+        bad.argo.create_float_source(force='raw')
+    with tempfile.TemporaryDirectory() as folder_output:
+        # Other floats are not processed after the first failure:
+        with pytest.raises(DataNotFound):
+            bad.argo.create_float_source(path=folder_output, force='raw', method='thread', max_workers=1)
+        assert len(os.listdir(folder_output)) == 0
+    with tempfile.TemporaryDirectory() as folder_output:
+        with pytest.warns(UserWarning, match="%i" % wmo):
+            out = bad.argo.create_float_source(path=folder_output, force='raw', method='process', errors='ignore')
+        assert list(out) == list(ref)[1:]
+        assert not any([r.levelno >= logging.ERROR for r in caplog.records])
+        assert sorted(os.listdir(folder_output)) == sorted([os.path.basename(p) for p in out.values()])
+
+
+def test_point2profile_unsorted(ds_ftp):
+    ds = ds_ftp['expert']
+    # Shuffle profiles, keeping the order of points within each profile:
+    _, iprof = np.unique(ds['PLATFORM_NUMBER'] * 1000 + ds['CYCLE_NUMBER'], return_inverse=True)
+    key = np.random.default_rng(0).permutation(iprof.max() + 1)[iprof]
+    shuffled = ds.isel(N_POINTS=np.argsort(key, kind='stable'))
+    shuffled['N_POINTS'] = ds['N_POINTS'].values
+    this = ds.argo.point2profile()
+    xr.testing.assert_identical(shuffled.argo.point2profile(), this)
+    assert this.argo.N_PROF == 3 * 6
+    assert this['PLATFORM_NUMBER'].dims == ('N_PROF',)
+    assert this['PRES'].dims == ('N_PROF', 'N_LEVELS')
+    assert np.sum(~np.isnan(this['PRES'].values)) == len(ds['N_POINTS'])
+
+
 @requires_connected_erddap_phy
 def test_profile2point(ds_pts):
     with pytest.raises(InvalidDatasetStructure):
@@ -54,6 +255,28 @@ def test_point2profile2point(ds_pts):
     assert ds_pts['standard'].argo.point2profile().argo.profile2point().equals(ds_pts['standard'])
 
 
+def test_point2profile2point_offline(ds_ftp):
+    for user_mode in ['standard', 'expert']:
+        ds = ds_ftp[user_mode].sortby('TIME')
+        ds['N_POINTS'] = np.arange(len(ds['N_POINTS']))
+        assert ds.argo.point2profile().argo.profile2point().equals(ds)
+
+
+def test_profile2point_time_levels(ds_ftp):
+    dsp = ds_ftp['standard'].argo.point2profile()
+    dsp = dsp.isel(N_PROF=np.arange(dsp.argo.N_PROF)[::-1])  # Profiles not sorted by time
+    # Time of each point, eg: profiles broadcast on the (N_PROF, N_LEVELS) grid:
+    dt = (dsp['N_LEVELS'].values * 1e9).astype('timedelta64[ns]')
+    dsp = dsp.assign_coords(TIME=(("N_PROF", "N_LEVELS"), dsp['TIME'].values[:, np.newaxis] + dt[np.newaxis, :]))
+    this = dsp.argo.profile2point()
+    (expected,) = xr.broadcast(dsp[['PRES', 'TEMP']])
+    expected = expected.stack({"N_POINTS": list(expected.dims)})
+    expected = expected.where(~np.isnan(expected['PRES']), drop=True).sortby('TIME')
+    np.testing.assert_array_equal(this['TIME'].values, expected['TIME'].values)
+    np.testing.assert_array_equal(this['PRES'].values, expected['PRES'].values)
+    np.testing.assert_array_equal(this['TEMP'].values, expected['TEMP'].values)
+
+
 @requires_connected_erddap_phy
 class Test_interp_std_levels:
     def test_interpolation(self, ds_pts):
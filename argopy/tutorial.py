@@ -12,13 +12,35 @@ txtfile = argopy.tutorial.open_dataset('global_index_prof')
 
 # To force a new download of the data repo:
 argopy.tutorial.repodata().download(overwrite=True)
+
+# To generate a synthetic GDAC ftp folder, of any size:
+ftp = argopy.tutorial.synthetic_ftp('/tmp/gdac', n_floats=1000, n_cycles=100).generate()
+
+# To serve Argo data with mocked erddap and Argovis APIs, offline:
+with argopy.tutorial.mock_server(ds, latency=0.1) as server:
+    argopy.DataFetcher(src='erddap', server=server.erddap).float(6902746).to_xarray()
 ```
 """
 
 import os
 from zipfile import ZipFile
 from urllib.request import urlretrieve
+import urllib.parse
+import http.server
+import threading
+import hashlib
+import operator
 import shutil
+import json
+import time
+import re
+import logging
+import numpy as np
+import pandas as pd
+import xarray as xr
+from scipy.io import netcdf_file
+
+log = logging.getLogger("argopy.tutorial")
 
 _DEFAULT_CACHE_DIR = os.path.expanduser(os.path.sep.join(["~", ".argopy_tutorial_data"]))
 
@@ -141,3 +163,745 @@ class sample_ftp(repodata):
         for (dirpath, dirnames, filenames) in os.walk(self.rootpath):
             listOfFiles += [os.path.join(dirpath, file) for file in filenames]
         return listOfFiles
+
+
+class synthetic_ftp:
+    """ Generator of a synthetic GDAC ftp folder, to test argopy at scale without network access
+
+    The folder follows the GDAC conventions, with files filled with random but plausible data:
+
+    .. code-block:: none
+
+        .
+        ├── ar_index_global_prof.txt
+        └── dac
+            └── <dac>
+                └── <wmo>
+                    ├── <wmo>_prof.nc
+                    ├── <wmo>_Sprof.nc  (BGC floats only)
+                    └── profiles
+                        ├── <R/D><wmo>_<cyc>.nc
+                        ├── B<R/D><wmo>_<cyc>.nc  (BGC floats only)
+                        └── M<R/D><wmo>_<cyc>.nc  (BGC floats only)
+
+    Floats are assigned to DACs by contiguous blocks of WMOs, so that the profile index is sorted like the GDAC one.
+    The content of the folder only depends on the generator parameters.
+
+    Examples
+    --------
+    >>> ftp = argopy.tutorial.synthetic_ftp('/tmp/gdac', n_dacs=3, n_floats=100, n_cycles=50).generate()
+    >>> with argopy.set_options(src='localftp', local_ftp=ftp.rootpath):
+    >>>     ds = argopy.DataFetcher().float(ftp.wmo[0:2]).to_xarray()
+    >>>     ds = argopy.DataFetcher().region([-180, 180, -90, 90, 0, 100, '2012-01', '2012-06']).to_xarray()
+
+    To benchmark index searches on a production size index (about 2.5 millions profiles), without writing netcdf
+    files:
+
+    >>> ftp = argopy.tutorial.synthetic_ftp('/tmp/gdac', n_dacs=11, n_floats=17000, n_cycles=150,
+    >>>                                     index_only=True).generate()
+    """
+    dacs = ["aoml", "bodc", "coriolis", "csio", "csiro", "incois", "jma", "kma", "kordi", "meds", "nmdis"]
+    institutions = ["AO", "BO", "IF", "HZ", "CS", "IN", "JA", "KM", "KO", "ME", "NM"]
+
+    def __init__(self,
+                 path: str,
+                 n_dacs: int = 2,
+                 n_floats: int = 10,
+                 n_cycles: int = 10,
+                 n_levels: int = 100,
+                 bgc: float = 0.2,
+                 profiles: bool = True,
+                 index_only: bool = False,
+                 seed: int = 0):
+        """ Create a synthetic GDAC ftp folder generator
+
+        Parameters
+        ----------
+        path: str
+            Path of the folder to generate
+        n_dacs: int, default: 2
+            Number of DACs, at most 11
+        n_floats: int, default: 10
+            Number of floats
+        n_cycles: int, default: 10
+            Number of cycles of each float
+        n_levels: int, default: 100
+            Maximum number of vertical levels of profiles. Each profile has between 90% and 100% of this number of
+            levels.
+        bgc: float, default: 0.2
+            Fraction of BGC floats, with a dissolved oxygen sensor. These floats have synthetic multi-profile
+            files (``<wmo>_Sprof.nc``), single-profile BGC files (``B<R/D><wmo>_<cyc>.nc``) and merged
+            single-profile files (``M<R/D><wmo>_<cyc>.nc``).
+        profiles: bool, default: True
+            Write single-profile files. The number of files of the folder is dominated by these.
+        index_only: bool, default: False
+            Only write the profile index file, not the netcdf files.
+        seed: int, default: 0
+            Seed of the random number generator
+        """
+        if n_dacs < 1 or n_dacs > len(self.dacs):
+            raise ValueError("Number of DACs must be between 1 and %i" % len(self.dacs))
+        self.localpath = os.path.abspath(os.path.expanduser(path))
+        self.n_dacs = n_dacs
+        self.n_floats = n_floats
+        self.n_cycles = n_cycles
+        self.n_levels = n_levels
+        self.bgc = bgc
+        self.profiles = profiles
+        self.index_only = index_only
+        self.seed = seed
+
+    def __repr__(self):
+        summary = ["<argopy.tutorial.synthetic_ftp>"]
+        summary.append("Path: %s" % self.localpath)
+        summary.append("DACs: %i, floats: %i, cycles: %i, levels: %i, BGC: %0.0f%%" % (
+            self.n_dacs, self.n_floats, self.n_cycles, self.n_levels, 100 * self.bgc))
+        return "\n".join(summary)
+
+    @property
+    def rootpath(self):
+        """ Path of the ftp folder, to be used as ``local_ftp`` option """
+        return self.localpath
+
+    @property
+    def wmo(self):
+        """ List of the float WMOs """
+        return [1900000 + i for i in range(self.n_floats)]
+
+    def dac(self, wmo: int):
+        """ Name of the DAC of a float """
+        return self.dacs[(wmo - 1900000) * self.n_dacs // self.n_floats]
+
+    def ls(self):
+        """ Return the list of files in the synthetic GDAC ftp folder """
+        listOfFiles = list()
+        for (dirpath, dirnames, filenames) in os.walk(self.rootpath):
+            listOfFiles += [os.path.join(dirpath, file) for file in filenames]
+        return listOfFiles
+
+    def generate(self, overwrite: bool = False):
+        """ Write the synthetic GDAC ftp folder
+
+        Parameters
+        ----------
+        overwrite: bool, default: False
+            Delete an existing folder first. Otherwise, files are written into the existing folder.
+
+        Returns
+        -------
+        :class:`synthetic_ftp`
+        """
+        if overwrite and os.path.isdir(self.localpath):
+            shutil.rmtree(self.localpath)
+        os.makedirs(os.path.join(self.localpath, "dac"), exist_ok=True)
+        with open(os.path.join(self.localpath, "ar_index_global_prof.txt"), "w") as index:
+            index.write("\n".join(self._index_header()) + "\n")
+            for wmo in self.wmo:
+                meta = self._float(wmo)
+                index.write(self._index_lines(meta))
+                if not self.index_only:
+                    self._write_float(meta)
+        return self
+
+    def _float(self, wmo: int):
+        """ Metadata of a float cycles, as a dictionary of arrays """
+        rng = np.random.default_rng([self.seed, wmo])
+        n = self.n_cycles
+        cyc = np.arange(1, n + 1)
+        start = np.datetime64("2000-01-01") + np.timedelta64(int(rng.integers(0, 15 * 365)), "D")
+        juld = start + (cyc * 10 * 86400 + rng.integers(0, 3600, n)).astype("timedelta64[s]")
+        lon = (rng.uniform(-180, 170) + np.cumsum(rng.normal(0, 0.1, n)) + 180) % 360 - 180
+        lat = np.clip(rng.uniform(-60, 60) + np.cumsum(rng.normal(0, 0.1, n)), -89, 89)
+        data_mode = np.where(cyc <= 0.6 * n, "D", np.where(cyc <= 0.8 * n, "A", "R"))
+        levels = self.n_levels - rng.integers(0, max(self.n_levels // 10, 1), n)
+        bgc = rng.uniform() < self.bgc
+        return {"wmo": wmo, "dac": self.dac(wmo), "cyc": cyc, "juld": juld, "lon": lon, "lat": lat,
+                "data_mode": data_mode, "levels": levels, "bgc": bgc, "rng": rng}
+
+    def _index_header(self):
+        return [
+            "# Title : Profile directory file of the Argo Global Data Assembly Center",
+            "# Description : The directory file describes all individual profile files of the argo GDAC ftp site.",
+            "# Project : ARGO",
+            "# Format version : 2.0",
+            "# Date of update : 20220101000000",
+            "# FTP root number 1 : ftp://ftp.ifremer.fr/ifremer/argo/dac",
+            "# FTP root number 2 : ftp://usgodae.org/pub/outgoing/argo/dac",
+            "# GDAC node : SYNTHETIC",
+            "file,date,latitude,longitude,ocean,profiler_type,institution,date_update",
+        ]
+
+    def _profile_file(self, meta, i, prefix=""):
+        """ Path of a single-profile file, relative to the dac folder """
+        cyc = ("%0.3d" if meta["cyc"][i] < 1000 else "%0.4d") % meta["cyc"][i]
+        mode = "R" if meta["data_mode"][i] == "R" else "D"
+        return "%s/%i/profiles/%s%s%i_%s.nc" % (meta["dac"], meta["wmo"], prefix, mode, meta["wmo"], cyc)
+
+    def _index_lines(self, meta):
+        institution = self.institutions[self.dacs.index(meta["dac"])]
+        dates = pd.to_datetime(meta["juld"]).strftime("%Y%m%d%H%M%S")
+        lines = ["%s,%s,%0.3f,%0.3f,%s,844,%s,20220101000000\n" % (
+            self._profile_file(meta, i), dates[i], meta["lat"][i], meta["lon"][i],
+            "A" if -70 < meta["lon"][i] < 20 else ("I" if 20 <= meta["lon"][i] < 120 else "P"), institution)
+            for i in range(len(meta["cyc"]))]
+        return "".join(lines)
+
+    def _variables(self, meta, params: list):
+        """ Variables of a float multi-profile file, in the Argo netcdf format
+
+            Returns
+            -------
+            dict
+                Variable names mapped to (dimensions, data, attributes). Strings are fixed-width bytes arrays, to
+                be written as netcdf char arrays.
+        """
+        rng = meta["rng"]
+        n_prof, n_levels, n_param = len(meta["cyc"]), int(np.max(meta["levels"])), len(params)
+        mask = np.arange(n_levels)[np.newaxis, :] < meta["levels"][:, np.newaxis]
+        data_mode = meta["data_mode"].astype("S1")
+        fill = {"_FillValue": b" "}
+        dates = {"conventions": "YYYYMMDDHHMISS"}
+
+        def chars(value, n, shape=(n_prof,)):
+            return np.full(shape, value.ljust(n)[0:n], dtype="S%i" % n)
+
+        juld = (meta["juld"] - np.datetime64("1950-01-01")) / np.timedelta64(1, "D")
+        juld_attrs = {"standard_name": "time", "units": "days since 1950-01-01 00:00:00 UTC",
+                      "conventions": "Relative julian days with decimal part (as parts of day)",
+                      "resolution": 0.0, "axis": "T", "_FillValue": 999999.}
+        variables = {
+            "DATA_TYPE": ((), chars("Argo profile", 16, ()), {}),
+            "FORMAT_VERSION": ((), chars("3.1", 4, ()), {}),
+            "HANDBOOK_VERSION": ((), chars("1.2", 4, ()), {}),
+            "REFERENCE_DATE_TIME": ((), chars("19500101000000", 14, ()), dates),
+            "DATE_CREATION": ((), chars("20220101000000", 14, ()), dates),
+            "DATE_UPDATE": ((), chars("20220101000000", 14, ()), dates),
+            "PLATFORM_NUMBER": (("N_PROF",), chars(str(meta["wmo"]), 8), fill),
+            "PROJECT_NAME": (("N_PROF",), chars("SYNTHETIC", 64), fill),
+            "PI_NAME": (("N_PROF",), chars("ARGOPY", 64), fill),
+            "STATION_PARAMETERS": (("N_PROF", "N_PARAM"), np.array([params] * n_prof, dtype="S16"), fill),
+            "CYCLE_NUMBER": (("N_PROF",), meta["cyc"].astype(np.int32), {"_FillValue": np.int32(99999)}),
+            "DIRECTION": (("N_PROF",), chars("A", 1), fill),
+            "DATA_CENTRE": (("N_PROF",), chars(self.institutions[self.dacs.index(meta["dac"])], 2), fill),
+            "DC_REFERENCE": (("N_PROF",), chars("", 32), fill),
+            "DATA_STATE_INDICATOR": (("N_PROF",), chars("2B", 4), fill),
+            "DATA_MODE": (("N_PROF",), data_mode, fill),
+            "PLATFORM_TYPE": (("N_PROF",), chars("ARVOR", 32), fill),
+            "FLOAT_SERIAL_NO": (("N_PROF",), chars(str(meta["wmo"] % 10000), 32), fill),
+            "FIRMWARE_VERSION": (("N_PROF",), chars("5900A04", 32), fill),
+            "WMO_INST_TYPE": (("N_PROF",), chars("844", 4), fill),
+            "JULD": (("N_PROF",), juld, juld_attrs),
+            "JULD_QC": (("N_PROF",), chars("1", 1), fill),
+            "JULD_LOCATION": (("N_PROF",), juld, juld_attrs),
+            "LATITUDE": (("N_PROF",), meta["lat"],
+                         {"standard_name": "latitude", "units": "degree_north", "axis": "Y", "_FillValue": 99999.}),
+            "LONGITUDE": (("N_PROF",), meta["lon"],
+                          {"standard_name": "longitude", "units": "degree_east", "axis": "X", "_FillValue": 99999.}),
+            "POSITION_QC": (("N_PROF",), chars("1", 1), fill),
+            "POSITIONING_SYSTEM": (("N_PROF",), chars("GPS", 8), fill),
+            "VERTICAL_SAMPLING_SCHEME": (("N_PROF",), chars("Primary sampling: averaged", 256), fill),
+            "CONFIG_MISSION_NUMBER": (("N_PROF",), np.ones(n_prof, dtype=np.int32), {"_FillValue": np.int32(99999)}),
+        }
+        for p in params:
+            variables["PROFILE_%s_QC" % p] = (("N_PROF",), chars("A", 1), fill)
+        if "DOXY" in params:
+            variables["PARAMETER_DATA_MODE"] = (("N_PROF", "N_PARAM"),
+                                                np.repeat(data_mode[:, np.newaxis], n_param, axis=1), fill)
+
+        pres = np.sort(np.linspace(5, 2000, n_levels)[np.newaxis, :] + rng.uniform(0, 2, (n_prof, n_levels)), axis=1)
+        values = {
+            "PRES": pres,
+            "TEMP": 2. + 20. * np.exp(-pres / 400.) + rng.normal(0, 0.01, pres.shape),
+            "PSAL": 34.7 + 0.8 * np.exp(-pres / 600.) + rng.normal(0, 0.005, pres.shape),
+            "DOXY": 200. + 50. * np.exp(-pres / 300.) + rng.normal(0, 1, pres.shape),
+        }
+        errors = {"PRES": 2.4, "TEMP": 0.002, "PSAL": 0.01, "DOXY": 5.}
+        adjusted = (meta["data_mode"] != "R")[:, np.newaxis] & mask
+        dims = ("N_PROF", "N_LEVELS")
+        for p in params:
+            qc = rng.choice(np.array(list("1111111234"), dtype="S1"), pres.shape)
+            attrs = {"_FillValue": np.float32(99999.)}
+            variables[p] = (dims, np.where(mask, values[p], 99999.).astype(np.float32), attrs)
+            variables["%s_QC" % p] = (dims, np.where(mask, qc, b" "), fill)
+            variables["%s_ADJUSTED" % p] = (dims, np.where(adjusted, values[p] + errors[p] / 10, 99999.).astype(
+                np.float32), attrs)
+            variables["%s_ADJUSTED_QC" % p] = (dims, np.where(adjusted, qc, b" "), fill)
+            variables["%s_ADJUSTED_ERROR" % p] = (dims, np.where(adjusted, errors[p], 99999.).astype(np.float32), attrs)
+
+        dims = ("N_PROF", "N_CALIB", "N_PARAM")
+        variables["PARAMETER"] = (dims, np.array([[params]] * n_prof, dtype="S16"), fill)
+        for v in ["SCIENTIFIC_CALIB_EQUATION", "SCIENTIFIC_CALIB_COEFFICIENT", "SCIENTIFIC_CALIB_COMMENT"]:
+            variables[v] = (dims, chars("none", 256, (n_prof, 1, n_param)), fill)
+        variables["SCIENTIFIC_CALIB_DATE"] = (dims, chars("20220101000000", 14, (n_prof, 1, n_param)),
+                                              {**fill, **dates})
+        return variables
+
+    def _write(self, path, variables, select: dict = {}):
+        """ Write variables as a netcdf3 classic file, with the Argo netcdf format char arrays dimensions
+
+            Variables are written with the :mod:`scipy.io` netcdf writer, since xarray encoding overhead dominates
+            for the small files of the GDAC.
+
+            Parameters
+            ----------
+            path: str
+            variables: dict
+                Variables to write, as returned by :meth:`_variables`
+            select: dict
+                Dimension names mapped to an index or slice, to write a subset of variables
+        """
+        with netcdf_file(path, "w", version=1) as nc:
+            nc.title = "Argo float vertical profile"
+            nc.institution = "SYNTHETIC"
+            nc.source = "Argo float"
+            nc.user_manual_version = "3.1"
+            nc.Conventions = "Argo-3.1 CF-1.6"
+            nc.featureType = "trajectoryProfile"
+            for name, (dims, data, attrs) in variables.items():
+                for axis, d in enumerate(dims):
+                    if d in select:
+                        data = data[(slice(None),) * axis + (select[d],)]
+                if data.dtype.kind == "S" and data.dtype.itemsize > 1:
+                    n = data.dtype.itemsize
+                    dims = dims + ("DATE_TIME" if n == 14 else "STRING%i" % n,)
+                    data = np.ascontiguousarray(data).reshape(data.shape + (1,)).view("S1")
+                for d, size in zip(dims, data.shape):
+                    if d not in nc.dimensions:
+                        nc.createDimension(d, size)
+                var = nc.createVariable(name, data.dtype, dims)
+                if len(dims) > 0:
+                    var[:] = data
+                else:
+                    var.assignValue(data)
+                for k, v in attrs.items():
+                    setattr(var, k, v)
+
+    def _write_float(self, meta):
+        """ Write multi-profile and single-profile files of a float """
+        folder = os.path.join(self.localpath, "dac", meta["dac"], str(meta["wmo"]))
+        os.makedirs(os.path.join(folder, "profiles") if self.profiles else folder, exist_ok=True)
+        files = [("%i_prof.nc" % meta["wmo"], ["PRES", "TEMP", "PSAL"], "")]
+        if meta["bgc"]:
+            files.append(("%i_Sprof.nc" % meta["wmo"], ["PRES", "TEMP", "PSAL", "DOXY"], "B"))
+        for name, params, prefix in files:
+            variables = self._variables(meta, params)
+            self._write(os.path.join(folder, name), variables)
+            if self.profiles:
+                if prefix == "":
+                    subsets = [("", variables, slice(None))]
+                else:
+                    # BGC single-profile files only have the pressure and BGC parameters, merged files have all:
+                    subsets = [("B", {k: v for k, v in variables.items() if not k.startswith(
+                        ("TEMP", "PSAL", "PROFILE_TEMP", "PROFILE_PSAL"))}, [0, 3]),
+                        ("M", variables, slice(None))]
+                for prefix, subset, parameters in subsets:
+                    for i in range(len(meta["cyc"])):
+                        path = os.path.join(self.localpath, "dac", self._profile_file(meta, i, prefix))
+                        self._write(path, subset, {"N_PROF": [i], "N_LEVELS": slice(0, meta["levels"][i]),
+                                                   "N_PARAM": parameters})
+
+
+class _mock_handler(http.server.BaseHTTPRequestHandler):
+    """ Request handler of a :class:`mock_server` """
+
+    def do_GET(self):
+        self._respond()
+
+    def do_HEAD(self):
+        self._respond(head=True)
+
+    def _respond(self, head: bool = False):
+        mock = self.server.mock
+        if mock.latency > 0:
+            time.sleep(mock.latency)
+        try:
+            status, content_type, body = mock._answer(self.path)
+        except Exception as e:
+            log.debug("Mock server error for %s: %s" % (self.path, e))
+            status, content_type, body = 500, "text/plain", str(e).encode("utf-8")
+        headers = {"Content-Type": content_type}
+        if status == 200:
+            headers["ETag"] = '"%s"' % hashlib.md5(body).hexdigest()
+            if self.headers.get("If-None-Match") == headers["ETag"]:
+                status, body = 304, b""
+        headers["Content-Length"] = str(len(body))
+        self.send_response(status)
+        for k, v in headers.items():
+            self.send_header(k, v)
+        self.end_headers()
+        mock._log(self.command, self.path, status, 0 if head else len(body))
+        if not head:
+            mock._send(self.wfile, body)
+
+    def log_message(self, format, *args):
+        log.debug(format % args)
+
+
+class mock_server:
+    """ Local http server mocking the Ifremer erddap and Argovis APIs, to test and benchmark data fetchers offline
+
+    The server answers the URLs generated by the ``erddap`` and ``argovis`` data fetchers, and by the ``erddap``
+    index fetcher, from a local dataset of Argo points and a local profile index:
+
+        - erddap tabledap requests of ``.nc``, ``.csv`` and ``.ncHeader`` files, with variables, constraints (``=``,
+          ``!=``, ``=~``, ``<``, ``<=``, ``>``, ``>=``), ``distinct()`` and ``orderBy()``. The data are served for
+          all data dataset ids (``ArgoFloats``, ``ArgoFloats-bio``, ``ArgoFloats-ref``), the index for
+          ``ArgoFloats-index``. Like erddap, the server answers with a 404 status when a query has no results, and a
+          400 status for unknown variables.
+        - Argovis json requests of ``/catalog/platforms``, ``/catalog/mprofiles`` and ``/selection/profiles`` (or
+          ``/selection/box/profiles``). Profiles have the ``PRES``, ``TEMP`` and ``PSAL`` measurements of the
+          dataset. Regions are selected with the bounding box of the requested shape.
+
+    Answers have an ``ETag`` header and ``If-None-Match`` requests are answered with a 304 status, so that cache
+    revalidation can be tested too.
+
+    Network conditions are simulated with a latency before each answer, a limited bandwidth and random errors. All
+    requests served are logged in :attr:`requests`.
+
+    Examples
+    --------
+    >>> ftp = argopy.tutorial.synthetic_ftp('/tmp/gdac', n_floats=10).generate()
+    >>> with argopy.set_options(src='localftp', local_ftp=ftp.rootpath, mode='expert'):
+    >>>     ds = argopy.DataFetcher().float(ftp.wmo).to_xarray()
+    >>> index = os.path.join(ftp.rootpath, 'ar_index_global_prof.txt')
+    >>> with argopy.tutorial.mock_server(ds, index=index, latency=0.1, error_rate=0.05) as server:
+    >>>     argopy.DataFetcher(src='erddap', server=server.erddap, parallel=True).float(ftp.wmo).to_xarray()
+    >>>     argopy.DataFetcher(src='argovis', server=server.argovis).float(ftp.wmo).to_xarray()
+    >>>     argopy.IndexFetcher(src='erddap', server=server.erddap).float(ftp.wmo).to_dataframe()
+    >>>     print(len(server.requests))
+    """
+
+    _constraint = re.compile(r"^([A-Za-z_][A-Za-z0-9_]*)(>=|<=|!=|=~|=|<|>)(.*)$")
+    _function = re.compile(r"^([A-Za-z]+)\((.*)\)$")
+    _operators = {"=": operator.eq, "!=": operator.ne, "<": operator.lt, "<=": operator.le, ">": operator.gt,
+                  ">=": operator.ge}
+
+    def __init__(self,
+                 ds: xr.Dataset = None,
+                 index=None,
+                 port: int = 0,
+                 latency: float = 0.,
+                 bandwidth: int = 0,
+                 error_rate: float = 0.,
+                 error_code: int = 503,
+                 seed: int = 0):
+        """ Create a mocked erddap and Argovis API server
+
+        Parameters
+        ----------
+        ds: :class:`xarray.Dataset`, optional
+            Collection of Argo points to serve, with upper case variable names, as returned by a data fetcher in
+            ``expert`` user mode.
+        index: :class:`pandas.DataFrame` or str, optional
+            Profile index to serve, or path to a profile index file in the GDAC format
+            (eg: ``ar_index_global_prof.txt``).
+        port: int, default: 0
+            Port to listen to, a free port is used by default.
+        latency: float, default: 0
+            Time to wait before answering each request, in seconds.
+        bandwidth: int, default: 0
+            Maximum number of bytes sent per second for each response. No limit by default.
+        error_rate: float, default: 0
+            Probability of answering a request with an error.
+        error_code: int, default: 503
+            Http status of injected errors.
+        seed: int, default: 0
+            Seed of the random number generator used to inject errors
+        """
+        if not 0 <= error_rate <= 1:
+            raise ValueError("Error rate must be between 0 and 1")
+        self.ds = ds
+        self.index = index
+        self.port = port
+        self.latency = latency
+        self.bandwidth = bandwidth
+        self.error_rate = error_rate
+        self.error_code = error_code
+        self.requests = []
+        self._rng = np.random.default_rng(seed)
+        self._lock = threading.Lock()
+        self._tables = {}
+        self._httpd = None
+
+    def __repr__(self):
+        summary = ["<argopy.tutorial.mock_server>"]
+        summary.append("Url: %s" % (self.url if self._httpd else "-"))
+        summary.append("Points: %s, index: %s" % (
+            "-" if self.ds is None else len(self.ds["N_POINTS"]), "-" if self.index is None else "yes"))
+        summary.append("Latency: %gs, bandwidth: %s, error rate: %g" % (
+            self.latency, "%i B/s" % self.bandwidth if self.bandwidth > 0 else "-", self.error_rate))
+        return "\n".join(summary)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    @property
+    def url(self):
+        """ Root url of the server """
+        return "http://localhost:%i" % self._httpd.server_address[1]
+
+    @property
+    def erddap(self):
+        """ Url of the mocked erddap server, to be used as ``server`` argument of erddap fetchers """
+        return self.url + "/erddap"
+
+    @property
+    def argovis(self):
+        """ Url of the mocked Argovis API, to be used as ``server`` argument of argovis fetchers """
+        return self.url + "/argovis"
+
+    def start(self):
+        """ Start serving requests, in a background thread
+
+        Returns
+        -------
+        :class:`mock_server`
+        """
+        if self._httpd is None:
+            self._httpd = http.server.ThreadingHTTPServer(("localhost", self.port), _mock_handler)
+            self._httpd.daemon_threads = True
+            self._httpd.mock = self
+            threading.Thread(target=self._httpd.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        """ Stop serving requests """
+        if self._httpd is not None:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._httpd = None
+
+    def _log(self, method, path, status, size):
+        with self._lock:
+            self.requests.append({"method": method, "path": path, "status": status, "bytes": size})
+
+    def _send(self, wfile, body):
+        """ Write a response body, at the server bandwidth """
+        if self.bandwidth <= 0:
+            wfile.write(body)
+            return
+        size = min(65536, max(self.bandwidth // 10, 1024))
+        for i in range(0, len(body), size):
+            chunk = body[i:i + size]
+            time.sleep(len(chunk) / self.bandwidth)
+            wfile.write(chunk)
+
+    def _answer(self, path):
+        """ Return the status, content type and body of the response to a request """
+        if self.error_rate > 0:
+            with self._lock:
+                error = self._rng.uniform() < self.error_rate
+            if error:
+                return self.error_code, "text/plain", b"Injected error"
+        url = urllib.parse.urlsplit(path)
+        route = urllib.parse.unquote(url.path).strip("/").split("/")
+        query = urllib.parse.unquote(url.query)
+        if route[0] == "erddap" and len(route) == 3 and route[1] == "tabledap":
+            return self._erddap_tabledap(route[2], query)
+        if route[0] == "erddap" and len(route) == 4 and route[1] == "info":
+            return self._json({"table": {"columnNames": ["Row Type", "Variable Name"], "rows": []}})
+        if route[0] == "argovis":
+            return self._argovis("/".join(route[1:]), urllib.parse.parse_qs(url.query))
+        return self._error(404, "Not Found: %s" % url.path)
+
+    def _error(self, code, message):
+        text = 'Error {\n    code=%i;\n    message="%s";\n}\n' % (code, message)
+        return code, "text/plain", text.encode("utf-8")
+
+    def _json(self, js):
+        return 200, "application/json", json.dumps(js).encode("utf-8")
+
+    def _table(self, name):
+        """ Return the points (``data``) or the index (``index``) as a :class:`pandas.DataFrame`, built once """
+        with self._lock:
+            if name not in self._tables:
+                if name == "index":
+                    df = self.index
+                    if isinstance(df, str):
+                        df = pd.read_csv(df, comment="#")
+                        for d in ["date", "date_update"]:
+                            df[d] = pd.to_datetime(df[d], format="%Y%m%d%H%M%S")
+                else:
+                    df = self.ds.reset_coords().drop_vars("N_POINTS").to_dataframe().reset_index(drop=True)
+                    df.columns = [c.lower() for c in df.columns]
+                self._tables[name] = df
+            return self._tables[name]
+
+    def _value(self, column, value):
+        """ Cast a constraint value to the type of a column """
+        if value.startswith('"') and value.endswith('"'):
+            value = value[1:-1]
+        if column.dtype.kind == "M":
+            try:
+                return pd.to_datetime(float(value), unit="s")
+            except ValueError:
+                return pd.to_datetime(value).tz_localize(None)
+        if column.dtype.kind in "biuf":
+            return float(value)
+        return value
+
+    def _erddap_tabledap(self, name, query):
+        """ Answer a tabledap request """
+        dataset_id, _, response = name.rpartition(".")
+        if dataset_id == "ArgoFloats-index":
+            if self.index is None:
+                return self._error(404, "Not Found: no index served")
+            df = self._table("index")
+        elif dataset_id.startswith("ArgoFloats"):
+            if self.ds is None:
+                return self._error(404, "Not Found: no data served")
+            df = self._table("data")
+        else:
+            return self._error(404, "Not Found: Currently unknown datasetID=%s" % dataset_id)
+        if response not in ["nc", "csv", "ncHeader"]:
+            return self._error(400, "Bad Request: Unsupported file type: .%s" % response)
+
+        try:
+            df = self._tabledap_select(df, query)
+        except ValueError as e:
+            return self._error(400, "Bad Request: Query error: %s" % e)
+        if len(df) == 0:
+            return self._error(404, "Not Found: Your query produced no matching results. (nRows = 0)")
+        return self._tabledap_render(df, dataset_id, response)
+
+    def _tabledap_select(self, df, query):
+        """ Return the rows and columns of a table selected by a tabledap query
+
+            Variables, constraints, ``distinct()`` and ``orderBy()`` are parsed from the query. Query errors raise a
+            ValueError.
+        """
+        items = query.split("&")
+        variables = [v for v in items[0].split(",") if v != ""] or list(df.columns)
+        mask = np.ones(len(df), dtype=bool)
+        distinct, order = False, []
+        for item in items[1:]:
+            function = self._function.match(item)
+            if function:
+                distinct = distinct or function.group(1) == "distinct"
+                if function.group(1) == "orderBy":
+                    order = [v for v in function.group(2).strip('"').split(",") if v != ""]
+                continue
+            constraint = self._constraint.match(item)
+            if not constraint:
+                raise ValueError("Invalid constraint: %s" % item)
+            var, op, value = constraint.groups()
+            if var not in df.columns:
+                raise ValueError("Unrecognized constraint variable=%s" % var)
+            column = df[var]
+            if op == "=~":
+                mask &= column.astype(str).str.fullmatch(value.strip('"')).to_numpy()
+            else:
+                mask &= self._operators[op](column, self._value(column, value)).to_numpy()
+        unknown = sorted(set(variables + order) - set(df.columns))
+        if unknown:
+            raise ValueError("Unrecognized variable=%s" % unknown[0])
+
+        df = df.loc[mask, variables]
+        if distinct:
+            df = df.drop_duplicates()
+        if len(order) > 0:
+            df = df.sort_values(order, kind="stable")
+        return df
+
+    def _tabledap_render(self, df, dataset_id, response):
+        """ Return the status, content type and body of a tabledap ``csv``, ``nc`` or ``ncHeader`` response """
+        variables = list(df.columns)
+        if response == "csv":
+            units = ["UTC" if df[v].dtype.kind == "M" else "" for v in variables]
+            text = ",".join(variables) + "\n" + ",".join(units) + "\n"
+            text += df.to_csv(header=False, index=False, date_format="%Y-%m-%dT%H:%M:%SZ")
+            return 200, "text/csv", text.encode("utf-8")
+        ds = xr.Dataset({v: ("row", df[v].to_numpy() if df[v].dtype.kind != "O" else df[v].to_numpy().astype(str))
+                         for v in variables})
+        for v in variables:
+            if ds[v].dtype.kind == "M":
+                ds[v].encoding = {"units": "seconds since 1970-01-01T00:00:00Z", "dtype": "float64"}
+        if response == "nc":
+            return 200, "application/x-netcdf", bytes(ds.to_netcdf())
+        types = {"f": "double", "i": "int", "u": "int", "b": "byte", "M": "double", "U": "char", "S": "char"}
+        lines = ["netcdf %s.nc {" % dataset_id, "  dimensions:", "    row = %i;" % len(df), "  variables:"]
+        lines += ["    %s %s(row);" % (types.get(ds[v].dtype.kind, "char"), v) for v in variables]
+        lines += ["}"]
+        return 200, "text/plain", ("\n".join(lines) + "\n").encode("utf-8")
+
+    def _argovis_profiles(self):
+        """ Return profiles metadata and measurements of the dataset, built once """
+        with self._lock:
+            if "argovis" not in self._tables:
+                df = self.ds.reset_coords()[["PLATFORM_NUMBER", "CYCLE_NUMBER", "DIRECTION", "TIME", "TIME_QC",
+                                             "LATITUDE", "LONGITUDE", "POSITION_QC", "DATA_MODE", "PRES", "TEMP",
+                                             "PSAL"]].to_dataframe().reset_index(drop=True)
+                df = df.sort_values(["PLATFORM_NUMBER", "CYCLE_NUMBER", "DIRECTION", "PRES"], kind="stable")
+                keys = ["PLATFORM_NUMBER", "CYCLE_NUMBER", "DIRECTION"]
+                first = np.r_[True, (df[keys].to_numpy()[1:] != df[keys].to_numpy()[:-1]).any(axis=1)]
+                profiles = df.loc[first, keys + ["TIME", "TIME_QC", "LATITUDE", "LONGITUDE", "POSITION_QC",
+                                                 "DATA_MODE"]].reset_index(drop=True)
+                profiles["start"] = np.flatnonzero(first)
+                profiles["stop"] = np.r_[profiles["start"].to_numpy()[1:], len(df)]
+                measurements = {v.lower(): df[v].to_numpy() for v in ["PRES", "TEMP", "PSAL"]}
+                self._tables["argovis"] = (profiles, measurements)
+            return self._tables["argovis"]
+
+    def _argovis_region(self, profiles, route, query):
+        """ Return the mask of profiles in the region of a selection request, and its pressure range """
+        if route == "selection/profiles":
+            shape = np.array(json.loads(query["shape"][0]), dtype=float).reshape(-1, 2)
+            corners = shape.min(axis=0), shape.max(axis=0)
+        else:
+            corners = [np.array(json.loads(query[c][0]), dtype=float) for c in ["llCorner", "urCorner"]]
+        pres = json.loads(query["presRange"][0]) if "presRange" in query else [-np.inf, np.inf]
+        start = pd.to_datetime(query["startDate"][0]).tz_localize(None)
+        end = pd.to_datetime(query["endDate"][0]).tz_localize(None)
+        mask = (profiles["LONGITUDE"] >= corners[0][0]) & (profiles["LONGITUDE"] <= corners[1][0])
+        mask &= (profiles["LATITUDE"] >= corners[0][1]) & (profiles["LATITUDE"] <= corners[1][1])
+        mask &= (profiles["TIME"] >= start) & (profiles["TIME"] <= end)
+        return mask, pres
+
+    def _argovis(self, route, query):
+        """ Answer an Argovis API request """
+        if self.ds is None:
+            return self._error(404, "Not Found: no data served")
+        if route == "selection/overview":
+            return self._json({"numberOfProfiles": int(len(self._argovis_profiles()[0]))})
+        profiles, measurements = self._argovis_profiles()
+        pres = [-np.inf, np.inf]
+        if route.startswith("catalog/platforms/"):
+            mask = profiles["PLATFORM_NUMBER"].astype(str) == route.split("/")[-1]
+        elif route == "catalog/mprofiles":
+            ids = re.findall(r"(\d+)_(\d+)", query.get("ids", [""])[0])
+            mask = pd.Series(list(zip(profiles["PLATFORM_NUMBER"].astype(str), profiles["CYCLE_NUMBER"].astype(str))))
+            mask = mask.isin(ids)
+        elif route in ["selection/profiles", "selection/box/profiles"]:
+            mask, pres = self._argovis_region(profiles, route, query)
+        else:
+            return self._error(404, "Not Found: %s" % route)
+
+        def finite(x):
+            return None if np.isnan(x) else float(x)
+
+        results = []
+        for p in profiles[mask.to_numpy()].itertuples():
+            levels = slice(p.start, p.stop)
+            keep = (measurements["pres"][levels] >= pres[0]) & (measurements["pres"][levels] <= pres[1])
+            if not keep.any():
+                continue
+            columns = {k: v[levels][keep] for k, v in measurements.items()}
+            results.append({
+                "_id": "%i_%i%s" % (p.PLATFORM_NUMBER, p.CYCLE_NUMBER, "D" if p.DIRECTION == "D" else ""),
+                "platform_number": str(p.PLATFORM_NUMBER),
+                "cycle_number": int(p.CYCLE_NUMBER),
+                "date": p.TIME.strftime("%Y-%m-%dT%H:%M:%S.000Z"),
+                "date_qc": int(p.TIME_QC),
+                "lat": float(p.LATITUDE),
+                "lon": float(p.LONGITUDE),
+                "position_qc": int(p.POSITION_QC),
+                "DATA_MODE": str(p.DATA_MODE),
+                "DIRECTION": str(p.DIRECTION),
+                "measurements": [{k: finite(v[i]) for k, v in columns.items()} for i in range(keep.sum())],
+            })
+        if len(results) == 0:
+            return self._error(404, "Not Found: no profiles")
+        return self._json(results)
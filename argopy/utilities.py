@@ -26,7 +26,6 @@ import contextlib
 import xarray as xr
 import pandas as pd
 import numpy as np
-from scipy import interpolate
 
 import pickle
 import pkg_resources
@@ -275,6 +274,21 @@ def list_multiprofile_file_variables():
     ]
 
 
+def _check_remote_localftp(path, dacs, errors: str = "ignore"):
+    """ Check if the url of a remote GDAC mirror (http or https) has browsable DAC folders, see :func:`check_localftp` """
+    try:
+        listing = httpstore().fs.ls("/".join([path.rstrip("/"), "dac", ""]), detail=False)
+    except Exception:
+        listing = []
+    if np.any([p.rstrip("/").split("/")[-1] in dacs for p in listing]):
+        return True
+    elif errors == "raise":
+        raise FtpPathError("This url is not GDAC compliant:\n%s" % path)
+    elif errors == "warn":
+        warnings.warn("This url is not GDAC compliant:\n%s" % path)
+    return False
+
+
 def check_localftp(path, errors: str = "ignore"):
     """ Check if the path has the expected GDAC ftp structure
 
@@ -288,10 +302,12 @@ def check_localftp(path, errors: str = "ignore"):
             ├── meds
             └── nmdis
 
+        The path can also be the url of a remote GDAC mirror (http or https), with browsable folders.
+
         Parameters
         ----------
         path: str
-            Path name to check
+            Path name or url to check
         errors: str
             "ignore" or "raise" (or "warn"
 
@@ -315,6 +331,9 @@ def check_localftp(path, errors: str = "ignore"):
         "nmdis",
     ]
 
+    if str(path).startswith(("http://", "https://")):
+        return _check_remote_localftp(path, dacs, errors=errors)
+
     # Case 1:
     check1 = (
         os.path.isdir(path)
@@ -474,6 +493,7 @@ def show_versions(file=sys.stdout):  # noqa: C901
         ("setuptools", lambda mod: mod.__version__),
         ("sphinx", lambda mod: mod.__version__),
         ("zarr", lambda mod: mod.__version__),
+        ("zstandard", lambda mod: mod.__version__),
     ]
 
     deps_blob = list()
@@ -764,31 +784,95 @@ class monitor_status:
 #
 
 
+def _linear_interpolation_batch(x, y, target):
+    """ Linear interpolation of a batch of profiles, all at once
+
+    Levels with NaN in ``x`` or ``y`` are discarded, and the remaining levels of each profile are sorted along ``x``.
+    Profiles with less than 5 valid levels are filled with NaN. Targets below (resp. above) the ``x`` range of a profile
+    are filled with the first (resp. last) valid ``y`` value of this profile.
+
+    Parameters
+    ----------
+    x: np.array
+        2-dimensional array (N_PROF, N_LEVELS) of the vertical axis of each profile
+    y: np.array
+        2-dimensional array (N_PROF, N_LEVELS) of the values to interpolate
+    target: np.array
+        1-dimensional array of the vertical axis values to interpolate to
+
+    Returns
+    -------
+    :class:`numpy.ndarray`
+        2-dimensional array (N_PROF, len(target)) of float
+    """
+    x, y = np.broadcast_arrays(np.asarray(x, dtype=float), np.asarray(y, dtype=float))
+    target = np.asarray(target, dtype=float)
+    n_levels = x.shape[-1]
+    interpolated = np.full((x.shape[0], target.size), np.nan)
+
+    # Need at least 5 points in the profile to interpolate, otherwise, return NaNs
+    valid = ~np.isnan(x) & ~np.isnan(y)
+    n_valid = valid.sum(axis=1)
+    rows = np.flatnonzero(n_valid >= 5)
+    if rows.size == 0 or target.size == 0:
+        return interpolated
+    x, y, valid, n_valid = x[rows], y[rows], valid[rows], n_valid[rows]
+    irow = np.arange(rows.size)
+
+    # Values to extend profiles beyond their range:
+    y_first = y[irow, np.argmax(valid, axis=1)]
+    y_last = y[irow, n_levels - 1 - np.argmax(valid[:, ::-1], axis=1)]
+
+    # Sort valid levels of each profile, invalid levels are pushed at the end:
+    x = np.where(valid, x, np.inf)
+    order = np.argsort(x, axis=1, kind="stable")
+    x = np.take_along_axis(x, order, axis=1)
+    y = np.take_along_axis(y, order, axis=1)
+
+    # Search sorted targets in all profiles at once: the number of levels of a profile strictly below a target is the
+    # number of levels with less targets below or equal to them, than this target index.
+    isort = np.argsort(target, kind="stable")
+    t = target[isort]
+    n_below = np.searchsorted(t, x, side="right")
+    counts = np.bincount((irow[:, np.newaxis] * (t.size + 1) + n_below).ravel(), minlength=rows.size * (t.size + 1))
+    i_hi = np.cumsum(counts.reshape(rows.size, t.size + 1), axis=1)[:, :-1]
+    i_hi = np.clip(i_hi, 1, n_valid[:, np.newaxis] - 1)
+    i_lo = i_hi - 1
+
+    x_lo, x_hi = np.take_along_axis(x, i_lo, axis=1), np.take_along_axis(x, i_hi, axis=1)
+    y_lo, y_hi = np.take_along_axis(y, i_lo, axis=1), np.take_along_axis(y, i_hi, axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        slope = (y_hi - y_lo) / (x_hi - x_lo)
+    values = slope * (t - x_lo) + y_lo
+
+    # Extend first level values toward the surface, and last level values below (or for NaN targets):
+    below = t < x[:, :1]
+    above = (t > x[irow, n_valid - 1][:, np.newaxis]) | np.isnan(t)
+    values = np.where(below, y_first[:, np.newaxis], values)
+    values = np.where(above, y_last[:, np.newaxis], values)
+
+    interpolated[np.ix_(rows, isort)] = values
+    return interpolated
+
+
 def linear_interpolation_remap(
     z, data, z_regridded, z_dim=None, z_regridded_dim="regridded", output_dim="remapped"
 ):
 
-    # interpolation called in xarray ufunc
+    # interpolation called in xarray ufunc, on all profiles at once
     def _regular_interp(x, y, target_values):
-        # remove all nans from input x and y
-        idx = np.logical_or(np.isnan(x), np.isnan(y))
-        x = x[~idx]
-        y = y[~idx]
-
-        # Need at least 5 points in the profile to interpolate, otherwise, return NaNs
-        if len(y) < 5:
-            interpolated = np.empty(len(target_values))
-            interpolated[:] = np.nan
-        else:
-            # replace nans in target_values with out of bound Values (just in case)
-            target_values = np.where(
-                ~np.isnan(target_values), target_values, np.nanmax(x) + 1
-            )
-            # Interpolate with fill value parameter to extend min pressure toward 0
-            interpolated = interpolate.interp1d(
-                x, y, bounds_error=False, fill_value=(y[0], y[-1])
-            )(target_values)
-        return interpolated
+        x, y = np.broadcast_arrays(x, y)
+        shape = x.shape[:-1]
+        x = x.reshape(-1, x.shape[-1])
+        y = y.reshape(-1, y.shape[-1])
+        target_values = np.broadcast_to(target_values, shape + target_values.shape[-1:]).reshape(
+            -1, target_values.shape[-1])
+        if np.all((target_values == target_values[0:1]) | (np.isnan(target_values) & np.isnan(target_values[0:1]))):
+            interpolated = _linear_interpolation_batch(x, y, target_values[0])
+        else:  # Different target values for each profile
+            interpolated = np.concatenate([_linear_interpolation_batch(x[i:i + 1], y[i:i + 1], target_values[i])
+                                           for i in range(x.shape[0])])
+        return interpolated.reshape(shape + interpolated.shape[-1:]).astype(y.dtype)
 
     # infer dim from input
     if z_dim is None:
@@ -807,7 +891,6 @@ def linear_interpolation_remap(
         kwargs = dict(
             input_core_dims=[[dim], [dim], [z_regridded_dim]],
             output_core_dims=[[output_dim]],
-            vectorize=True,
             dask="parallelized",
             output_dtypes=[data.dtype],
             dask_gufunc_kwargs={'output_sizes': {output_dim: len(z_regridded[z_regridded_dim])}},
@@ -816,7 +899,6 @@ def linear_interpolation_remap(
         kwargs = dict(
             input_core_dims=[[dim], [dim], [z_regridded_dim]],
             output_core_dims=[[output_dim]],
-            vectorize=True,
             dask="parallelized",
             output_dtypes=[data.dtype],
             output_sizes={output_dim: len(z_regridded[z_regridded_dim])},
@@ -1442,6 +1524,33 @@ def toYearFraction(this_date: pd._libs.tslibs.timestamps.Timestamp = pd.to_datet
     return this_date.year + fraction
 
 
+def _year_fraction_batch(dates):
+    """ Compute decimal years of an array of timestamps, all at once
+
+    Vectorized version of :func:`toYearFraction`, for timezone-naive timestamps. NaT are returned as NaN.
+
+    Parameters
+    ----------
+    dates: np.array
+        Array of ``datetime64`` values
+
+    Returns
+    -------
+    :class:`numpy.ndarray`
+        Array of float, with the shape of ``dates``
+    """
+    dates = np.asarray(dates, dtype="datetime64[ns]")
+    year = dates.astype("datetime64[Y]")
+    startOfThisYear = year.astype("datetime64[ns]")
+    yearDuration_sec = (year + 1).astype("datetime64[ns]") - startOfThisYear
+    yearElapsed_sec = dates - startOfThisYear
+    # Same float seconds as pandas Timedelta.total_seconds():
+    fraction = (yearElapsed_sec.astype(np.int64) / 1e9) / (yearDuration_sec.astype(np.int64) / 1e9)
+    fraction = np.round(fraction, 10)
+    decimal_year = year.astype(np.int64) + 1970 + fraction
+    return np.where(np.isnat(dates), np.nan, decimal_year)
+
+
 def YearFraction_to_datetime(yf: float):
     """ Compute datetime from year fraction
 
@@ -1548,54 +1657,102 @@ def wmo2box(wmo_id: int):
     return box
 
 
-def groupby_remap(z, data, z_regridded, z_dim=None, z_regridded_dim="regridded", output_dim="remapped", select='deep', right=False):
-    """ todo: Need a docstring here !"""
+def _groupby_remap_batch(x, y, bins, select="deep", right=False):
+    """ Sub-sample a batch of profiles on bins, all at once
 
-    # sub-sampling called in xarray ufunc
-    def _subsample_bins(x, y, target_values):
-        # remove all nans from input x and y
-        idx = np.logical_or(np.isnan(x), np.isnan(y))
-        x = x[~idx]
-        y = y[~idx]
-
-        ifound = np.digitize(x, target_values, right=right)  # ``bins[i-1] <= x < bins[i]``
-        ifound -= 1  # Because digitize returns a 1-based indexing, we need to remove 1
-        y_binned = np.ones_like(target_values) * np.nan
-
-        for ib, this_ibin in enumerate(np.unique(ifound)):
-            ix = np.where(ifound == this_ibin)
-            iselect = ix[-1]
-
-            # Map to y value at specific x index in the bin:
-            if select == 'shallow':
-                iselect = iselect[0]  # min/shallow
-                mapped_value = y[iselect]
-            elif select == 'deep':
-                iselect = iselect[-1]  # max/deep
-                mapped_value = y[iselect]
-            elif select == 'middle':
-                iselect = iselect[np.where(x[iselect] >= np.median(x[iselect]))[0][0]]  # median/middle
-                mapped_value = y[iselect]
-            elif select == 'random':
-                iselect = iselect[np.random.randint(len(iselect))]
-                mapped_value = y[iselect]
-
-            # or Map to y statistics in the bin:
-            elif select == 'mean':
-                mapped_value = np.nanmean(y[iselect])
-            elif select == 'min':
-                mapped_value = np.nanmin(y[iselect])
-            elif select == 'max':
-                mapped_value = np.nanmax(y[iselect])
-            elif select == 'median':
-                mapped_value = np.median(y[iselect])
+    Levels with NaN in ``x`` or ``y`` are discarded, and so are levels with ``x`` below the first bin. The remaining
+    levels are located in bins with :func:`numpy.digitize` and grouped by profile and bin, in their original order.
+    Each group is then reduced to a single value, with segmented reductions over the sorted groups.
+
+    Parameters
+    ----------
+    x: np.array
+        2-dimensional array (N_PROF, N_LEVELS) of the vertical axis of each profile
+    y: np.array
+        2-dimensional array (N_PROF, N_LEVELS) of the values to sub-sample
+    bins: np.array
+        1-dimensional and monotonic array of bins
+    select: {'deep','shallow','middle','random','min','max','mean','median'}, default: 'deep'
+        The value selection method for bins, see :meth:`argopy.xarray.ArgoAccessor.groupby_pressure_bins`
+    right: bool, default: False
+        Indicating whether the bin intervals include the right or the left bin edge.
+
+    Returns
+    -------
+    :class:`numpy.ndarray`
+        2-dimensional array (N_PROF, len(bins)) of float, with NaN for bins without data
+    """
+    if select not in ["shallow", "deep", "middle", "random", "mean", "min", "max", "median"]:
+        raise InvalidOption("`select` option has invalid value (%s)" % select)
+    x, y = np.broadcast_arrays(np.asarray(x, dtype=float), np.asarray(y, dtype=float))
+    bins = np.asarray(bins)
+    n_bins = len(bins)
+    binned = np.full((x.shape[0], n_bins), np.nan)
+
+    # Locate valid levels in bins, ``bins[i-1] <= x < bins[i]``:
+    valid = ~np.isnan(x) & ~np.isnan(y)
+    ibin = np.digitize(x, bins, right=right) - 1  # Because digitize returns a 1-based indexing, we need to remove 1
+    valid &= ibin >= 0
+    irow, ilevel = np.nonzero(valid)
+    if irow.size == 0:
+        return binned
+
+    # Group levels by profile and bin, keeping their original order within each group:
+    key = irow * n_bins + ibin[irow, ilevel]
+    order = np.argsort(key, kind="stable")
+    key, xg, yg = key[order], x[irow, ilevel][order], y[irow, ilevel][order]
+    groups, start, count = np.unique(key, return_index=True, return_counts=True)
+
+    binned[groups // n_bins, groups % n_bins] = _groupby_reduce(xg, yg, key, start, count, select)
+    return binned
+
+
+def _groupby_median(values, key, start, count):
+    """ Median of values of each group of levels sorted by ``key``, starting at ``start`` with ``count`` levels """
+    ranked = values[np.lexsort((values, key))]
+    return (ranked[start + (count - 1) // 2] + ranked[start + count // 2]) / 2
 
-            else:
-                raise InvalidOption("`select` option has invalid value (%s)" % select)
 
-            y_binned[this_ibin] = mapped_value
+def _groupby_reduce(xg, yg, key, start, count, select):
+    """ Reduce each group of levels sorted by ``key``, starting at ``start`` with ``count`` levels, to a single value
 
-        return y_binned
+    See :func:`_groupby_remap_batch`
+    """
+    # Map to y value at specific x index in the bin:
+    if select == "shallow":
+        mapped = yg[start]
+    elif select == "deep":
+        mapped = yg[start + count - 1]
+    elif select == "middle":
+        # First level of the bin with x larger than the median:
+        above = xg >= np.repeat(_groupby_median(xg, key, start, count), count)
+        position = np.where(above, np.arange(len(xg)), len(xg))
+        mapped = yg[np.minimum.reduceat(position, start)]
+    elif select == "random":
+        mapped = yg[start + np.random.randint(0, count)]
+
+    # or Map to y statistics in the bin:
+    elif select == "mean":
+        mapped = np.add.reduceat(yg, start) / count
+    elif select == "min":
+        mapped = np.minimum.reduceat(yg, start)
+    elif select == "max":
+        mapped = np.maximum.reduceat(yg, start)
+    elif select == "median":
+        mapped = _groupby_median(yg, key, start, count)
+    return mapped
+
+
+def groupby_remap(z, data, z_regridded, z_dim=None, z_regridded_dim="regridded", output_dim="remapped", select='deep', right=False):
+    """ todo: Need a docstring here !"""
+
+    # sub-sampling called in xarray ufunc, on all profiles at once
+    def _subsample_bins(x, y, target_values):
+        x, y = np.broadcast_arrays(x, y)
+        shape = x.shape[:-1]
+        binned = _groupby_remap_batch(x.reshape(-1, x.shape[-1]), y.reshape(-1, y.shape[-1]),
+                                      target_values.ravel()[-target_values.shape[-1]:], select=select, right=right)
+        return binned.reshape(shape + binned.shape[-1:]).astype(y.dtype)
 
     # infer dim from input
     if z_dim is None:
@@ -1614,7 +1771,6 @@ def groupby_remap(z, data, z_regridded, z_dim=None, z_regridded_dim="regridded",
         kwargs = dict(
             input_core_dims=[[dim], [dim], [z_regridded_dim]],
             output_core_dims=[[output_dim]],
-            vectorize=True,
             dask="parallelized",
             output_dtypes=[data.dtype],
             dask_gufunc_kwargs={'output_sizes': {output_dim: len(z_regridded[z_regridded_dim])}},
@@ -1623,7 +1779,6 @@ def groupby_remap(z, data, z_regridded, z_dim=None, z_regridded_dim="regridded",
         kwargs = dict(
             input_core_dims=[[dim], [dim], [z_regridded_dim]],
             output_core_dims=[[output_dim]],
-            vectorize=True,
             dask="parallelized",
             output_dtypes=[data.dtype],
             output_sizes={output_dim: len(z_regridded[z_regridded_dim])},
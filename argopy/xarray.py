@@ -1,12 +1,14 @@
 import os
 import sys
 import warnings
+import concurrent.futures
 
 import numpy as np
 import pandas as pd
 import xarray as xr
 from sklearn import preprocessing
 import logging
+from functools import lru_cache
 
 try:
     import gsw
@@ -16,17 +18,349 @@ except ModuleNotFoundError:
     with_gsw = False
 
 from argopy.utilities import (
-    linear_interpolation_remap,
+    _linear_interpolation_batch,
     is_list_equal,
     is_list_of_strings,
-    toYearFraction,
-    groupby_remap
+    _year_fraction_batch,
+    _groupby_remap_batch,
 )
-from argopy.errors import InvalidDatasetStructure, DataNotFound, OptionValueError
+from argopy.errors import InvalidDatasetStructure, DataNotFound, OptionValueError, InvalidMethod
+from argopy.instrumentation import instrumented
 
 
 log = logging.getLogger("argopy.xarray")
 
+# Variables types according to Argo, used by ArgoAccessor.cast_types:
+_CAST_STR = frozenset([
+    "PLATFORM_NUMBER",
+    "DATA_MODE",
+    "DIRECTION",
+    "DATA_CENTRE",
+    "DATA_TYPE",
+    "FORMAT_VERSION",
+    "HANDBOOK_VERSION",
+    "PROJECT_NAME",
+    "PI_NAME",
+    "STATION_PARAMETERS",
+    "DATA_CENTER",
+    "DC_REFERENCE",
+    "DATA_STATE_INDICATOR",
+    "PLATFORM_TYPE",
+    "FIRMWARE_VERSION",
+    "POSITIONING_SYSTEM",
+    "PROFILE_PRES_QC",
+    "PROFILE_PSAL_QC",
+    "PROFILE_TEMP_QC",
+    "PARAMETER",
+    "SCIENTIFIC_CALIB_EQUATION",
+    "SCIENTIFIC_CALIB_COEFFICIENT",
+    "SCIENTIFIC_CALIB_COMMENT",
+    "HISTORY_INSTITUTION",
+    "HISTORY_STEP",
+    "HISTORY_SOFTWARE",
+    "HISTORY_SOFTWARE_RELEASE",
+    "HISTORY_REFERENCE",
+    "HISTORY_QCTEST",
+    "HISTORY_ACTION",
+    "HISTORY_PARAMETER",
+    "VERTICAL_SAMPLING_SCHEME",
+    "FLOAT_SERIAL_NO",
+])
+_CAST_INT = frozenset([
+    "PLATFORM_NUMBER",
+    "WMO_INST_TYPE",
+    "CYCLE_NUMBER",
+    "CONFIG_MISSION_NUMBER",
+])
+_CAST_DATETIME = frozenset([
+    "REFERENCE_DATE_TIME",
+    "DATE_CREATION",
+    "DATE_UPDATE",
+    "JULD",
+    "JULD_LOCATION",
+    "SCIENTIFIC_CALIB_DATE",
+    "HISTORY_DATE",
+    "TIME"
+])
+
+# QC flags value of the first character code of a flag, -1 for invalid flags:
+_QC_LOOKUP = np.full(256, -1, dtype=np.int8)
+_QC_LOOKUP[[ord(str(i)) for i in range(10)]] = np.arange(10)
+_QC_LOOKUP[[0, ord(" "), ord("n")]] = 0  # '', ' ' or 'nan' (this should not happen, but still ! That's real world data)
+
+
+@lru_cache(maxsize=None)
+def _cast_plan(name: str, dtype: np.dtype) -> tuple:
+    """ Return the sequence of casting steps of a variable, given its name and dtype
+
+    Steps are: ``str``, ``int``, ``datetime`` (object dates) and ``qc`` (QC flags into integers). An empty plan means
+    that the variable already has the appropriate type.
+    """
+    plan = []
+    is_object = dtype == "O"
+    if name in _CAST_STR and is_object:
+        plan.append("str")
+    if name in _CAST_INT and (dtype != np.dtype(int) or len(plan) > 0):
+        plan.append("int")
+    if name in _CAST_DATETIME and is_object:
+        plan.append("datetime")
+    if "QC" in name and "PROFILE" not in name and "QCTEST" not in name:
+        if is_object:
+            plan.append("str")
+        if is_object or dtype != np.dtype(int):
+            plan.append("qc")
+    return tuple(plan)
+
+
+def _fillvalue(dtype: np.dtype):
+    """ Return the fill value of a given dtype, that does not change this dtype """
+    # https://docs.scipy.org/doc/numpy/reference/generated/numpy.dtype.kind.html#numpy.dtype.kind
+    if dtype.kind == "U":
+        return " "
+    elif dtype.kind == "S":
+        return b" "
+    elif dtype.kind in ["i", "u"]:
+        return 99999
+    elif dtype.kind == "b":
+        return False
+    elif dtype.kind in ["M", "m"]:
+        return np.array("NaT", dtype=dtype)[()]
+    else:
+        return np.nan
+
+
+def _profile_points(ds: xr.Dataset) -> tuple:
+    """ Return the profile and level indices of valid points of a collection of profiles, sorted by time """
+    # Find valid points (with a pressure) in the (N_PROF, N_LEVELS) grid, without broadcasting variables on it:
+    valid = ~np.isnan(ds["PRES"].transpose("N_PROF", "N_LEVELS").values)
+    i_prof, i_level = np.nonzero(valid)
+
+    # Sort points by time, like profiles (lexsort is stable, points of a profile remain sorted by levels):
+    if "TIME" in ds.variables:
+        if ds["TIME"].dims == ("N_PROF",):
+            time = ds["TIME"].values[i_prof]
+        else:  # Time of each point
+            time = ds["TIME"].transpose("N_PROF", "N_LEVELS").values[i_prof, i_level]
+        isort = np.lexsort([time])
+        i_prof, i_level = i_prof[isort], i_level[isort]
+    return i_prof, i_level
+
+
+def _gather_points(ds: xr.Dataset, i_prof: np.ndarray, i_level: np.ndarray) -> xr.Dataset:
+    """ Gather points of each variable of a collection of profiles, profile variables are repeated along points """
+    points = {}
+    coords = {}
+    for v in ds.variables:
+        if v in ["N_PROF", "N_LEVELS"]:
+            continue
+        da = ds[v]
+        if da.dims == ("N_PROF",):
+            data = da.values[i_prof]
+        elif set(da.dims) == {"N_PROF", "N_LEVELS"}:
+            data = da.transpose("N_PROF", "N_LEVELS").values[i_prof, i_level]
+        else:
+            coords[v] = da.variable  # Coordinate without profile dimensions
+            continue
+        points[v] = xr.Variable("N_POINTS", data, attrs=da.attrs)
+    return xr.Dataset(points, coords=coords)
+
+
+def _ds2mat(this_dsp):
+    # Return a Matlab dictionary with dataset data to be used by savemat:
+    mdata = {}
+    mdata["PROFILE_NO"] = (
+        this_dsp["PROFILE_NO"].astype("uint8").values.T[np.newaxis, :]
+    )  # 1-based index in Matlab
+    mdata["DATES"] = this_dsp["DATES"].values.T[np.newaxis, :]
+    mdata["LAT"] = this_dsp["LAT"].values.T[np.newaxis, :]
+    mdata["LONG"] = this_dsp["LONG"].values.T[np.newaxis, :]
+    mdata["PRES"] = this_dsp["PRES"].values
+    mdata["TEMP"] = this_dsp["TEMP"].values
+    mdata["PTMP"] = this_dsp["PTMP"].values
+    mdata["SAL"] = this_dsp["SAL"].values
+    return mdata
+
+
+def _pretty_print_count(dd, txt):
+    # if dd.argo._type == "point":
+    #     np = len(dd['N_POINTS'].values)
+    #     nc = len(dd.argo.point2profile()['N_PROF'].values)
+    # else:
+    #     np = len(dd.argo.profile2point()['N_POINTS'].values)
+    #     nc = len(dd['N_PROF'].values)
+    out = []
+    np, nc = dd.argo.N_POINTS, dd.argo.N_PROF
+    out.append("%i points / %i profiles in dataset %s" % (np, nc, txt))
+    # np.unique(this['PSAL_QC'].values))
+    # out.append(pd.to_datetime(dd['TIME'][0].values).strftime('%Y/%m/%d %H:%M:%S'))
+    return "\n".join(out)
+
+
+def _create_one_float_source(this_one: xr.Dataset,
+                             this_path: str or os.PathLike = None,
+                             force: str = "default",
+                             select: str = 'deep',
+                             format: str = '5',
+                             do_compression: bool = True,
+                             debug_output: bool = False):
+    """ Run the entire OWC preprocessing on a given dataset with one float data
+
+    This is the worker of :meth:`ArgoAccessor.create_float_source`, defined at the module level to be pickled into a
+    pool of processes. If ``this_path`` is provided, the Matlab file is written by the worker.
+    """
+
+    # Add potential temperature:
+    if "PTEMP" not in this_one:
+        this_one = this_one.argo.teos10(vlist=["PTEMP"], inplace=True)
+
+    # Only use Ascending profiles:
+    # https://github.com/euroargodev/dm_floats/blob/c580b15202facaa0848ebe109103abe508d0dd5b/src/ow_source/create_float_source.m#L143
+    this_one = this_one.argo._where(this_one["DIRECTION"] == "A", drop=True)
+    log.debug(_pretty_print_count(this_one, "after direction selection"))
+
+    # Todo: ensure we load only the primary profile of cycles with multiple sampling schemes:
+    # https://github.com/euroargodev/dm_floats/blob/c580b15202facaa0848ebe109103abe508d0dd5b/src/ow_source/create_float_source.m#L194
+
+    # # Subsample and align vertical levels (max 1 level every 10db):
+    # https://github.com/euroargodev/dm_floats/blob/c580b15202facaa0848ebe109103abe508d0dd5b/src/ow_source/create_float_source.m#L208
+    # this_one = this_one.argo.align_std_bins(inplace=False)
+    # log.debug(_pretty_print_count(this_one, "after vertical levels subsampling"))
+
+    # Filter variables according to OWC workflow
+    # (I don't understand why this_one come at the end of the Matlab routine ...)
+    # https://github.com/euroargodev/dm_floats/blob/c580b15202facaa0848ebe109103abe508d0dd5b/src/ow_source/create_float_source.m#L258
+    this_one = this_one.argo.filter_scalib_pres(force=force, inplace=False)
+    log.debug(_pretty_print_count(this_one, "after pressure fields selection"))
+
+    # Filter along some QC:
+    # https://github.com/euroargodev/dm_floats/blob/c580b15202facaa0848ebe109103abe508d0dd5b/src/ow_source/create_float_source.m#L372
+    this_one = this_one.argo.filter_qc(
+        QC_list=[0, 1, 2], QC_fields=["TIME_QC"], drop=True
+    )  # Matlab says to reject > 3
+    # https://github.com/euroargodev/dm_floats/blob/c580b15202facaa0848ebe109103abe508d0dd5b/src/ow_source/create_float_source.m#L420
+    this_one = this_one.argo.filter_qc(
+        QC_list=[v for v in range(10) if v != 3], QC_fields=["PRES_QC"], drop=True
+    )  # Matlab says to keep != 3
+    this_one = this_one.argo.filter_qc(
+        QC_list=[v for v in range(10) if v != 4],
+        QC_fields=["PRES_QC", "TEMP_QC", "PSAL_QC"],
+        drop=True,
+        mode="any",
+    )  # Matlab says to keep != 4
+    if len(this_one["N_POINTS"]) == 0:
+        raise DataNotFound(
+            "All data have been discarded because either PSAL_QC or TEMP_QC is filled with 4 or"
+            " PRES_QC is filled with 3 or 4\n"
+            "NO SOURCE FILE WILL BE GENERATED !!!"
+        )
+    log.debug(_pretty_print_count(this_one, "after QC filter"))
+
+    # Exclude dummies
+    # https://github.com/euroargodev/dm_floats/blob/c580b15202facaa0848ebe109103abe508d0dd5b/src/ow_source/create_float_source.m#L427
+    this_one = (
+        this_one
+        .argo._where(this_one["PSAL"] <= 50, drop=True)
+        .argo._where(this_one["PSAL"] >= 0, drop=True)
+        .argo._where(this_one["PTEMP"] <= 50, drop=True)
+        .argo._where(this_one["PTEMP"] >= -10, drop=True)
+        .argo._where(this_one["PRES"] <= 6000, drop=True)
+        .argo._where(this_one["PRES"] >= 0, drop=True)
+    )
+    if len(this_one["N_POINTS"]) == 0:
+        raise DataNotFound(
+            "All data have been discarded because they are filled with values out of range\n"
+            "NO SOURCE FILE WILL BE GENERATED !!!"
+        )
+    log.debug(_pretty_print_count(this_one, "after dummy values exclusion"))
+
+    # Transform measurements to a collection of profiles for Matlab-like formation:
+    this_one = this_one.argo.point2profile()
+
+    # Subsample and align vertical levels (max 1 level every 10db):
+    # https://github.com/euroargodev/dm_floats/blob/c580b15202facaa0848ebe109103abe508d0dd5b/src/ow_source/create_float_source.m#L208
+    # https://github.com/euroargodev/dm_floats/blob/c580b15202facaa0848ebe109103abe508d0dd5b/src/ow_source/create_float_source.m#L451
+    bins = np.arange(0.0, np.max(this_one["PRES"]) + 10.0, 10.0)
+    this_one = this_one.argo.groupby_pressure_bins(bins=bins, select=select, axis='PRES')
+    log.debug(_pretty_print_count(this_one, "after vertical levels subsampling and re-alignment"))
+
+    # Compute fractional year:
+    # https://github.com/euroargodev/dm_floats/blob/c580b15202facaa0848ebe109103abe508d0dd5b/src/ow_source/create_float_source.m#L334
+    DATES = _year_fraction_batch(this_one["TIME"].values)[np.newaxis, :]
+
+    # Read measurements:
+    PRES = this_one["PRES"].values.T  # (mxn)
+    TEMP = this_one["TEMP"].values.T  # (mxn)
+    PTMP = this_one["PTEMP"].values.T  # (mxn)
+    SAL = this_one["PSAL"].values.T  # (mxn)
+    LAT = this_one["LATITUDE"].values[np.newaxis, :]
+    LONG = this_one["LONGITUDE"].values[np.newaxis, :]
+    LONG[0][np.argwhere(LONG[0] < 0)] = LONG[0][np.argwhere(LONG[0] < 0)] + 360
+    PROFILE_NO = this_one["CYCLE_NUMBER"].values[np.newaxis, :]
+
+    # Create dataset with preprocessed data:
+    this_one_dsp_processed = xr.DataArray(
+        PRES,
+        dims=["m", "n"],
+        coords={"m": np.arange(0, PRES.shape[0]), "n": np.arange(0, PRES.shape[1])},
+        name="PRES",
+    ).to_dataset(promote_attrs=False)
+    this_one_dsp_processed["TEMP"] = xr.DataArray(
+        TEMP,
+        dims=["m", "n"],
+        coords={"m": np.arange(0, TEMP.shape[0]), "n": np.arange(0, TEMP.shape[1])},
+        name="TEMP",
+    )
+    this_one_dsp_processed["PTMP"] = xr.DataArray(
+        PTMP,
+        dims=["m", "n"],
+        coords={"m": np.arange(0, PTMP.shape[0]), "n": np.arange(0, PTMP.shape[1])},
+        name="PTMP",
+    )
+    this_one_dsp_processed["SAL"] = xr.DataArray(
+        SAL,
+        dims=["m", "n"],
+        coords={"m": np.arange(0, SAL.shape[0]), "n": np.arange(0, SAL.shape[1])},
+        name="SAL",
+    )
+    this_one_dsp_processed["PROFILE_NO"] = xr.DataArray(
+        PROFILE_NO[0, :],
+        dims=["n"],
+        coords={"n": np.arange(0, PROFILE_NO.shape[1])},
+        name="PROFILE_NO",
+    )
+    this_one_dsp_processed["DATES"] = xr.DataArray(
+        DATES[0, :],
+        dims=["n"],
+        coords={"n": np.arange(0, DATES.shape[1])},
+        name="DATES",
+    )
+    this_one_dsp_processed["LAT"] = xr.DataArray(
+        LAT[0, :], dims=["n"], coords={"n": np.arange(0, LAT.shape[1])}, name="LAT"
+    )
+    this_one_dsp_processed["LONG"] = xr.DataArray(
+        LONG[0, :],
+        dims=["n"],
+        coords={"n": np.arange(0, LONG.shape[1])},
+        name="LONG",
+    )
+    this_one_dsp_processed["m"].attrs = {"long_name": "vertical levels"}
+    this_one_dsp_processed["n"].attrs = {"long_name": "profiles"}
+
+    # Create Matlab dictionary with preprocessed data (to be used by savemat):
+    mdata = _ds2mat(this_one_dsp_processed)
+
+    # Output
+    log.debug("float source data saved in: %s" % this_path)
+    if this_path is None:
+        if debug_output:
+            return mdata, this_one_dsp_processed, this_one  # For debug/devel
+        else:
+            return this_one_dsp_processed
+    else:
+        from scipy.io import savemat
+        # Validity check of the path type is delegated to savemat
+        return savemat(this_path, mdata, appendmat=False, format=format, do_compression=do_compression)
+
 
 @xr.register_dataset_accessor("argo")
 class ArgoAccessor:
@@ -180,6 +514,7 @@ class ArgoAccessor:
         else:
             self._obj.attrs["history"] = txt
 
+    @instrumented()
     def _where(self, cond, other=xr.core.dtypes.NA, drop: bool = False):
         """ where that preserve dtypes of Argo fields
 
@@ -190,176 +525,148 @@ class ArgoAccessor:
             If a callable, it must expect this object as its only parameter.
         other : scalar, DataArray or Dataset, optional
             Value to use for locations in this object where ``cond`` is False.
-            By default, these locations filled with NA.
+            By default, these locations filled with NA, or with a fill value of the variable type that can't hold NA
+            (see :func:`_fillvalue`).
         drop : bool, optional
             If True, coordinate labels that only correspond to False values of
             the condition are dropped from the result. Mutually exclusive with
             ``other``.
+
+        Notes
+        -----
+        With a boolean :class:`xarray.DataArray` condition, the dataset is not copied: selected labels are taken with
+        integer indexing and values are masked variable by variable, so that variables keep their dtypes.
         """
-        this = self._obj.copy(deep=True)
-        this = this.where(cond, other=other, drop=drop)
-        this = this.argo.cast_types()
+        this = self._obj
+        if callable(cond):
+            cond = cond(this)
+        if not isinstance(cond, xr.DataArray) or cond.dtype != bool:
+            this = this.copy(deep=True)
+            this = this.where(cond, other=other, drop=drop)
+            return this.argo.cast_types()
+        if drop and other is not xr.core.dtypes.NA:
+            raise ValueError("cannot set `other` if drop=True")
+
+        # Align condition and dataset along their shared dimensions, like xarray.Dataset.where:
+        if any([not this.indexes[d].equals(cond.indexes[d]) for d in cond.dims
+                if d in this.indexes and d in cond.indexes]):
+            this, cond = xr.align(this, cond, join="inner" if other is xr.core.dtypes.NA else "exact")
+
+        if drop:
+            # Select labels with at least one True value along each dimension of the condition:
+            indexers = {d: np.unique(i) for d, i in zip(cond.dims, np.nonzero(cond.values)) if d in this.dims}
+            this = this.isel(indexers)
+            cond = cond.isel(indexers)
+            this.attrs = dict(this.attrs)  # Do not modify attributes of the original dataset
+
+        if not drop or cond.ndim > 1 or cond.dims[0] not in this.dims:
+            # Mask values, with a fill value that does not change the variable dtype:
+            this = this.copy(deep=False)
+            for v in this.data_vars:
+                var = this.variables[v]
+                fill = other if other is not xr.core.dtypes.NA else _fillvalue(var.dtype)
+                this[v] = var.where(cond.variable, fill)
+
+        this = this.argo.cast_types()  # Only flag variables as casted, since types are preserved
         # this.argo._add_history("Modified with 'where' statement")
         return this
 
+    @instrumented()
     def cast_types(self):  # noqa: C901
         """ Make sure variables are of the appropriate types according to Argo
 
             This is hard coded, but should be retrieved from an API somewhere.
             Should be able to handle all possible variables encountered in the Argo dataset.
+
+            Variables are cast in place, following a plan that only depends on their name and dtype (see
+            :func:`_cast_plan`). Variables already cast (with a ``casted`` attribute set to 1) and of the appropriate
+            type are skipped.
         """
         ds = self._obj
 
-        list_str = [
-            "PLATFORM_NUMBER",
-            "DATA_MODE",
-            "DIRECTION",
-            "DATA_CENTRE",
-            "DATA_TYPE",
-            "FORMAT_VERSION",
-            "HANDBOOK_VERSION",
-            "PROJECT_NAME",
-            "PI_NAME",
-            "STATION_PARAMETERS",
-            "DATA_CENTER",
-            "DC_REFERENCE",
-            "DATA_STATE_INDICATOR",
-            "PLATFORM_TYPE",
-            "FIRMWARE_VERSION",
-            "POSITIONING_SYSTEM",
-            "PROFILE_PRES_QC",
-            "PROFILE_PSAL_QC",
-            "PROFILE_TEMP_QC",
-            "PARAMETER",
-            "SCIENTIFIC_CALIB_EQUATION",
-            "SCIENTIFIC_CALIB_COEFFICIENT",
-            "SCIENTIFIC_CALIB_COMMENT",
-            "HISTORY_INSTITUTION",
-            "HISTORY_STEP",
-            "HISTORY_SOFTWARE",
-            "HISTORY_SOFTWARE_RELEASE",
-            "HISTORY_REFERENCE",
-            "HISTORY_QCTEST",
-            "HISTORY_ACTION",
-            "HISTORY_PARAMETER",
-            "VERTICAL_SAMPLING_SCHEME",
-            "FLOAT_SERIAL_NO",
-        ]
-        list_int = [
-            "PLATFORM_NUMBER",
-            "WMO_INST_TYPE",
-            "WMO_INST_TYPE",
-            "CYCLE_NUMBER",
-            "CONFIG_MISSION_NUMBER",
-        ]
-        list_datetime = [
-            "REFERENCE_DATE_TIME",
-            "DATE_CREATION",
-            "DATE_UPDATE",
-            "JULD",
-            "JULD_LOCATION",
-            "SCIENTIFIC_CALIB_DATE",
-            "HISTORY_DATE",
-            "TIME"
-        ]
-
-        def cast_this(da, type):
-            """ Low-level casting of DataArray values """
+        def cast_this(var, name, type):
+            """ Low-level casting of Variable values """
             try:
-                da.values = da.values.astype(type)
-                da.attrs["casted"] = 1
+                var.values = var.values.astype(type)
+                var.attrs["casted"] = 1
             except Exception:
                 print("Oops!", sys.exc_info()[0], "occurred.")
-                print("Fail to cast: ", da.dtype, "into:", type, "for: ", da.name)
-                print("Encountered unique values:", np.unique(da))
-            return da
-
-        def cast_this_da(da):
-            """ Cast any DataArray """
-            da.attrs["casted"] = 0
-            if v in list_str and da.dtype == "O":  # Object
-                da = cast_this(da, str)
-
-            if v in list_int:  # and da.dtype == 'O':  # Object
-                da = cast_this(da, int)
-
-            if v in list_datetime and da.dtype == "O":  # Object
-                if (
-                    "conventions" in da.attrs
-                    and da.attrs["conventions"] == "YYYYMMDDHHMISS"
-                ):
-                    if da.size != 0:
-                        if len(da.dims) <= 1:
-                            val = da.astype(str).values.astype("U14")
-                            # This should not happen, but still ! That's real world data
-                            val[val == "              "] = "nan"
-                            da.values = pd.to_datetime(val, format="%Y%m%d%H%M%S")
-                        else:
-                            s = da.stack(dummy_index=da.dims)
-                            val = s.astype(str).values.astype("U14")
-                            # This should not happen, but still ! That's real world data
-                            val[val == "              "] = "nan"
-                            s.values = pd.to_datetime(val, format="%Y%m%d%H%M%S")
-                            da.values = s.unstack("dummy_index")
-                        da = cast_this(da, np.datetime64)
+                print("Fail to cast: ", var.dtype, "into:", type, "for: ", name)
+                print("Encountered unique values:", np.unique(var))
+            return var
+
+        def cast_datetime(var, name):
+            """ Cast object arrays of dates """
+            da = xr.DataArray(var)
+            if "conventions" in da.attrs and da.attrs["conventions"] == "YYYYMMDDHHMISS":
+                if da.size != 0:
+                    if len(da.dims) <= 1:
+                        val = da.astype(str).values.astype("U14")
+                        # This should not happen, but still ! That's real world data
+                        val[val == "              "] = "nan"
+                        var.values = pd.to_datetime(val, format="%Y%m%d%H%M%S")
                     else:
-                        da = cast_this(da, np.datetime64)
-
-                elif v == "SCIENTIFIC_CALIB_DATE":
-                    da = cast_this(da, str)
-                    s = da.stack(dummy_index=da.dims)
-                    s.values = pd.to_datetime(s.values, format="%Y%m%d%H%M%S")
-                    da.values = (s.unstack("dummy_index")).values
-                    da = cast_this(da, np.datetime64)
-
-            if "QC" in v and "PROFILE" not in v and "QCTEST" not in v:
-                if da.dtype == "O":  # convert object to string
-                    da = cast_this(da, str)
-
-                # Address weird string values:
-                # (replace missing or nan values by a '0' that will be cast as an integer later
-
-                if da.dtype == "<U3":  # string, len 3 because of a 'nan' somewhere
-                    ii = (
-                        da == "   "
-                    )  # This should not happen, but still ! That's real world data
-                    da = xr.where(ii, "0", da)
-
-                    ii = (
-                        da == "nan"
-                    )  # This should not happen, but still ! That's real world data
-                    da = xr.where(ii, "0", da)
-
-                    # Get back to regular U1 string
-                    da = cast_this(da, np.dtype("U1"))
-
-                if da.dtype == "<U1":  # string
-                    ii = (
-                        da == ""
-                    )  # This should not happen, but still ! That's real world data
-                    da = xr.where(ii, "0", da)
-
-                    ii = (
-                        da == " "
-                    )  # This should not happen, but still ! That's real world data
-                    da = xr.where(ii, "0", da)
-
-                    ii = (
-                        da == "n"
-                    )  # This should not happen, but still ! That's real world data
-                    da = xr.where(ii, "0", da)
-
-                # finally convert QC strings to integers:
-                da = cast_this(da, int)
-
-            if da.dtype != "O":
-                da.attrs["casted"] = 1
-
-            return da
-
-        for v in ds.variables:
+                        s = da.stack(dummy_index=da.dims)
+                        val = s.astype(str).values.astype("U14")
+                        # This should not happen, but still ! That's real world data
+                        val[val == "              "] = "nan"
+                        s.values = pd.to_datetime(val, format="%Y%m%d%H%M%S")
+                        var.values = s.unstack("dummy_index")
+                cast_this(var, name, np.datetime64)
+
+            elif name == "SCIENTIFIC_CALIB_DATE":
+                cast_this(var, name, str)
+                s = xr.DataArray(var).stack(dummy_index=var.dims)
+                s.values = pd.to_datetime(s.values, format="%Y%m%d%H%M%S")
+                var.values = (s.unstack("dummy_index")).values
+                cast_this(var, name, np.datetime64)
+
+        def cast_qc(var, name):
+            """ Cast QC flags into integers, from their first character """
+            values = var.values
+            if (values.dtype.kind == "U" and values.dtype.itemsize in [4, 12]) or values.dtype == "S1":
+                # Decode the code of the first character of each flag with a lookup table:
+                # (missing or nan values, eg: '', ' ' or 'nan', are decoded as 0. That's real world data)
+                n = values.dtype.itemsize // 4 if values.dtype.kind == "U" else 1
+                codes = np.ascontiguousarray(values).view(np.uint32 if values.dtype.kind == "U" else np.uint8)
+                codes = codes.reshape(values.shape + (n,))[..., 0]
+                flags = _QC_LOOKUP[np.minimum(codes, 255)]
+                if np.all(flags >= 0):
+                    var.values = flags.astype(int)
+                    var.attrs["casted"] = 1
+                    return var
+                if values.dtype.kind == "U":
+                    # Some flags are not digits, get back to regular U1 strings before trying to cast them:
+                    var.values = np.where(flags == 0, "0", values.astype("U1"))
+            return cast_this(var, name, int)
+
+        for v in list(ds.variables):
+            var = ds.variables[v]
+            plan = _cast_plan(v, var.dtype)
+            if len(plan) == 0 and var.attrs.get("casted", 0) == 1:
+                continue
+            is_index = isinstance(var, xr.IndexVariable)
+            if is_index and len(plan) == 0:
+                if var.dtype != "O":
+                    var.attrs["casted"] = 1  # Attributes of dimension coordinates can be modified in place
+                continue
+            if is_index:
+                var = var.to_base_variable()  # Values of dimension coordinates can't be modified in place
             try:
-                ds[v] = cast_this_da(ds[v])
+                var.attrs["casted"] = 0
+                for step in plan:
+                    if step == "str":
+                        cast_this(var, v, str)
+                    elif step == "int":
+                        cast_this(var, v, int)
+                    elif step == "datetime":
+                        cast_datetime(var, v)
+                    elif step == "qc":
+                        cast_qc(var, v)
+                if var.dtype != "O":
+                    var.attrs["casted"] = 1
+                if is_index:
+                    ds[v] = var
             except Exception:
                 print("Oops!", sys.exc_info()[0], "occurred.")
                 print("Fail to cast: %s " % v)
@@ -419,6 +726,7 @@ class ArgoAccessor:
             cyc = -np.vectorize(int)(offset * wmo - np.abs(wmo_or_uid))
             return wmo, cyc, drc
 
+    @instrumented()
     def point2profile(self):  # noqa: C901
         """ Transform a collection of points into a collection of profiles
 
@@ -429,45 +737,25 @@ class ArgoAccessor:
             )
         this = self._obj  # Should not be modified
 
-        def fillvalue(da):
-            """ Return fillvalue for a dataarray """
-            # https://docs.scipy.org/doc/numpy/reference/generated/numpy.dtype.kind.html#numpy.dtype.kind
-            if da.dtype.kind in ["U"]:
-                fillvalue = " "
-            elif da.dtype.kind == "i":
-                fillvalue = 99999
-            elif da.dtype.kind == "M":
-                fillvalue = np.datetime64("NaT")
-            else:
-                fillvalue = np.nan
-            return fillvalue
-
-        # Find the number of profiles (N_PROF) and vertical levels (N_LEVELS):
-        dummy_argo_uid = xr.DataArray(
-            self.uid(
-                this["PLATFORM_NUMBER"].values,
-                this["CYCLE_NUMBER"].values,
-                this["DIRECTION"].values,
-            ),
-            dims="N_POINTS",
-            coords={"N_POINTS": this["N_POINTS"]},
-            name="dummy_argo_uid",
+        # Sort points by profile, in their original order within each profile:
+        argo_uid = self.uid(
+            this["PLATFORM_NUMBER"].values,
+            this["CYCLE_NUMBER"].values,
+            this["DIRECTION"].values,
         )
-        N_PROF = len(np.unique(dummy_argo_uid))
+        isort = np.argsort(argo_uid, kind="stable")
 
-        N_LEVELS = int(
-            xr.DataArray(
-                np.ones_like(this["N_POINTS"].values),
-                dims="N_POINTS",
-                coords={"N_POINTS": this["N_POINTS"]},
-            )
-            .groupby(dummy_argo_uid)
-            .sum()
-            .max()
-            .values
-        )
+        # Find the number of profiles (N_PROF) and vertical levels (N_LEVELS):
+        _, start, count = np.unique(argo_uid[isort], return_index=True, return_counts=True)
+        N_PROF = len(start)
+        N_LEVELS = int(count.max()) if N_PROF > 0 else 0
         assert N_PROF * N_LEVELS >= len(this["N_POINTS"])
 
+        # Position of each sorted point in the (N_PROF, N_LEVELS) array:
+        i_prof = np.repeat(np.arange(N_PROF), count)
+        i_level = np.arange(len(isort)) - np.repeat(start, count)
+        same_prof = i_level[1:] > 0  # True where a point is in the same profile as the previous one
+
         # Store the initial set of coordinates:
         coords_list = list(this.coords)
         this = this.reset_coords()
@@ -475,65 +763,21 @@ class ArgoAccessor:
         # For each variables, determine if it has unique value by profile,
         # if yes: the transformed variable should be [N_PROF]
         # if no: the transformed variable should be [N_PROF, N_LEVELS]
-        count = np.zeros((N_PROF, len(this.data_vars)), "int")
-        for i_prof, grp in enumerate(this.groupby(dummy_argo_uid)):
-            i_uid, prof = grp
-            for iv, vname in enumerate(this.data_vars):
-                count[i_prof, iv] = len(np.unique(prof[vname]))
-        # Variables with a unique value for each profiles:
-        list_1d = list(np.array(this.data_vars)[count.sum(axis=0) == count.shape[0]])
-        # Variables with more than 1 value for each profiles:
-        list_2d = list(np.array(this.data_vars)[count.sum(axis=0) != count.shape[0]])
-
-        # Create new empty dataset:
-        new_ds = []
-        for vname in list_2d:
-            new_ds.append(
-                xr.DataArray(
-                    np.full(
-                        (N_PROF, N_LEVELS),
-                        fillvalue(this[vname]),
-                        dtype=this[vname].dtype,
-                    ),
-                    dims=["N_PROF", "N_LEVELS"],
-                    coords={
-                        "N_PROF": np.arange(N_PROF),
-                        "N_LEVELS": np.arange(N_LEVELS),
-                    },
-                    attrs=this[vname].attrs,
-                    name=vname,
-                )
-            )
-        for vname in list_1d:
-            new_ds.append(
-                xr.DataArray(
-                    np.full((N_PROF,), fillvalue(this[vname]), dtype=this[vname].dtype),
-                    dims=["N_PROF"],
-                    coords={"N_PROF": np.arange(N_PROF)},
-                    attrs=this[vname].attrs,
-                    name=vname,
-                )
-            )
-        new_ds = xr.merge(new_ds)
-
-        # Now fill in each profile values:
-        for i_prof, grp in enumerate(this.groupby(dummy_argo_uid)):
-            i_uid, prof = grp
-            for iv, vname in enumerate(this.data_vars):
+        new_ds = {}
+        for vname in this.data_vars:
+            x = this[vname].values[isort]
+            equal = x[1:] == x[:-1]
+            if x.dtype.kind in ["f", "c", "M", "m", "O"]:
+                equal |= pd.isna(x[1:]) & pd.isna(x[:-1])  # Missing values are equal, like in np.unique
+            if np.all(equal[same_prof]):
+                # ['N_PROF', ] array:
+                new_ds[vname] = xr.Variable(["N_PROF"], x[start], attrs=this[vname].attrs)
+            else:
                 # ['N_PROF', 'N_LEVELS'] array:
-                if len(new_ds[vname].dims) == 2:
-                    y = new_ds[vname].values
-                    x = prof[vname].values
-                    try:
-                        y[i_prof, 0: len(x)] = x
-                    except Exception:
-                        print(vname, "input", x.shape, "output", y[i_prof, :].shape)
-                        raise
-                    new_ds[vname].values = y
-                else:  # ['N_PROF', ] array:
-                    y = new_ds[vname].values
-                    x = prof[vname].values
-                    y[i_prof] = np.unique(x)[0]
+                y = np.full((N_PROF, N_LEVELS), _fillvalue(x.dtype), dtype=x.dtype)
+                y[i_prof, i_level] = x
+                new_ds[vname] = xr.Variable(["N_PROF", "N_LEVELS"], y, attrs=this[vname].attrs)
+        new_ds = xr.Dataset(new_ds, coords={"N_PROF": np.arange(N_PROF), "N_LEVELS": np.arange(N_LEVELS)})
 
         # Restore coordinate variables:
         new_ds = new_ds.set_coords([c for c in coords_list if c in new_ds])
@@ -548,6 +792,7 @@ class ArgoAccessor:
         new_ds.argo._type = "profile"
         return new_ds
 
+    @instrumented()
     def profile2point(self):
         """ Convert a collection of profiles to a collection of points
 
@@ -577,17 +822,12 @@ class ArgoAccessor:
             if dims not in ["N_PROF", "N_PROF.N_LEVELS"]:
                 ds = ds.drop_vars(v)
 
-        (ds,) = xr.broadcast(ds)
-        ds = ds.stack({"N_POINTS": list(ds.dims)})
-        ds = ds.reset_index("N_POINTS").drop_vars(["N_PROF", "N_LEVELS"])
+        i_prof, i_level = _profile_points(ds)
+        ds = _gather_points(ds, i_prof, i_level)
         possible_coords = ["LATITUDE", "LONGITUDE", "TIME", "JULD", "N_POINTS"]
         for c in [c for c in possible_coords if c in ds.data_vars]:
             ds = ds.set_coords(c)
-
-        # Remove index without data (useless points)
-        ds = ds.where(~np.isnan(ds["PRES"]), drop=1)
-        ds = ds.sortby("TIME")
-        ds["N_POINTS"] = np.arange(0, len(ds["N_POINTS"]))
+        ds["N_POINTS"] = np.arange(0, len(i_prof))
         ds = ds.argo.cast_types()
         ds = ds[np.sort(ds.data_vars)]
         ds.encoding = self.encoding  # Preserve low-level encoding information
@@ -596,6 +836,7 @@ class ArgoAccessor:
         ds.argo._type = "point"
         return ds
 
+    @instrumented()
     def filter_data_mode(   # noqa: C901
         self, keep_error: bool = True, errors: str = "raise"
     ):
@@ -628,119 +869,6 @@ class ArgoAccessor:
                 "Method only available to a collection of points"
             )
 
-        #########
-        # Sub-functions
-        #########
-        def safe_where_eq(xds, key, value):
-            # xds.where(xds[key] == value, drop=True) is not safe to empty time variables, cf issue #64
-            try:
-                return xds.where(xds[key] == value, drop=True)
-            except ValueError as v:
-                if v.args[0] == (
-                    "zero-size array to reduction operation "
-                    "minimum which has no identity"
-                ):
-                    # A bug in xarray will cause a ValueError if trying to
-                    # decode the times in a NetCDF file with length 0.
-                    # See:
-                    # https://github.com/pydata/xarray/issues/1329
-                    # https://github.com/euroargodev/argopy/issues/64
-                    # Here, we just need to return an empty array
-                    TIME = xds["TIME"]
-                    xds = xds.drop_vars("TIME")
-                    xds = xds.where(xds[key] == value, drop=True)
-                    xds["TIME"] = xr.DataArray(
-                        np.arange(len(xds["N_POINTS"])),
-                        dims="N_POINTS",
-                        attrs=TIME.attrs,
-                    ).astype(np.datetime64)
-                    xds = xds.set_coords("TIME")
-                    return xds
-
-        def ds_split_datamode(xds):
-            """ Create one dataset for each of the data_mode
-
-                Split full dataset into 3 datasets
-            """
-            # Real-time:
-            argo_r = safe_where_eq(xds, "DATA_MODE", "R")
-            for v in plist:
-                vname = v.upper() + "_ADJUSTED"
-                if vname in argo_r:
-                    argo_r = argo_r.drop_vars(vname)
-                vname = v.upper() + "_ADJUSTED_QC"
-                if vname in argo_r:
-                    argo_r = argo_r.drop_vars(vname)
-                vname = v.upper() + "_ADJUSTED_ERROR"
-                if vname in argo_r:
-                    argo_r = argo_r.drop_vars(vname)
-            # Real-time adjusted:
-            argo_a = safe_where_eq(xds, "DATA_MODE", "A")
-            for v in plist:
-                vname = v.upper()
-                if vname in argo_a:
-                    argo_a = argo_a.drop_vars(vname)
-                vname = v.upper() + "_QC"
-                if vname in argo_a:
-                    argo_a = argo_a.drop_vars(vname)
-            # Delayed mode:
-            argo_d = safe_where_eq(xds, "DATA_MODE", "D")
-
-            return argo_r, argo_a, argo_d
-
-        def fill_adjusted_nan(this_ds, vname):
-            """Fill in the adjusted field with the non-adjusted wherever it is NaN
-
-               Ensure to have values even for bad QC data in delayed mode
-            """
-            ii = this_ds.where(np.isnan(this_ds[vname + "_ADJUSTED"]), drop=1)[
-                "N_POINTS"
-            ]
-            this_ds[vname + "_ADJUSTED"].loc[dict(N_POINTS=ii)] = this_ds[vname].loc[
-                dict(N_POINTS=ii)
-            ]
-            return this_ds
-
-        def merge_arrays(this_argo_r, this_argo_a, this_argo_d, this_vname):
-            """ Merge one variable from 3 DataArrays
-
-                Based on xarray merge function with ’no_conflicts’: only values
-                which are not null in all datasets must be equal. The returned
-                dataset then contains the combination of all non-null values.
-
-                Return a xarray.DataArray
-            """
-
-            def merge_this(a1, a2, a3):
-                return xr.merge((xr.merge((a1, a2)), a3))
-
-            DA = merge_this(
-                this_argo_r[this_vname],
-                this_argo_a[this_vname + "_ADJUSTED"].rename(this_vname),
-                this_argo_d[this_vname + "_ADJUSTED"].rename(this_vname),
-            )
-            DA_QC = merge_this(
-                this_argo_r[this_vname + "_QC"],
-                this_argo_a[this_vname + "_ADJUSTED_QC"].rename(this_vname + "_QC"),
-                this_argo_d[this_vname + "_ADJUSTED_QC"].rename(this_vname + "_QC"),
-            )
-
-            if keep_error:
-                DA_ERROR = xr.merge(
-                    (
-                        this_argo_a[this_vname + "_ADJUSTED_ERROR"].rename(
-                            this_vname + "_ERROR"
-                        ),
-                        this_argo_d[this_vname + "_ADJUSTED_ERROR"].rename(
-                            this_vname + "_ERROR"
-                        ),
-                    )
-                )
-                DA = merge_this(DA, DA_QC, DA_ERROR)
-            else:
-                DA = xr.merge((DA, DA_QC))
-            return DA
-
         #########
         # filter
         #########
@@ -770,36 +898,35 @@ class ArgoAccessor:
         ]
         plist = [p for p in possible_list if p in ds.data_vars]
 
-        # Create one dataset for each of the data_mode:
-        argo_r, argo_a, argo_d = ds_split_datamode(ds)
+        # Points are selected with the data mode, once for all parameters:
+        if not ds.indexes["N_POINTS"].is_monotonic_increasing:
+            ds = ds.sortby("N_POINTS")
+        data_mode = ds["DATA_MODE"].values
+        is_r, is_a, is_d = data_mode == "R", data_mode == "A", data_mode == "D"
+        is_valid = np.all(is_r | is_a | is_d)
 
-        # Fill in the adjusted field with the non-adjusted wherever it is NaN
-        for v in plist:
-            argo_d = fill_adjusted_nan(argo_d, v.upper())
+        def select(r, a, d):
+            """ Pick values of each point according to its data mode, NaN for unknown data modes """
+            d = d if is_valid else np.where(is_d, d, np.nan)
+            return np.where(is_r, r, np.where(is_a, a, d))
+
+        # Keep all variables but the adjusted ones, without copying data:
+        final = ds.drop_vars([v for v in ds.data_vars if "ADJUSTED" in v]).copy(deep=False)
 
-        # Drop QC fields in delayed mode dataset:
         for v in plist:
-            vname = v.upper()
-            if vname in argo_d:
-                argo_d = argo_d.drop_vars(vname)
-            vname = v.upper() + "_QC"
-            if vname in argo_d:
-                argo_d = argo_d.drop_vars(vname)
-
-        # Create new arrays with the appropriate variables:
-        vlist = [merge_arrays(argo_r, argo_a, argo_d, v) for v in plist]
-
-        # Create final dataset by merging all available variables
-        final = xr.merge(vlist)
-
-        # Merge with all other variables:
-        other_variables = list(
-            set([v for v in list(ds.data_vars) if "ADJUSTED" not in v])
-            - set(list(final.data_vars))
-        )
-        # other_variables.remove('DATA_MODE')  # Not necessary anymore
-        for p in other_variables:
-            final = xr.merge((final, ds[p]))
+            # For data mode 'R': keep <PARAM>, for 'A': keep <PARAM_ADJUSTED>, for 'D': keep <PARAM_ADJUSTED> filled in
+            # with <PARAM> wherever it is NaN, to ensure to have values even for bad QC data in delayed mode:
+            raw, adjusted = ds[v].values, ds[v + "_ADJUSTED"].values
+            values = select(raw, adjusted, np.where(np.isnan(adjusted), raw, adjusted))
+            final[v] = xr.Variable(ds[v].dims, values, attrs=ds[v].attrs)
+
+            qc, adjusted_qc = ds[v + "_QC"].values, ds[v + "_ADJUSTED_QC"].values
+            final[v + "_QC"] = xr.Variable(ds[v].dims, select(qc, adjusted_qc, adjusted_qc), attrs=ds[v + "_QC"].attrs)
+
+            if keep_error:
+                error = ds[v + "_ADJUSTED_ERROR"]
+                values = np.where(is_a | is_d, error.values, np.nan)  # No errors in real-time
+                final[v + "_ERROR"] = xr.Variable(error.dims, values, attrs=error.attrs)
 
         final.attrs = ds.attrs
         final.argo._add_history("Variables filtered according to DATA_MODE")
@@ -810,6 +937,7 @@ class ArgoAccessor:
 
         return final
 
+    @instrumented()
     def filter_qc(   # noqa: C901
         self, QC_list=[1, 2], QC_fields="all", drop=True, mode="all", mask=False
     ):
@@ -880,32 +1008,25 @@ class ArgoAccessor:
         )
         # log.debug("filter_qc: Filter applied to '%s' of the fields: %s" % (mode, ",".join(QC_fields)))
 
-        QC_fields = this[QC_fields]
-        for v in QC_fields.data_vars:
-            QC_fields[v] = QC_fields[v].astype(int)
-
-        # Now apply filter
-        this_mask = xr.DataArray(
-            np.zeros_like(QC_fields["N_POINTS"]),
-            dims=["N_POINTS"],
-            coords={"N_POINTS": QC_fields["N_POINTS"]},
-        )
-        for v in QC_fields.data_vars:
-            for qc_value in QC_list:
-                this_mask += QC_fields[v] == qc_value
-        if mode == "all":
-            this_mask = this_mask == len(QC_fields)  # all
-        else:
-            this_mask = this_mask >= 1  # any
+        # Now apply filter, field by field:
+        QC_list = np.unique(QC_list)
+        this_mask = np.full((len(this["N_POINTS"]),), mode == "all")
+        for v in QC_fields:
+            match = np.isin(this[v].values.astype(int, copy=False), QC_list)
+            if mode == "all":
+                this_mask &= match
+            else:
+                this_mask |= match
+        this_mask = xr.DataArray(this_mask, dims=["N_POINTS"], coords=this.coords)
 
         if not mask:
             this = this.argo._where(this_mask, drop=drop)
             this.argo._add_history("Variables selected according to QC")
-            # this = this.argo.cast_types()
             return this
         else:
             return this_mask
 
+    @instrumented()
     def filter_scalib_pres(self, force: str = "default", inplace: bool = True):
         """ Filter variables according to OWC salinity calibration software requirements
 
@@ -1002,6 +1123,7 @@ class ArgoAccessor:
         else:
             return this
 
+    @instrumented()
     def interp_std_levels(self,
                           std_lev: list or np.array,
                           axis: str = 'PRES'):
@@ -1050,7 +1172,7 @@ class ArgoAccessor:
         # Selecting profiles that have a max(pressure) > max(std_lev) to avoid extrapolation in that direction
         # For levels < min(pressure), first level values of the profile are extended to surface.
         i1 = this_dsp[axis].max("N_LEVELS") >= std_lev[-1]
-        this_dsp = this_dsp.where(i1, drop=True)
+        this_dsp = this_dsp.argo._where(i1, drop=True)
 
         # check if any profile is left, ie if any profile match the requested depth
         if len(this_dsp["N_PROF"]) == 0:
@@ -1059,9 +1181,6 @@ class ArgoAccessor:
             )
             return None
 
-        # add new vertical dimensions, this has to be in the datasets to apply ufunc later
-        this_dsp["Z_LEVELS"] = xr.DataArray(std_lev, dims={"Z_LEVELS": std_lev})
-
         # init
         ds_out = xr.Dataset()
 
@@ -1085,15 +1204,18 @@ class ArgoAccessor:
             and "ERROR" not in dv
         ]
 
-        for dv in datavars:
-            ds_out[dv] = linear_interpolation_remap(
-                this_dsp[axis],
-                this_dsp[dv],
-                this_dsp["Z_LEVELS"],
-                z_dim="N_LEVELS",
-                z_regridded_dim="Z_LEVELS",
+        # Interpolate all variables of all profiles at once:
+        z = this_dsp[axis].transpose("N_PROF", "N_LEVELS").values
+        y = np.stack([this_dsp[dv].transpose("N_PROF", "N_LEVELS").values for dv in datavars])
+        interpolated = _linear_interpolation_batch(
+            np.broadcast_to(z, y.shape).reshape(-1, z.shape[-1]), y.reshape(-1, z.shape[-1]), std_lev
+        ).reshape(y.shape[0:2] + (len(std_lev),))
+        for iv, dv in enumerate(datavars):
+            ds_out[dv] = xr.DataArray(
+                interpolated[iv].astype(this_dsp[dv].dtype),
+                dims=["N_PROF", "%s_INTERPOLATED" % axis],
+                coords={"%s_INTERPOLATED" % axis: std_lev},
             )
-        ds_out = ds_out.rename({"remapped": "%s_INTERPOLATED" % axis})
 
         for sv in solovars:
             ds_out[sv] = this_dsp[sv]
@@ -1101,7 +1223,7 @@ class ArgoAccessor:
         for co in coords:
             ds_out.coords[co] = this_dsp[co]
 
-        ds_out = ds_out.drop_vars(["N_LEVELS", "Z_LEVELS"])
+        ds_out = ds_out.drop_vars(["N_LEVELS"])
         ds_out = ds_out[np.sort(ds_out.data_vars)]
         ds_out = ds_out.argo.cast_types()
         ds_out.attrs = self.attrs  # Preserve original attributes
@@ -1112,6 +1234,7 @@ class ArgoAccessor:
 
         return ds_out
 
+    @instrumented()
     def groupby_pressure_bins(self,  # noqa: C901
                               bins: list or np.array,
                               axis: str = 'PRES',
@@ -1184,7 +1307,7 @@ class ArgoAccessor:
             to_point = True
             this_dsp = this_ds.argo.point2profile()
         else:
-            this_dsp = this_ds.copy(deep=True)
+            this_dsp = this_ds
 
         # Adjust bins axis if we possibly have to squeeze empty bins:
         h, bin_edges = np.histogram(np.unique(np.round(this_dsp[axis], 1)), bins)
@@ -1200,30 +1323,29 @@ class ArgoAccessor:
                 "bins axis was squeezed to full bins only (%i bins found empty out of %i)" % (N_bins_empty, len(bins)))
             bins = bins[np.where(h > 0)]
 
-        def replace_i_level_values(this_da, this_i_level, new_values_along_profiles):
-            """ Convenience fct to update only one level of a ["N_PROF", "N_LEVELS"] xr.DataArray"""
-            if this_da.dims == ("N_PROF", "N_LEVELS"):
-                values = this_da.values
-                values[:, this_i_level] = new_values_along_profiles
-                this_da.values = values
-            # else:
-            #     raise ValueError("Array not with expected ['N_PROF', 'N_LEVELS'] shape")
-            return this_da
-
-        def nanmerge(x, y):
-            """ Merge two 1D array
-
-                Given 2 arrays x, y of 1 dimension, return a new array with:
-                - x values where x is not NaN
-                - y values where x is NaN
-            """
-            z = x.copy()
-            for i, v in enumerate(x):
-                if np.isnan(v):
-                    z[i] = y[i]
-            return z
+        def merged_levels(this_ds: xr.Dataset, merge: np.array, values: np.array) -> xr.Dataset:
+            """ Remove levels below merged levels, and set merged values of the pressure axis
 
-        merged_is_nan = lambda l1, l2: len(np.unique(np.where(np.isnan(l1.values + l2.values)))) == len(l1)  # noqa: E731
+            Parameters
+            ----------
+            this_ds: :class:`xarray.Dataset`
+            merge: np.array
+                Boolean array (N_LEVELS - 1), True for each level to be merged with the level below.
+            values: np.array
+                Merged values of the pressure axis (N_PROF, N_LEVELS - 1)
+
+            Returns
+            -------
+            :class:`xarray.Dataset`
+            """
+            z = this_ds[axis].values.copy()
+            z[:, :-1] = np.where(merge, values, z[:, :-1])
+            ikeep = np.flatnonzero(~np.concatenate(([False], merge[:-1])))  # The last level is also dropped
+            new_ds = this_ds.isel(N_LEVELS=ikeep)
+            new_ds = new_ds.assign_coords({'N_LEVELS': np.arange(0, len(new_ds['N_LEVELS']))})
+            val = z[:, ikeep]
+            new_ds[axis].values = np.where(val == 0, np.nan, val)
+            return new_ds
 
         def merge_bin_matching_levels(this_ds: xr.Dataset) -> xr.Dataset:
             """ Levels merger of type 'bins' value
@@ -1242,26 +1364,17 @@ class ArgoAccessor:
             -------
             :class:`xarray.Dataset`
             """
-            new_ds = this_ds.copy(deep=True)
-            N_LEVELS = new_ds.argo.N_LEVELS
-            idel = []
-            for i_level in range(0, N_LEVELS - 1 - 1):
-                this_ds_level = this_ds[axis].isel(N_LEVELS=i_level)
-                this_ds_dw = this_ds[axis].isel(N_LEVELS=i_level + 1)
-                pres_dw = np.unique(this_ds_dw[~np.isnan(this_ds_dw)])
-                if len(pres_dw) == 1 \
-                        and pres_dw[0] in this_ds["STD_%s_BINS" % axis] \
-                        and merged_is_nan(this_ds_level, this_ds_dw):
-                    new_values = nanmerge(this_ds_dw.values, this_ds_level.values)
-                    replace_i_level_values(new_ds[axis], i_level, new_values)
-                    idel.append(i_level + 1)
-
-            ikeep = [i for i in np.arange(0, new_ds.argo.N_LEVELS - 1) if i not in idel]
-            new_ds = new_ds.isel(N_LEVELS=ikeep)
-            new_ds = new_ds.assign_coords({'N_LEVELS': np.arange(0, len(new_ds['N_LEVELS']))})
-            val = new_ds[axis].values
-            new_ds[axis].values = np.where(val == 0, np.nan, val)
-            return new_ds
+            z = this_ds[axis].values
+            z_level, z_dw = z[:, :-1], z[:, 1:]
+            # Levels below with a single pressure value, that is a bin value:
+            is_valid = ~np.isnan(z_dw)
+            z_min = np.where(is_valid, z_dw, np.inf).min(axis=0)
+            z_max = np.where(is_valid, z_dw, -np.inf).max(axis=0)
+            single = is_valid.any(axis=0) & (z_min == z_max) & np.isin(z_min, this_ds["STD_%s_BINS" % axis].values)
+            # and without values at the same profiles than the level above:
+            merge = single & np.all(np.isnan(z_level + z_dw), axis=0)
+            merge[-1:] = False  # The last pair of levels is not merged
+            return merged_levels(this_ds, merge, np.where(np.isnan(z_dw), z_level, z_dw))
 
         def merge_all_matching_levels(this_ds: xr.Dataset) -> xr.Dataset:
             """ Levels merger
@@ -1282,30 +1395,10 @@ class ArgoAccessor:
             -------
             :class:`xarray.Dataset`
             """
-            new_ds = this_ds.copy(deep=True)
-            N_LEVELS = new_ds.argo.N_LEVELS
-            idel = []
-            for i_level in range(0, N_LEVELS):
-                if i_level + 1 < N_LEVELS:
-                    this_ds_level = this_ds[axis].isel(N_LEVELS=i_level)
-                    this_ds_dw = this_ds[axis].isel(N_LEVELS=i_level + 1)
-                    if merged_is_nan(this_ds_level, this_ds_dw):
-                        new_values = nanmerge(this_ds_level.values, this_ds_dw.values)
-                        replace_i_level_values(new_ds[axis], i_level, new_values)
-                        idel.append(i_level + 1)
-
-            ikeep = [i for i in np.arange(0, new_ds.argo.N_LEVELS - 1) if i not in idel]
-            new_ds = new_ds.isel(N_LEVELS=ikeep)
-            new_ds = new_ds.assign_coords({'N_LEVELS': np.arange(0, len(new_ds['N_LEVELS']))})
-            val = new_ds[axis].values
-            new_ds[axis].values = np.where(val == 0, np.nan, val)
-            return new_ds
-
-        # init
-        new_ds = []
-
-        # add new vertical dimensions, this has to be in the datasets to apply ufunc later
-        this_dsp["Z_LEVELS"] = xr.DataArray(bins, dims={"Z_LEVELS": bins})
+            z = this_ds[axis].values
+            z_level, z_dw = z[:, :-1], z[:, 1:]
+            merge = np.all(np.isnan(z_level + z_dw), axis=0)
+            return merged_levels(this_ds, merge, np.where(np.isnan(z_level), z_dw, z_level))
 
         # vars to align
         if select in ["shallow", "deep", "middle", "random"]:
@@ -1331,20 +1424,23 @@ class ArgoAccessor:
             and dv not in this_dsp.coords
         ]
 
-        # Sub-sample and align:
-        for dv in datavars:
-            v = groupby_remap(
-                this_dsp[axis],
-                this_dsp[dv],
-                this_dsp["Z_LEVELS"],
-                z_dim="N_LEVELS",
-                z_regridded_dim="Z_LEVELS",
-                select=select,
-                right=right
-            )
-            v.name = this_dsp[dv].name
-            v.attrs = this_dsp[dv].attrs
-            new_ds.append(v)
+        # Sub-sample and align all variables of all profiles at once:
+        z = this_dsp[axis].transpose("N_PROF", "N_LEVELS").values
+        y = np.stack([this_dsp[dv].transpose("N_PROF", "N_LEVELS").values for dv in datavars])
+        binned = _groupby_remap_batch(
+            np.broadcast_to(z, y.shape).reshape(-1, z.shape[-1]), y.reshape(-1, z.shape[-1]), bins, select=select,
+            right=right
+        ).reshape(y.shape[0:2] + (len(bins),))
+        coords = {k: c for k, c in this_dsp[axis].coords.items() if "N_LEVELS" not in c.dims}
+        new_ds = []
+        for iv, dv in enumerate(datavars):
+            new_ds.append(xr.DataArray(
+                binned[iv].astype(this_dsp[dv].dtype),
+                dims=["N_PROF", "remapped"],
+                coords=coords,
+                name=dv,
+                attrs=this_dsp[dv].attrs,
+            ))
 
         # Finish
         new_ds = xr.merge(new_ds)
@@ -1377,10 +1473,13 @@ class ArgoAccessor:
 
         return new_ds
 
+    @instrumented()
     def teos10(  # noqa: C901
         self,
         vlist: list = ["SA", "CT", "SIG0", "N2", "PV", "PTEMP"],
-        inplace: bool = True):
+        inplace: bool = True,
+        chunksize: int = 100000,
+        max_workers: int = os.cpu_count() or 1):
         """ Add TEOS10 variables to the dataset
 
         By default, adds: 'SA', 'CT'
@@ -1402,7 +1501,7 @@ class ArgoAccessor:
             * ``SIG0``
                 Adds a potential density anomaly variable referenced to 0 dbar
             * ``N2``
-                Adds a buoyancy (Brunt-Vaisala) frequency squared variable.
+                Adds a buoyancy (Brunt-Vaisala) frequency squared variable, computed along each profile.
                 This variable has been regridded to the original pressure levels in the Dataset using a linear interpolation.
             * ``PV``
                 Adds a planetary vorticity variable calculated from :math:`\\frac{f N^2}{\\text{gravity}}`.
@@ -1420,6 +1519,11 @@ class ArgoAccessor:
             * If True, return the input :class:`xarray.Dataset` with new TEOS10 variables
                 added as a new :class:`xarray.DataArray`.
             * If False, return a :class:`xarray.Dataset` with new TEOS10 variables
+        chunksize: int, default: 100000
+            Maximum number of measurements to compute at once (whole profiles are always computed at once). This bounds
+            the memory used by intermediate variables.
+        max_workers: int, default: number of CPUs
+            Maximum number of threads to compute chunks in parallel. Use 1 to compute chunks sequentially.
 
         Returns
         -------
@@ -1441,79 +1545,156 @@ class ArgoAccessor:
         #     )
 
         this = self._obj
+        is_profile = self._type == "profile"
+
+        # Get base variables as numpy arrays, with profiles along the first dimension:
+        if is_profile:
+            dims = ("N_PROF", "N_LEVELS")
+            psal, temp, pres = [this[v].transpose(*dims).values for v in ["PSAL", "TEMP", "PRES"]]
+            lon = this["LONGITUDE"].values[:, np.newaxis]
+            lat = this["LATITUDE"].values[:, np.newaxis]
+            # Chunks of profiles:
+            step = max(1, chunksize // max(1, psal.shape[1]))
+            chunks = [slice(i, i + step) for i in range(0, psal.shape[0], step)]
+        else:
+            dims = ("N_POINTS",)
+            isort = slice(None)
+            key_names = ["DIRECTION", "CYCLE_NUMBER", "PLATFORM_NUMBER"]
+            boundary = None
+            if "N2" in vlist or "PV" in vlist:
+                # N2 is computed along profiles, sort points by profile, in their original order within each profile:
+                if all([k in this.variables for k in key_names]):
+                    profile_keys = [this[k].values for k in key_names]
+                    isort = np.lexsort(profile_keys)
+                    if np.all(isort == np.arange(len(isort))):
+                        isort = slice(None)  # Points are already sorted, use views
+                    profile_keys = [k[isort] for k in profile_keys]
+                    # Pairs of consecutive points not in the same profile:
+                    boundary = np.any([k[1:] != k[:-1] for k in profile_keys], axis=0)
+                else:
+                    log.debug("No %s variables to identify profiles, N2 is computed along all points"
+                              % "/".join(key_names))
+                    boundary = np.zeros(max(0, len(this["N_POINTS"]) - 1), dtype=bool)
+            psal, temp, pres, lon, lat = [this[v].values[isort] for v in ["PSAL", "TEMP", "PRES", "LONGITUDE", "LATITUDE"]]
+            if boundary is None:
+                # Points are independent, chunks of chunksize points:
+                bounds = np.append(np.arange(0, len(psal), max(1, chunksize)), len(psal))
+            else:
+                # Chunks of profiles, with about chunksize points:
+                starts = np.append(0, np.flatnonzero(boundary) + 1)
+                ibounds = np.unique(np.searchsorted(starts, np.arange(0, len(psal), max(1, chunksize))))
+                bounds = np.append(starts[ibounds[ibounds < len(starts)]], len(psal))
+            chunks = [slice(i0, i1) for i0, i1 in zip(bounds[:-1], bounds[1:])]
+
+        # Output arrays, filled by chunks:
+        outputs = {v: np.empty(psal.shape) for v in ["SA", "CT"] + vlist + (["N2"] if "PV" in vlist else [])}
+
+        def compute(ichunk):
+            """ Compute TEOS10 variables for one chunk of profiles, and write them into output arrays """
+            psal_c, temp_c, pres_c = psal[ichunk], temp[ichunk], pres[ichunk]
+            lon_c, lat_c = lon[ichunk], lat[ichunk]
+            results = {}
+
+            # Absolute salinity
+            sa = gsw.SA_from_SP(psal_c, pres_c, lon_c, lat_c)
+
+            # Conservative temperature
+            ct = gsw.CT_from_t(sa, temp_c, pres_c)
+
+            results["SA"], results["CT"] = sa, ct
+
+            # Potential Temperature
+            if "PTEMP" in vlist:
+                results["PTEMP"] = gsw.pt_from_CT(sa, ct)
+
+            # Potential density referenced to surface
+            if "SIG0" in vlist:
+                results["SIG0"] = gsw.sigma0(sa, ct)
+
+            # Electrical conductivity
+            if "CNDC" in vlist:
+                results["CNDC"] = gsw.C_from_SP(psal_c, temp_c, pres_c)
+
+            # N2, along each profile
+            if "N2" in vlist or "PV" in vlist:
+                n2_mid, p_mid = gsw.Nsquared(sa, ct, pres_c, lat_c, axis=-1)
+                if not is_profile:
+                    n2_mid[boundary[ichunk.start:ichunk.stop - 1]] = np.nan
+                # N2 on the CT grid:
+                n2 = np.full(ct.shape, np.nan)
+                n2[..., 1:-1] = 0.5 * (n2_mid[..., 1:] + n2_mid[..., :-1])
+                results["N2"] = n2
+
+                # PV:
+                if "PV" in vlist:
+                    results["PV"] = gsw.f(lat_c) * n2 / gsw.grav(lat_c, pres_c)
+
+            # Sound Speed:
+            if "SOUND_SPEED" in vlist:
+                results["SOUND_SPEED"] = gsw.sound_speed(sa, ct, pres_c)
+
+            for name, values in results.items():
+                outputs[name][ichunk] = values
+
+        # Compute chunks, possibly in parallel since gsw functions release the GIL:
+        if max_workers > 1 and len(chunks) > 1:
+            executor = concurrent.futures.ThreadPoolExecutor(max_workers=max_workers)
+
+            # Submit chunks as workers become available, so that chunk results are not all in memory at once:
+            todo = iter(chunks)
+            running = set()
+
+            def submit():
+                ichunk = next(todo, None)
+                if ichunk is not None:
+                    running.add(executor.submit(compute, ichunk))
 
-        to_profile = False
-        if self._type == "profile":
-            to_profile = True
-            this = this.argo.profile2point()
-
-        # Get base variables as numpy arrays:
-        psal = this["PSAL"].values
-        temp = this["TEMP"].values
-        pres = this["PRES"].values
-        lon = this["LONGITUDE"].values
-        lat = this["LATITUDE"].values
-
-        # Coriolis
-        f = gsw.f(lat)
-
-        # Absolute salinity
-        sa = gsw.SA_from_SP(psal, pres, lon, lat)
-
-        # Conservative temperature
-        ct = gsw.CT_from_t(sa, temp, pres)
-
-        # Potential Temperature
-        if "PTEMP" in vlist:
-            pt = gsw.pt_from_CT(sa, ct)
-
-        # Potential density referenced to surface
-        if "SIG0" in vlist:
-            sig0 = gsw.sigma0(sa, ct)
-
-        # Electrical conductivity
-        if "CNDC" in vlist:
-            cndc = gsw.C_from_SP(psal, temp, pres)
-
-        # N2
-        if "N2" in vlist or "PV" in vlist:
-            n2_mid, p_mid = gsw.Nsquared(sa, ct, pres, lat)
-            # N2 on the CT grid:
-            ishallow = (slice(0, -1), Ellipsis)
-            ideep = (slice(1, None), Ellipsis)
-
-            def mid(x):
-                return 0.5 * (x[ideep] + x[ishallow])
-
-            n2 = np.zeros(ct.shape) * np.nan
-            n2[1:-1] = mid(n2_mid)
-
-        # PV:
-        if "PV" in vlist:
-            pv = f * n2 / gsw.grav(lat, pres)
+            try:
+                for _ in range(max_workers):
+                    submit()
+                while len(running) > 0:
+                    done, _ = concurrent.futures.wait(running, return_when=concurrent.futures.FIRST_COMPLETED)
+                    for future in done:
+                        running.remove(future)
+                        future.result()
+                        submit()
+            except BaseException:
+                # Do not wait for other chunks to be computed before raising:
+                for future in running:
+                    future.cancel()
+                executor.shutdown(wait=False)
+                raise
+            executor.shutdown()
+        else:
+            for ichunk in chunks:
+                compute(ichunk)
 
-        # Sound Speed:
-        if "SOUND_SPEED" in vlist:
-            cs = gsw.sound_speed(sa, ct, pres)
+        if not is_profile and not isinstance(isort, slice):  # Back to the original order of points
+            for name in outputs:
+                values = np.empty_like(outputs[name])
+                values[isort] = outputs[name]
+                outputs[name] = values
+        sa, ct = outputs["SA"], outputs["CT"]
+        pt, sig0, cndc, n2, pv, cs = [outputs.get(v, None) for v in ["PTEMP", "SIG0", "CNDC", "N2", "PV", "SOUND_SPEED"]]
 
         # Back to the dataset:
         that = []
         if "SA" in vlist:
-            SA = xr.DataArray(sa, coords=this["PSAL"].coords, name="SA")
+            SA = xr.DataArray(sa, dims=dims, coords=this["PSAL"].coords, name="SA")
             SA.attrs["long_name"] = "Absolute Salinity"
             SA.attrs["standard_name"] = "sea_water_absolute_salinity"
             SA.attrs["unit"] = "g/kg"
             that.append(SA)
 
         if "CT" in vlist:
-            CT = xr.DataArray(ct, coords=this["TEMP"].coords, name="CT")
+            CT = xr.DataArray(ct, dims=dims, coords=this["TEMP"].coords, name="CT")
             CT.attrs["long_name"] = "Conservative Temperature"
             CT.attrs["standard_name"] = "sea_water_conservative_temperature"
             CT.attrs["unit"] = "degC"
             that.append(CT)
 
         if "SIG0" in vlist:
-            SIG0 = xr.DataArray(sig0, coords=this["TEMP"].coords, name="SIG0")
+            SIG0 = xr.DataArray(sig0, dims=dims, coords=this["TEMP"].coords, name="SIG0")
             SIG0.attrs[
                 "long_name"
             ] = "Potential density anomaly with reference pressure of 0 dbar"
@@ -1522,33 +1703,33 @@ class ArgoAccessor:
             that.append(SIG0)
 
         if "CNDC" in vlist:
-            CNDC = xr.DataArray(cndc, coords=this["TEMP"].coords, name="CNDC")
+            CNDC = xr.DataArray(cndc, dims=dims, coords=this["TEMP"].coords, name="CNDC")
             CNDC.attrs["long_name"] = "Electrical Conductivity"
             CNDC.attrs["standard_name"] = "sea_water_electrical_conductivity"
             CNDC.attrs["unit"] = "mS/cm"
             that.append(CNDC)
 
         if "N2" in vlist:
-            N2 = xr.DataArray(n2, coords=this["TEMP"].coords, name="N2")
+            N2 = xr.DataArray(n2, dims=dims, coords=this["TEMP"].coords, name="N2")
             N2.attrs["long_name"] = "Squared buoyancy frequency"
             N2.attrs["unit"] = "1/s^2"
             that.append(N2)
 
         if "PV" in vlist:
-            PV = xr.DataArray(pv, coords=this["TEMP"].coords, name="PV")
+            PV = xr.DataArray(pv, dims=dims, coords=this["TEMP"].coords, name="PV")
             PV.attrs["long_name"] = "Planetary Potential Vorticity"
             PV.attrs["unit"] = "1/m/s"
             that.append(PV)
 
         if "PTEMP" in vlist:
-            PTEMP = xr.DataArray(pt, coords=this["TEMP"].coords, name="PTEMP")
+            PTEMP = xr.DataArray(pt, dims=dims, coords=this["TEMP"].coords, name="PTEMP")
             PTEMP.attrs["long_name"] = "Potential Temperature"
             PTEMP.attrs["standard_name"] = "sea_water_potential_temperature"
             PTEMP.attrs["unit"] = "degC"
             that.append(PTEMP)
 
         if "SOUND_SPEED" in vlist:
-            CS = xr.DataArray(cs, coords=this["TEMP"].coords, name="SOUND_SPEED")
+            CS = xr.DataArray(cs, dims=dims, coords=this["TEMP"].coords, name="SOUND_SPEED")
             CS.attrs["long_name"] = "Speed of sound"
             CS.attrs["standard_name"] = "speed_of_sound_in_sea_water"
             CS.attrs["unit"] = "m/s"
@@ -1576,19 +1757,12 @@ class ArgoAccessor:
         # Manage output:
         if inplace:
             # Merge previous with new variables
-            for v in that.variables:
-                this[v] = that[v]
-            if to_profile:
-                this = this.argo.point2profile()
-            for k in this:
-                if k not in self._obj:
-                    self._obj[k] = this[k]
+            for v in that.data_vars:
+                if v not in self._obj or v in vlist:
+                    self._obj[v] = that[v]
             return self._obj
         else:
-            if to_profile:
-                return that.argo.point2profile()
-            else:
-                return that
+            return that
 
     def create_float_source(self,   # noqa: C901
                             path: str or os.PathLike = None,
@@ -1598,7 +1772,10 @@ class ArgoAccessor:
                             file_suff: str = '',
                             format: str = '5',
                             do_compression: bool = True,
-                            debug_output: bool = False):
+                            debug_output: bool = False,
+                            max_workers: int = None,
+                            method: str = 'seq',
+                            errors: str = 'raise'):
         """ Preprocess data for OWC software calibration
 
         This method can create a FLOAT SOURCE file (i.e. the .mat file that usually goes into /float_source/) for OWC software.
@@ -1621,6 +1798,11 @@ class ArgoAccessor:
 
         >>> ds.argo.create_float_source(force='adjusted')
 
+        Floats are preprocessed independently, so that a dataset with many floats can be processed in a pool of
+        processes, each writing its own Matlab file. Floats that fail can be reported without aborting the batch:
+
+        >>> ds.argo.create_float_source(path='float_source', method='process', errors='ignore')
+
         **Pre-processing details**:
 
         #.  select only ascending profiles
@@ -1669,12 +1851,25 @@ class ArgoAccessor:
             Whether or not to compress matrices on write. Default is True.
         format: {'5', '4'}, string, optional
             Matlab file format version. '5' (the default) for MATLAB 5 and up (to 7.2). Use '4' for MATLAB 4 .mat files.
+        max_workers: int, default: number of CPUs
+            Maximum number of threads or processes. Floats are submitted to the pool as workers become available,
+            so that at most ``max_workers`` floats are in memory at once.
+        method: {'seq', 'thread', 'process'}, default: 'seq'
+            The parallelization method used to preprocess floats:
+
+            - ``seq`` (Default): process floats sequentially
+            - ``thread``: use a pool of at most ``max_workers`` threads
+            - ``process``: use a pool of at most ``max_workers`` processes
+        errors: {'raise', 'ignore'}, default: 'raise'
+            Should it 'raise' the first error met, or 'ignore' floats that fail. With 'raise', floats not yet processed
+            are cancelled. With 'ignore', failed floats are left out of the output, and reported with a warning.
 
         Returns
         -------
-        :class:`xarray.Dataset`
-            The output dataset, or Matlab file, will have the following variables (``n`` is the number of profiles, ``m``
-            is the number of vertical levels):
+        dict
+            A :class:`xarray.Dataset` for each float WMO, or the path of the Matlab file written for each float WMO if
+            ``path`` is provided. Each output dataset, or Matlab file, will have the following variables (``n`` is the
+            number of profiles, ``m`` is the number of vertical levels):
 
             - ``DATES`` (1xn): decimal year, e.g. 10 Dec 2000 = 2000.939726
             - ``LAT``   (1xn): decimal degrees, -ve means south of the equator, e.g. 20.5S = -20.5
@@ -1705,218 +1900,100 @@ class ArgoAccessor:
                 "force option must be 'default', 'raw' or 'adjusted'."
             )
 
+        if errors not in ["raise", "ignore"]:
+            raise OptionValueError("errors option must be 'raise' or 'ignore'.")
+
+        if method not in ["seq", "sequential", "thread", "process"]:
+            raise InvalidMethod(method)
+
         log.debug("===================== START create_float_source in '%s' mode" % force)
 
         if len(np.unique(this['PLATFORM_NUMBER'])) > 1:
             log.debug("Found more than one 1 float in this dataset, will split processing")
 
-        def ds2mat(this_dsp):
-            # Return a Matlab dictionary with dataset data to be used by savemat:
-            mdata = {}
-            mdata["PROFILE_NO"] = (
-                this_dsp["PROFILE_NO"].astype("uint8").values.T[np.newaxis, :]
-            )  # 1-based index in Matlab
-            mdata["DATES"] = this_dsp["DATES"].values.T[np.newaxis, :]
-            mdata["LAT"] = this_dsp["LAT"].values.T[np.newaxis, :]
-            mdata["LONG"] = this_dsp["LONG"].values.T[np.newaxis, :]
-            mdata["PRES"] = this_dsp["PRES"].values
-            mdata["TEMP"] = this_dsp["TEMP"].values
-            mdata["PTMP"] = this_dsp["PTMP"].values
-            mdata["SAL"] = this_dsp["SAL"].values
-            return mdata
-
-        def pretty_print_count(dd, txt):
-            # if dd.argo._type == "point":
-            #     np = len(dd['N_POINTS'].values)
-            #     nc = len(dd.argo.point2profile()['N_PROF'].values)
-            # else:
-            #     np = len(dd.argo.profile2point()['N_POINTS'].values)
-            #     nc = len(dd['N_PROF'].values)
-            out = []
-            np, nc = dd.argo.N_POINTS, dd.argo.N_PROF
-            out.append("%i points / %i profiles in dataset %s" % (np, nc, txt))
-            # np.unique(this['PSAL_QC'].values))
-            # out.append(pd.to_datetime(dd['TIME'][0].values).strftime('%Y/%m/%d %H:%M:%S'))
-            return "\n".join(out)
-
         def getfilled_bins(pressure, bins):
             ip = np.digitize(np.unique(pressure), bins, right=False)
             ii, ij = np.unique(ip, return_index=True)
             ii = ii[np.where(ii - 1 > 0)] - 1
             return bins[ii]
 
-        def preprocess_one_float(this_one: xr.Dataset,
-                                 this_path: str or os.PathLike = None,
-                                 select: str = 'deep',
-                                 debug_output: bool = False):
-            """ Run the entire preprocessing on a given dataset with one float data """
-
-            # Add potential temperature:
-            if "PTEMP" not in this_one:
-                this_one = this_one.argo.teos10(vlist=["PTEMP"], inplace=True)
-
-            # Only use Ascending profiles:
-            # https://github.com/euroargodev/dm_floats/blob/c580b15202facaa0848ebe109103abe508d0dd5b/src/ow_source/create_float_source.m#L143
-            this_one = this_one.argo._where(this_one["DIRECTION"] == "A", drop=True)
-            log.debug(pretty_print_count(this_one, "after direction selection"))
-
-            # Todo: ensure we load only the primary profile of cycles with multiple sampling schemes:
-            # https://github.com/euroargodev/dm_floats/blob/c580b15202facaa0848ebe109103abe508d0dd5b/src/ow_source/create_float_source.m#L194
-
-            # # Subsample and align vertical levels (max 1 level every 10db):
-            # https://github.com/euroargodev/dm_floats/blob/c580b15202facaa0848ebe109103abe508d0dd5b/src/ow_source/create_float_source.m#L208
-            # this_one = this_one.argo.align_std_bins(inplace=False)
-            # log.debug(pretty_print_count(this_one, "after vertical levels subsampling"))
-
-            # Filter variables according to OWC workflow
-            # (I don't understand why this_one come at the end of the Matlab routine ...)
-            # https://github.com/euroargodev/dm_floats/blob/c580b15202facaa0848ebe109103abe508d0dd5b/src/ow_source/create_float_source.m#L258
-            this_one = this_one.argo.filter_scalib_pres(force=force, inplace=False)
-            log.debug(pretty_print_count(this_one, "after pressure fields selection"))
-
-            # Filter along some QC:
-            # https://github.com/euroargodev/dm_floats/blob/c580b15202facaa0848ebe109103abe508d0dd5b/src/ow_source/create_float_source.m#L372
-            this_one = this_one.argo.filter_qc(
-                QC_list=[0, 1, 2], QC_fields=["TIME_QC"], drop=True
-            )  # Matlab says to reject > 3
-            # https://github.com/euroargodev/dm_floats/blob/c580b15202facaa0848ebe109103abe508d0dd5b/src/ow_source/create_float_source.m#L420
-            this_one = this_one.argo.filter_qc(
-                QC_list=[v for v in range(10) if v != 3], QC_fields=["PRES_QC"], drop=True
-            )  # Matlab says to keep != 3
-            this_one = this_one.argo.filter_qc(
-                QC_list=[v for v in range(10) if v != 4],
-                QC_fields=["PRES_QC", "TEMP_QC", "PSAL_QC"],
-                drop=True,
-                mode="any",
-            )  # Matlab says to keep != 4
-            if len(this_one["N_POINTS"]) == 0:
-                raise DataNotFound(
-                    "All data have been discarded because either PSAL_QC or TEMP_QC is filled with 4 or"
-                    " PRES_QC is filled with 3 or 4\n"
-                    "NO SOURCE FILE WILL BE GENERATED !!!"
-                )
-            log.debug(pretty_print_count(this_one, "after QC filter"))
-
-            # Exclude dummies
-            # https://github.com/euroargodev/dm_floats/blob/c580b15202facaa0848ebe109103abe508d0dd5b/src/ow_source/create_float_source.m#L427
-            this_one = (
-                this_one
-                .argo._where(this_one["PSAL"] <= 50, drop=True)
-                .argo._where(this_one["PSAL"] >= 0, drop=True)
-                .argo._where(this_one["PTEMP"] <= 50, drop=True)
-                .argo._where(this_one["PTEMP"] >= -10, drop=True)
-                .argo._where(this_one["PRES"] <= 6000, drop=True)
-                .argo._where(this_one["PRES"] >= 0, drop=True)
-            )
-            if len(this_one["N_POINTS"]) == 0:
-                raise DataNotFound(
-                    "All data have been discarded because they are filled with values out of range\n"
-                    "NO SOURCE FILE WILL BE GENERATED !!!"
-                )
-            log.debug(pretty_print_count(this_one, "after dummy values exclusion"))
-
-            # Transform measurements to a collection of profiles for Matlab-like formation:
-            this_one = this_one.argo.point2profile()
-
-            # Subsample and align vertical levels (max 1 level every 10db):
-            # https://github.com/euroargodev/dm_floats/blob/c580b15202facaa0848ebe109103abe508d0dd5b/src/ow_source/create_float_source.m#L208
-            # https://github.com/euroargodev/dm_floats/blob/c580b15202facaa0848ebe109103abe508d0dd5b/src/ow_source/create_float_source.m#L451
-            bins = np.arange(0.0, np.max(this_one["PRES"]) + 10.0, 10.0)
-            this_one = this_one.argo.groupby_pressure_bins(bins=bins, select=select, axis='PRES')
-            log.debug(pretty_print_count(this_one, "after vertical levels subsampling and re-alignment"))
-
-            # Compute fractional year:
-            # https://github.com/euroargodev/dm_floats/blob/c580b15202facaa0848ebe109103abe508d0dd5b/src/ow_source/create_float_source.m#L334
-            DATES = np.array(
-                [toYearFraction(d) for d in pd.to_datetime(this_one["TIME"].values)]
-            )[np.newaxis, :]
-
-            # Read measurements:
-            PRES = this_one["PRES"].values.T  # (mxn)
-            TEMP = this_one["TEMP"].values.T  # (mxn)
-            PTMP = this_one["PTEMP"].values.T  # (mxn)
-            SAL = this_one["PSAL"].values.T  # (mxn)
-            LAT = this_one["LATITUDE"].values[np.newaxis, :]
-            LONG = this_one["LONGITUDE"].values[np.newaxis, :]
-            LONG[0][np.argwhere(LONG[0] < 0)] = LONG[0][np.argwhere(LONG[0] < 0)] + 360
-            PROFILE_NO = this_one["CYCLE_NUMBER"].values[np.newaxis, :]
-
-            # Create dataset with preprocessed data:
-            this_one_dsp_processed = xr.DataArray(
-                PRES,
-                dims=["m", "n"],
-                coords={"m": np.arange(0, PRES.shape[0]), "n": np.arange(0, PRES.shape[1])},
-                name="PRES",
-            ).to_dataset(promote_attrs=False)
-            this_one_dsp_processed["TEMP"] = xr.DataArray(
-                TEMP,
-                dims=["m", "n"],
-                coords={"m": np.arange(0, TEMP.shape[0]), "n": np.arange(0, TEMP.shape[1])},
-                name="TEMP",
-            )
-            this_one_dsp_processed["PTMP"] = xr.DataArray(
-                PTMP,
-                dims=["m", "n"],
-                coords={"m": np.arange(0, PTMP.shape[0]), "n": np.arange(0, PTMP.shape[1])},
-                name="PTMP",
-            )
-            this_one_dsp_processed["SAL"] = xr.DataArray(
-                SAL,
-                dims=["m", "n"],
-                coords={"m": np.arange(0, SAL.shape[0]), "n": np.arange(0, SAL.shape[1])},
-                name="SAL",
-            )
-            this_one_dsp_processed["PROFILE_NO"] = xr.DataArray(
-                PROFILE_NO[0, :],
-                dims=["n"],
-                coords={"n": np.arange(0, PROFILE_NO.shape[1])},
-                name="PROFILE_NO",
-            )
-            this_one_dsp_processed["DATES"] = xr.DataArray(
-                DATES[0, :],
-                dims=["n"],
-                coords={"n": np.arange(0, DATES.shape[1])},
-                name="DATES",
-            )
-            this_one_dsp_processed["LAT"] = xr.DataArray(
-                LAT[0, :], dims=["n"], coords={"n": np.arange(0, LAT.shape[1])}, name="LAT"
-            )
-            this_one_dsp_processed["LONG"] = xr.DataArray(
-                LONG[0, :],
-                dims=["n"],
-                coords={"n": np.arange(0, LONG.shape[1])},
-                name="LONG",
-            )
-            this_one_dsp_processed["m"].attrs = {"long_name": "vertical levels"}
-            this_one_dsp_processed["n"].attrs = {"long_name": "profiles"}
+        # Split the dataset by float, once:
+        dim = this['PLATFORM_NUMBER'].dims[0]
+        isort = np.argsort(this['PLATFORM_NUMBER'].values, kind='stable')
+        WMOs, istart = np.unique(this['PLATFORM_NUMBER'].values[isort], return_index=True)
+        ifloats = np.split(isort, istart[1:])
+
+        def one_float(i):
+            this_float = this.isel({dim: ifloats[i]})
+            this_float.attrs = dict(this.attrs)  # Do not modify attributes of the original dataset
+            return this_float.argo.cast_types()
 
-            # Create Matlab dictionary with preprocessed data (to be used by savemat):
-            mdata = ds2mat(this_one_dsp_processed)
+        float_paths = [None] * len(WMOs)
+        if path is not None:
+            os.makedirs(path, exist_ok=True)  # Make path exists
+            float_paths = [os.path.join(path, "%s%i%s.mat" % (file_pref, WMO, file_suff)) for WMO in WMOs]
+        opts = {"force": force, "select": select, "format": format, "do_compression": do_compression,
+                "debug_output": debug_output}
 
-            # Output
-            log.debug("float source data saved in: %s" % this_path)
-            if this_path is None:
-                if debug_output:
-                    return mdata, this_one_dsp_processed, this_one  # For debug/devel
+        # Run pre-processing for each float data
+        results = [None] * len(WMOs)
+        failed = {}
+
+        def collect(i, future):
+            try:
+                results[i] = future() if callable(future) else future.result()
+            except Exception as e:
+                if errors == 'ignore':
+                    log.debug("Ignored error with float WMO %i\nException raised: %s" % (WMOs[i], str(e.args)))
+                    failed[WMOs[i]] = e
                 else:
-                    return this_one_dsp_processed
+                    raise
+
+        if method in ['thread', 'process']:
+            max_workers = (os.cpu_count() or 1) if max_workers is None else max_workers
+            if method == 'thread':
+                executor = concurrent.futures.ThreadPoolExecutor(max_workers=max_workers)
             else:
-                from scipy.io import savemat
-                # Validity check of the path type is delegated to savemat
-                return savemat(this_path, mdata, appendmat=False, format=format, do_compression=do_compression)
+                executor = concurrent.futures.ProcessPoolExecutor(max_workers=max_workers)
+
+            # Submit floats as workers become available, so that float datasets are not all in memory at once:
+            todo = iter(range(len(WMOs)))
+            future_to_float = {}
+
+            def submit():
+                i = next(todo, None)
+                if i is not None:
+                    log.debug("> Preprocessing data for float WMO %i" % WMOs[i])
+                    future = executor.submit(_create_one_float_source, one_float(i), this_path=float_paths[i], **opts)
+                    future_to_float[future] = i
+
+            try:
+                for _ in range(max_workers):
+                    submit()
+                while len(future_to_float) > 0:
+                    done, _ = concurrent.futures.wait(future_to_float, return_when=concurrent.futures.FIRST_COMPLETED)
+                    for future in done:
+                        collect(future_to_float.pop(future), future)
+                        submit()
+            except BaseException:
+                # Do not wait for other floats to be processed before raising:
+                for future in future_to_float:
+                    future.cancel()
+                executor.shutdown(wait=False)
+                raise
+            executor.shutdown()
+        else:
+            for i, WMO in enumerate(WMOs):
+                log.debug("> Preprocessing data for float WMO %i" % WMO)
+                collect(i, lambda: _create_one_float_source(one_float(i), this_path=float_paths[i], **opts))
+
+        if len(failed) > 0:
+            warnings.warn("Preprocessing failed for %i float(s), no float source created for: %s" % (
+                len(failed), "; ".join(["%i (%s)" % (WMO, str(e)) for WMO, e in sorted(failed.items())])))
 
-        # Run pre-processing for each float data
         output = {}
-        for WMO in np.unique(this['PLATFORM_NUMBER']):
-            log.debug("> Preprocessing data for float WMO %i" % WMO)
-            this_float = this.argo._where(this['PLATFORM_NUMBER'] == WMO, drop=True)
-            if path is None:
-                output[WMO] = preprocess_one_float(this_float, this_path=path, select=select, debug_output=debug_output)
-            else:
-                os.makedirs(path, exist_ok=True)  # Make path exists
-                float_path = os.path.join(path, "%s%i%s.mat" % (file_pref, WMO, file_suff))
-                preprocess_one_float(this_float, this_path=float_path, select=select, debug_output=debug_output)
-                output[WMO] = float_path
-        if path is None:
-            log.debug("===================== END create_float_source")
-            return output
+        for i, WMO in enumerate(WMOs):
+            if WMO not in failed:
+                output[WMO] = results[i] if path is None else float_paths[i]
+        log.debug("===================== END create_float_source")
+        return output
@@ -0,0 +1,103 @@
+"""
+Benchmarks of argopy hot paths, to be run with airspeed velocity (asv)
+
+All benchmarks run offline, on synthetic Argo data generated by the helpers of this module, or by
+:class:`argopy.tutorial.synthetic_ftp` for GDAC ftp folders. Each benchmark runs over a sweep of data sizes, so that
+regressions and scaling behaviour are both visible:
+
+    $ cd asv_bench
+    $ asv run
+    $ asv continuous master HEAD
+
+"""
+import os
+import numpy as np
+import xarray as xr
+
+
+def synthetic_points(n_prof: int, n_levels: int = 100, mode: str = "expert", raw: bool = False, seed: int = 0):
+    """ Synthetic collection of Argo points, as returned by the erddap data fetcher
+
+        Parameters
+        ----------
+        n_prof: int
+            Number of profiles, from floats with 10 cycles each
+        n_levels: int
+            Maximum number of vertical levels of a profile. Profiles have between 90% and 100% of this number of
+            levels, so that some padding is necessary to transform points into profiles.
+        mode: str
+            User mode: ``expert`` to have ``*_ADJUSTED`` variables and a mix of R/A/D data modes, ``standard``
+            otherwise.
+        raw: bool
+            If True, variables have the types of the raw erddap response (strings as objects, QC flags as strings),
+            to be cast with ``cast_types``.
+        seed: int
+            Seed of the random number generator
+
+        Returns
+        -------
+        :class:`xarray.Dataset`
+    """
+    rng = np.random.default_rng(seed)
+    levels = n_levels - rng.integers(0, max(n_levels // 10, 1), n_prof)
+    n_points = int(levels.sum())
+    iprof = np.repeat(np.arange(n_prof), levels)
+    ilev = np.arange(n_points) - np.repeat(np.cumsum(levels) - levels, levels)
+
+    wmo = 6900000 + iprof // 10
+    cyc = 1 + iprof % 10
+    lon = (rng.uniform(-75, -45, n_prof // 10 + 1)[iprof // 10] + 0.1 * cyc).astype(np.float64)
+    lat = (rng.uniform(20, 40, n_prof // 10 + 1)[iprof // 10] + 0.1 * cyc).astype(np.float64)
+    time = (np.datetime64("2011-01-01") + (iprof * 10 * 86400).astype("timedelta64[s]")).astype("datetime64[ns]")
+    pres = 2000. * ilev / n_levels + rng.uniform(0, 1, n_points)
+    temp = 25. * np.exp(-pres / 500.) + 2. + rng.normal(0, 0.01, n_points)
+    psal = 34.5 + 1. * np.exp(-pres / 800.) + rng.normal(0, 0.01, n_points)
+    qc = rng.choice([1, 1, 1, 1, 1, 1, 2, 3, 4, 8], n_points)
+    data_mode = np.array(["R", "A", "D"])[rng.integers(0, 3, n_prof)][iprof] if mode == "expert" else \
+        np.full(n_points, "R")
+
+    ds = xr.Dataset(coords={
+        "N_POINTS": np.arange(n_points),
+        "LATITUDE": ("N_POINTS", lat),
+        "LONGITUDE": ("N_POINTS", lon),
+        "TIME": ("N_POINTS", time),
+    })
+    ds["CYCLE_NUMBER"] = ("N_POINTS", cyc)
+    ds["DATA_MODE"] = ("N_POINTS", data_mode)
+    ds["DIRECTION"] = ("N_POINTS", np.full(n_points, "A"))
+    ds["PLATFORM_NUMBER"] = ("N_POINTS", wmo)
+    ds["POSITION_QC"] = ("N_POINTS", np.ones(n_points, dtype=int))
+    ds["TIME_QC"] = ("N_POINTS", np.ones(n_points, dtype=int))
+    for v, values in {"PRES": pres, "TEMP": temp, "PSAL": psal}.items():
+        ds[v] = ("N_POINTS", values)
+        ds["%s_QC" % v] = ("N_POINTS", qc)
+        if mode == "expert":
+            adjusted = np.where(data_mode == "R", np.nan, values + 0.01)
+            ds["%s_ADJUSTED" % v] = ("N_POINTS", adjusted)
+            ds["%s_ADJUSTED_QC" % v] = ("N_POINTS", np.where(data_mode == "R", 0, qc))
+            ds["%s_ADJUSTED_ERROR" % v] = ("N_POINTS", np.where(data_mode == "R", np.nan, 0.01))
+
+    if raw:
+        for v in ds.variables:
+            if "QC" in v or v in ["DATA_MODE", "DIRECTION", "PLATFORM_NUMBER"]:
+                ds[v] = ds[v].astype(str).astype(object)
+    ds.attrs["DATA_ID"] = "ARGO"
+    return ds
+
+
+def write_synthetic_files(folder: str, n_files: int, n_prof: int = 10, n_levels: int = 100):
+    """ Write netcdf files of synthetic Argo points in a folder
+
+        Returns
+        -------
+        list(str)
+            Paths of the files written
+    """
+    paths = []
+    for i in range(n_files):
+        ds = synthetic_points(n_prof, n_levels, seed=i)
+        ds["PLATFORM_NUMBER"] = ds["PLATFORM_NUMBER"] + 1000 * i  # One set of floats per file
+        path = os.path.join(folder, "points_%0.4d.nc" % i)
+        ds.to_netcdf(path)
+        paths.append(path)
+    return paths
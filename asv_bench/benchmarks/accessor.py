@@ -0,0 +1,111 @@
+import numpy as np
+
+import argopy  # noqa: F401, register the argo accessor
+from argopy.xarray import with_gsw
+
+from . import synthetic_points
+
+
+class Base:
+    """ Benchmarks of the argo accessor methods, on a sweep of number of profiles
+
+        Benchmarks on collections of profiles, created with point2profile, use a smaller sweep.
+    """
+
+    params = [[10, 100, 1000, 10000]]
+    param_names = ["n_prof"]
+    number = 1  # Methods may modify the dataset, a new one is created by setup before each sample
+    timeout = 300
+
+
+class CastTypes(Base):
+    def setup(self, n_prof):
+        self.ds = synthetic_points(n_prof, raw=True)
+
+    def time_cast_types(self, n_prof):
+        self.ds.argo.cast_types()
+
+
+class Point2Profile(Base):
+    params = [[10, 100, 1000]]
+
+    def setup(self, n_prof):
+        self.ds = synthetic_points(n_prof, mode="standard")
+
+    def time_point2profile(self, n_prof):
+        self.ds.argo.point2profile()
+
+    def peakmem_point2profile(self, n_prof):
+        self.ds.argo.point2profile()
+
+
+class Profile2Point(Base):
+    params = [[10, 100, 1000]]
+
+    def setup(self, n_prof):
+        self.ds = synthetic_points(n_prof, mode="standard").argo.point2profile()
+
+    def time_profile2point(self, n_prof):
+        self.ds.argo.profile2point()
+
+    def peakmem_profile2point(self, n_prof):
+        self.ds.argo.profile2point()
+
+
+class FilterDataMode(Base):
+    def setup(self, n_prof):
+        self.ds = synthetic_points(n_prof, mode="expert")
+
+    def time_filter_data_mode(self, n_prof):
+        self.ds.argo.filter_data_mode()
+
+    def peakmem_filter_data_mode(self, n_prof):
+        self.ds.argo.filter_data_mode()
+
+
+class FilterQC(Base):
+    def setup(self, n_prof):
+        self.ds = synthetic_points(n_prof, mode="standard")
+
+    def time_filter_qc(self, n_prof):
+        self.ds.argo.filter_qc(QC_list=[1, 2])
+
+    def time_filter_qc_mask(self, n_prof):
+        self.ds.argo.filter_qc(QC_list=[1, 2], mode="any", mask=True)
+
+    def peakmem_filter_qc(self, n_prof):
+        self.ds.argo.filter_qc(QC_list=[1, 2])
+
+
+class InterpStdLevels(Base):
+    params = [[10, 100, 1000]]
+
+    def setup(self, n_prof):
+        self.ds = synthetic_points(n_prof, mode="standard").argo.point2profile()
+
+    def time_interp_std_levels(self, n_prof):
+        self.ds.argo.interp_std_levels(np.arange(0, 1500, 10.))
+
+
+class GroupbyPressureBins(Base):
+    params = [[10, 100, 1000], ["deep", "mean"]]
+    param_names = ["n_prof", "select"]
+
+    def setup(self, n_prof, select):
+        self.ds = synthetic_points(n_prof, mode="standard").argo.point2profile()
+
+    def time_groupby_pressure_bins(self, n_prof, select):
+        self.ds.argo.groupby_pressure_bins(np.arange(0, 1500, 50.), select=select)
+
+
+class Teos10(Base):
+    def setup(self, n_prof):
+        if not with_gsw:
+            raise NotImplementedError("teos10 requires the gsw library")
+        self.ds = synthetic_points(n_prof, mode="standard")
+
+    def time_teos10(self, n_prof):
+        self.ds.argo.teos10(["SA", "CT", "SIG0", "N2", "PV", "PTEMP"])
+
+    def peakmem_teos10(self, n_prof):
+        self.ds.argo.teos10(["SA", "CT", "SIG0", "N2", "PV", "PTEMP"])
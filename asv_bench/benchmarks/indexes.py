@@ -0,0 +1,38 @@
+import os
+
+from argopy.stores.argo_index import indexfilter_box, indexfilter_wmo
+from argopy.tutorial import synthetic_ftp
+
+
+class IndexSearch:
+    """ Search an Argo profile index with the localftp index filters """
+
+    params = [[10000, 100000, 1000000]]
+    param_names = ["n_prof"]
+    timeout = 300
+
+    def setup_cache(self):
+        # Index files of floats with 100 cycles each, generated once for all benchmarks of this class:
+        for n_prof in self.params[0]:
+            synthetic_ftp("gdac_%i" % n_prof, n_dacs=11, n_floats=n_prof // 100, n_cycles=100,
+                          index_only=True).generate()
+
+    def setup(self, n_prof):
+        self.index = open(os.path.join("gdac_%i" % n_prof, "ar_index_global_prof.txt"), "r")
+        n_floats = n_prof // 100
+        self.wmo = [1900000 + i * (n_floats - 1) // 4 for i in range(5)]  # 5 floats, spread along the index
+
+    def teardown(self, n_prof):
+        self.index.close()
+
+    def time_indexfilter_box(self, n_prof):
+        indexfilter_box(BOX=[-60, -40, 0, 20]).run(self.index)
+
+    def time_indexfilter_box_time(self, n_prof):
+        indexfilter_box(BOX=[-60, -40, 0, 20, "2001-01-01", "2002-12-31"]).run(self.index)
+
+    def time_indexfilter_wmo(self, n_prof):
+        indexfilter_wmo(WMO=self.wmo).run(self.index)
+
+    def time_indexfilter_wmo_cyc(self, n_prof):
+        indexfilter_wmo(WMO=self.wmo, CYC=[1, 50]).run(self.index)
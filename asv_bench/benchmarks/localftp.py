@@ -0,0 +1,41 @@
+from argopy import DataFetcher
+from argopy.tutorial import synthetic_ftp
+
+
+def setup_ftp():
+    """ Synthetic GDAC ftp folder with 100 floats of 50 cycles each, scattered over the globe """
+    return synthetic_ftp("gdac", n_dacs=11, n_floats=100, n_cycles=50).generate().rootpath
+
+
+class LocalFTPFloat:
+    """ Fetch floats from a synthetic GDAC ftp folder """
+
+    params = [[1, 10, 100]]
+    param_names = ["n_floats"]
+    timeout = 600
+
+    def setup_cache(self):
+        return setup_ftp()
+
+    def time_float(self, local_ftp, n_floats):
+        wmo = synthetic_ftp(local_ftp, n_floats=100).wmo[0:n_floats]
+        DataFetcher(src="localftp", local_ftp=local_ftp, mode="expert").float(wmo).to_xarray()
+
+    def time_float_parallel(self, local_ftp, n_floats):
+        wmo = synthetic_ftp(local_ftp, n_floats=100).wmo[0:n_floats]
+        DataFetcher(src="localftp", local_ftp=local_ftp, mode="expert", parallel=True).float(wmo).to_xarray()
+
+
+class LocalFTPRegion:
+    """ Fetch a region from a synthetic GDAC ftp folder, loading single-profile files """
+
+    params = [[3, 10, 30]]
+    param_names = ["width"]  # Longitude width of the region, in degrees
+    timeout = 600
+
+    def setup_cache(self):
+        return setup_ftp()
+
+    def time_region(self, local_ftp, width):
+        DataFetcher(src="localftp", local_ftp=local_ftp, mode="expert").region(
+            [-180, -180 + width, -90, 90, 0, 2000]).to_xarray()
@@ -0,0 +1,36 @@
+import os
+import xarray as xr
+from argopy import DataFetcher, set_options
+from argopy.tutorial import synthetic_ftp, mock_server
+
+
+def setup_mock():
+    """ Points of a synthetic GDAC ftp folder with 20 floats of 50 cycles each, to be served by a mock server """
+    ftp = synthetic_ftp("gdac", n_dacs=2, n_floats=20, n_cycles=50).generate()
+    with set_options(src="localftp", local_ftp=ftp.rootpath, mode="expert"):
+        ds = DataFetcher().float(ftp.wmo).to_xarray()
+    ds.to_netcdf("points.nc")
+    return os.path.abspath("points.nc"), ftp.wmo
+
+
+class MockedAPI:
+    """ Fetch floats from mocked erddap and Argovis APIs, with a latency of 50ms per request """
+
+    params = [["erddap", "argovis"], [1, 5, 20], [False, True]]
+    param_names = ["src", "n_floats", "parallel"]
+    timeout = 300
+
+    def setup_cache(self):
+        return setup_mock()
+
+    def setup(self, cache, src, n_floats, parallel):
+        path, self.wmo = cache
+        self.server = mock_server(xr.load_dataset(path), latency=0.05).start()
+        self.url = self.server.erddap if src == "erddap" else self.server.argovis
+
+    def teardown(self, cache, src, n_floats, parallel):
+        self.server.stop()
+
+    def time_float(self, cache, src, n_floats, parallel):
+        DataFetcher(src=src, server=self.url, mode="expert", parallel=parallel).float(
+            self.wmo[0:n_floats]).to_xarray()
@@ -0,0 +1,28 @@
+import shutil
+import tempfile
+
+from argopy.stores import filestore
+
+from . import write_synthetic_files
+
+
+class OpenMfdataset:
+    """ Open and concatenate netcdf files of Argo points """
+
+    params = [[1, 10, 100], ["sequential", "thread"]]
+    param_names = ["n_files", "method"]
+    timeout = 300
+
+    def setup(self, n_files, method):
+        self.folder = tempfile.mkdtemp()
+        self.paths = write_synthetic_files(self.folder, n_files)
+        self.fs = filestore()
+
+    def teardown(self, n_files, method):
+        shutil.rmtree(self.folder)
+
+    def time_open_mfdataset(self, n_files, method):
+        self.fs.open_mfdataset(self.paths, method=method, concat_dim="N_POINTS")
+
+    def peakmem_open_mfdataset(self, n_files, method):
+        self.fs.open_mfdataset(self.paths, method=method, concat_dim="N_POINTS")